@@ -16,6 +16,11 @@ from referee.game import Direction, MoveAction, GrowAction, IllegalActionExcepti
 from referee.game.player import PlayerColor
 from referee.game.board import CellState
 
+from .evaluation import EvalFeatures, FrogDistribution, EVAL_WEIGHTS
+from .priority import ScoredAction, score_move, score_grow
+from .stats import SearchStats
+from .zobrist import position_key
+
 
 class Node:
     """
@@ -23,43 +28,40 @@ class Node:
     Each node represents a game state and maintains statistics for the MCTS algorithm.
     """
     __slots__ = ("state", "parent", "children", "total_rewards",
-                "visits", "unexplored_actions")
+                "visits", "unexplored_actions", "sign")
                 
     def __init__(self, state, parent=None):
         self.state = state
         self.parent = parent
         self.children = []
-        self.total_rewards = 0.0  # Store as a single float, relative to root player
+        self.total_rewards = 0.0  # Store as a single float, from RED's perspective
         self.visits = 0
+        # Player to move here: +1 for RED, -1 for BLUE. Multiplying a
+        # RED-perspective value by the sign gives the mover's perspective.
+        self.sign = int(state.board.turn_color)
         # GameState.get_legal_actions() returns a list sorted by priority (highest first)
         # Use deque for efficient pop from the left (highest priority)
         self.unexplored_actions = deque(state.get_legal_actions())
 
-    def select_child(self, root_player_color):
+    def select_child(self):
         """
         Select the child with the highest UCB1 value.
-        Rewards are relative to root_player_color.
-        The decision at self (parent) is made by self.state.board.turn_color.
+        Rewards are stored from RED's perspective; the decision at self
+        (parent) is made by the player whose sign is self.sign.
         """
         if not self.children:
             return self # Should not happen if called after ensuring children exist or unexplored_actions is empty
         
         exploration_constant = 1.414
         current_decision_maker_color = self.state.board.turn_color
-
-        # Determine if the current decision maker is the same as the root player
-        # If so, they want to maximize child.total_rewards (which is from root's perspective)
-        # If not, they are the opponent, and want to minimize child.total_rewards (from root's perspective)
-        exploitation_coeff = 1.0 if current_decision_maker_color == root_player_color else -1.0
+        exploitation_coeff = self.sign
 
         def ucb(child_node) -> float:
             """Calculate the UCB1 value for a child node with additional heuristic bonuses."""
             if child_node.visits == 0:
                 return float('inf')
             
-            # child_node.total_rewards is already relative to root_player_color
-            exploitation_from_root_pov = child_node.total_rewards / child_node.visits
-            effective_exploitation = exploitation_coeff * exploitation_from_root_pov
+            effective_exploitation = exploitation_coeff * child_node.total_rewards / child_node.visits
             
             exploration = exploration_constant * math.sqrt(math.log(self.visits) / child_node.visits)
             
@@ -107,106 +109,259 @@ class Node:
                 return self.expand() 
         return self 
 
-    def update(self, reward_increment_relative_to_root):
-        """
-        Update the node's statistics with a new reward.
-        The reward is always from the perspective of the root player.
-        """
-        self.visits += 1
-        self.total_rewards += reward_increment_relative_to_root
-
 
 class MCTS:
     """
     Monte Carlo Tree Search implementation with action priorities.
-    
-    Action Priority Levels:
-    1000: Priority 1  - Game-winning moves (reaching opponent's edge with non-starting piece)
-    500:  Priority 2  - Single frog breakthrough (within 2 steps of goal line and moving forward)
-    300:  Priority 3  - Multi-jump advance (row change >= 2 with forward jumps)
-    200:  Priority 4  - Forward jumps with isolated pieces
-    190:  Priority 5  - Opening phase: Jumps that significantly improve formation
-    180:  Priority 6  - Opening phase: Moves that significantly improve formation
-    160:  Priority 7  - Opening phase: Jumps that improve isolated piece cohesion
-    150:  Priority 8  - Forward line push (normal forward jumps)
-    140:  Priority 9  - Opening phase: Jumps with minor formation improvement
-    130:  Priority 10 - Opening phase: Moves with minor formation improvement
-    120:  Priority 11 - Opening phase: GROW actions that improve formation
-    100:  Priority 12 - Bridge building (GROW actions creating jump opportunities)
-    55:   Priority 13 - Blocking opponent (improving cohesion of isolated pieces in opening)
-    50:   Priority 14 - Default GROW actions / Normal forward moves
-    40:   Priority 15 - Self-blocking prevention
-    30:   Priority 16 - Non-forward jumps with chain potential / Isolated piece moves improving cohesion
-    20:   Priority 17 - Isolated piece moves
-    10:   Priority 18 - Default actions
-    1:    Priority 19 - Horizontal jumps without chain potential / Non-forward normal moves
-    0.5:  Priority 20 - Goal line shuffling (piece already on goal line, moves to stay on it)
+
+    Action priority levels are defined once in priority.py and attached to
+    each action as it is generated (GameState.get_scored_actions), so node
+    expansion and the minimax playouts share the same ordering.
     """
-    def __init__(self, state, use_minimax=True, minimax_depth=2, test_mode=False):
+    def __init__(self, state, use_minimax=True, minimax_depth=2, test_mode=False,
+                 batch_size=1, virtual_loss=1.0, seed=None, trace_path=None):
         self.root = Node(state)
         self.use_minimax = use_minimax
         self.minimax_depth = minimax_depth
         self.test_mode = test_mode
-        self.root_player_color = state.board.turn_color
+        # batch_size > 1 gathers several leaves per iteration (spread apart by
+        # virtual loss) and scores them together with the NumPy evaluator
+        self.batch_size = batch_size
+        self.virtual_loss = virtual_loss
+        # Playouts run and wall-clock time spent in the search loops, over the
+        # lifetime of the tree (including any pondering)
+        self.iterations = 0
+        self.search_time = 0.0
+        # All randomness goes through this generator, so a fixed seed gives
+        # a reproducible search regardless of other users of `random`
+        self.rng = random.Random(seed)
+        # Optional search trace: one line per playout with the iteration
+        # number, the path from the root as child indices and the leaf value.
+        # Lines are buffered and appended to `trace_path` after each search.
+        self.trace_path = trace_path
+        self._trace: list[str] = []
+        # Instrumentation for the most recent search (or pondering session),
+        # and the Zobrist keys of every position the search has reached
+        self.stats = SearchStats()
+        self._positions = {position_key(state.board)}
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.iterations / self.search_time if self.search_time else 0.0
 
     def search(self, iterations: int = 50):
         """
         Perform Monte Carlo Tree Search for the specified number of iterations.
         Returns the best action found.
         """
-        # Check for fixed opening moves
-        if self.root.state.should_use_fixed_opening() and not self.test_mode:
-            fixed_move = self.root.state.get_fixed_opening_move()
-            if fixed_move is not None:
-                # Increment fixed move counter for current color
-                if self.root.state.board.turn_color == PlayerColor.RED:
-                    self.root.state._red_fixed_moves += 1
-                    self.root.state.board._red_fixed_moves = self.root.state._red_fixed_moves
-                else:
-                    self.root.state._blue_fixed_moves += 1
-                    self.root.state.board._blue_fixed_moves = self.root.state._blue_fixed_moves
-
-                self.root.state.last_move = fixed_move
-                return fixed_move
-
-        # Main MCTS loop
-        for _ in range(iterations):
-            leaf = self.select()
-            if not leaf.unexplored_actions and not leaf.children and not leaf.state.is_terminal():
-                # Handle potential dead-end states
-                pass 
-            
-            if leaf.unexplored_actions and not leaf.state.is_terminal():
-                child_leaf = leaf.expand()
-                if child_leaf != leaf: 
-                    sim_reward = self.simulate(child_leaf)
-                    self.backpropagation(child_leaf, sim_reward)
-                else: 
-                    sim_reward = self.simulate(leaf) 
-                    self.backpropagation(leaf, sim_reward)
-            else:
-                 sim_reward = self.simulate(leaf)
-                 self.backpropagation(leaf, sim_reward)
+        best_action, _ = self.search_with_stats(iterations)
+        return best_action
+
+    def search_with_stats(self, iterations: int = 50):
+        """
+        As `search`, but returns a (best action, `SearchStats`) pair.
+        """
+        counters = self._begin_stats()
+        if self.batch_size > 1:
+            self._search_batched(iterations)
+        else:
+            self._search_sequential(iterations)
+        self._end_stats(counters)
+        self.flush_trace()
 
+        return self.best_action(), self.stats
+
+    def best_action(self):
+        """
+        The root move with the best mean reward for the player to move, or
+        None if the root has not been expanded.
+        """
         if not self.root.children:
             return None
-        
-        # Debug: Print root children statistics
-        print("\n--- Root Children Stats ---")
-        for child in self.root.children:
-            act = child.state.last_move
-            if child.visits > 0:
-                mean_reward = child.total_rewards / child.visits
-            else:
-                mean_reward = 0.0 
-            print(f"{str(act):<40}  visits={child.visits:<3}  mean_reward={mean_reward:+.3f}")
-        print("---------------------------")
-
-        # Select best child based on average reward
+        root_sign = self.root.sign
         best_child = max(self.root.children, 
-                         key=lambda n: n.total_rewards / (n.visits or 1))
+                         key=lambda n: root_sign * n.total_rewards / (n.visits or 1))
         return best_child.state.last_move
 
+    def _begin_stats(self):
+        self.stats = SearchStats()
+        return (time.perf_counter(), GameState.clones,
+                GameState.movegen_calls, GameState.movegen_cache_hits)
+
+    def _end_stats(self, counters):
+        start, clones, movegen_calls, movegen_cache_hits = counters
+        stats = self.stats
+        stats.total_time = time.perf_counter() - start
+        stats.states_cloned = GameState.clones - clones
+        stats.movegen_calls = GameState.movegen_calls - movegen_calls
+        stats.movegen_cache_hits = GameState.movegen_cache_hits - movegen_cache_hits
+        stats.tree_nodes = self.tree_size()
+        # The tree only grows during a search, so its final size is its peak
+        stats.tree_memory_kb_est = stats.tree_nodes * _node_bytes(self.root) // 1024
+        stats.record_peak_memory()
+
+    def _expanded(self, child):
+        # Count a new node, and whether its position was already reached by
+        # this tree's search (a hit, had there been a transposition table)
+        self.stats.nodes_created += 1
+        key = position_key(child.state.board)
+        if key in self._positions:
+            self.stats.transposition_hits += 1
+        else:
+            self._positions.add(key)
+
+    def tree_size(self) -> int:
+        """
+        Number of nodes in the tree under (and including) the root.
+        """
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children)
+        return count
+
+    def advance(self, action) -> bool:
+        """
+        Re-root the tree at the child reached by `action`, keeping the
+        statistics gathered below it. Returns False (leaving the tree
+        unchanged) if that child has not been expanded.
+        """
+        for child in self.root.children:
+            if _same_action(child.state.last_move, action):
+                child.parent = None
+                self.root = child
+                return True
+        return False
+
+    def ponder(self, stop_event, max_nodes, max_seconds=None):
+        """
+        Keep searching until `stop_event` is set, the tree reaches
+        `max_nodes` or `max_seconds` (wall clock) have passed. Each iteration
+        adds at most one node, so the root's visit count bounds the size of
+        the tree. Intended to run in a background thread while the opponent
+        is thinking; the limits are checked between iterations. Pondering
+        fills in its own `stats`.
+        """
+        counters = self._begin_stats()
+        deadline = time.perf_counter() + max_seconds \
+            if max_seconds is not None else math.inf
+        while not stop_event.is_set() and self.root.visits < max_nodes \
+                and time.perf_counter() < deadline \
+                and not self.root.state.is_terminal():
+            self._search_sequential(1)
+        self._end_stats(counters)
+
+    def flush_trace(self):
+        """
+        Append any buffered trace lines to `trace_path`.
+        """
+        if self.trace_path is None or not self._trace:
+            return
+        with open(self.trace_path, "a") as f:
+            f.write("\n".join(self._trace) + "\n")
+        self._trace.clear()
+
+    def _record_trace(self, leaf, value):
+        path = []
+        node = leaf
+        while node.parent is not None:
+            path.append(node.parent.children.index(node))
+            node = node.parent
+        path_text = ".".join(map(str, reversed(path))) or "-"
+        self._trace.append(f"{self.iterations} {path_text} {value:.6g}")
+
+    def _search_sequential(self, iterations):
+        """
+        Standard MCTS loop: one select/expand/simulate/backpropagate pass per
+        iteration.
+        """
+        stats = self.stats
+        clock = time.perf_counter
+        start = clock()
+        for _ in range(iterations):
+            t0 = clock()
+            leaf = self.select()
+            t1 = clock()
+            if leaf.unexplored_actions and not leaf.state.is_terminal():
+                child = leaf.expand()
+                if child is not leaf:
+                    self._expanded(child)
+                leaf = child
+            t2 = clock()
+            sim_reward = self.simulate(leaf)
+            t3 = clock()
+            depth = self.backpropagation(leaf, sim_reward)
+            t4 = clock()
+            stats.select_time += t1 - t0
+            stats.expand_time += t2 - t1
+            stats.simulate_time += t3 - t2
+            stats.backprop_time += t4 - t3
+            stats.record_depth(depth)
+            stats.iterations += 1
+            self.iterations += 1
+            if self.trace_path is not None:
+                self._record_trace(leaf, sim_reward)
+        self.search_time += time.perf_counter() - start
+
+    def _search_batched(self, iterations):
+        """
+        Batched MCTS loop. Each iteration selects and expands up to
+        `batch_size` leaves, applying a virtual loss along each selected path
+        so that later selections in the same batch are steered elsewhere, then
+        scores all leaves in one vectorised call before backpropagating.
+        """
+        from .batch_eval import evaluate_states
+
+        stats = self.stats
+        clock = time.perf_counter
+        start = clock()
+        for _ in range(iterations):
+            pending = []
+            for _ in range(self.batch_size):
+                t0 = clock()
+                leaf = self.select()
+                t1 = clock()
+                if leaf.unexplored_actions and not leaf.state.is_terminal():
+                    child = leaf.expand()
+                    if child is not leaf:
+                        self._expanded(child)
+                    leaf = child
+                self._apply_virtual_loss(leaf, 1)
+                pending.append(leaf)
+                stats.select_time += t1 - t0
+                stats.expand_time += clock() - t1
+
+            t2 = clock()
+            rewards = evaluate_states([leaf.state for leaf in pending])
+            t3 = clock()
+            stats.simulate_time += t3 - t2
+            for leaf, reward in zip(pending, rewards):
+                self._apply_virtual_loss(leaf, -1)
+                stats.record_depth(self.backpropagation(leaf, float(reward)))
+                stats.iterations += 1
+                self.iterations += 1
+                if self.trace_path is not None:
+                    self._record_trace(leaf, float(reward))
+            stats.backprop_time += clock() - t3
+        self.search_time += time.perf_counter() - start
+
+    def _apply_virtual_loss(self, node, direction):
+        """
+        Add (direction=1) or remove (direction=-1) a virtual loss on the path
+        from `node` to the root. The loss is charged against the player who
+        chose each edge, so it always makes the path look worse to them.
+        """
+        penalty = direction * self.virtual_loss
+        current_node = node
+        while current_node is not None:
+            parent = current_node.parent
+            current_node.visits += direction
+            if parent is not None:
+                current_node.total_rewards -= parent.sign * penalty
+            current_node = parent
+
     def select(self):
         """
         Select a leaf node using the UCB1 formula.
@@ -222,7 +377,7 @@ class MCTS:
             elif not current.children: 
                 return current
             else:
-                current = current.select_child(self.root_player_color)
+                current = current.select_child()
         return current
 
     def simulate(self, node):
@@ -238,145 +393,17 @@ class MCTS:
     def minimax_simulation(self, state, depth):
         """
         Perform a Minimax simulation with alpha-beta pruning.
-        Uses action priorities to focus on promising moves.
+        Uses the shared action priorities (see priority.py) to focus on
+        promising moves.
         """
-        legal_actions_set = state.get_legal_actions()
-        if not legal_actions_set:
+        scored_actions = state.get_scored_actions()
+        if not scored_actions:
             return state.get_reward()
-            
-        # Convert action set to list and evaluate priorities
-        legal_actions = []
-        action_priorities = {}
-        
-        for action in legal_actions_set:
-            priority = 1  # Default lowest priority
-            
-            if isinstance(action, MoveAction):
-                init_coord = action.coord
-                directions = action.directions
-                final_coord = init_coord
-                
-                for direction in directions:
-                    final_coord += direction
-                
-                # Priority 1: Game-winning moves
-                if ((state.board.turn_color == PlayerColor.RED and final_coord.r == BOARD_N - 1) or
-                    (state.board.turn_color == PlayerColor.BLUE and final_coord.r == 0)):
-                    priority = 1000
-                    
-                # Priority 2: Single frog breakthrough
-                distance_to_goal = 0
-                if state.board.turn_color == PlayerColor.RED:
-                    distance_to_goal = BOARD_N - 1 - init_coord.r
-                    if distance_to_goal <= 2 and final_coord.r > init_coord.r:
-                        priority = max(priority, 500)
-                else:  # BLUE
-                    distance_to_goal = init_coord.r
-                    if distance_to_goal <= 2 and final_coord.r < init_coord.r:
-                        priority = max(priority, 500)
-                
-                # Calculate piece cohesion scores
-                try:
-                    current_cohesion = self._calculate_cohesion_score(state, state.board.turn_color, init_coord)
-                    final_cohesion = self._calculate_cohesion_score(state, state.board.turn_color, final_coord)
-                    
-                    is_isolated = current_cohesion < 0.3
-                    improves_cohesion = final_cohesion > current_cohesion
-                except:
-                    is_isolated = False
-                    improves_cohesion = False
-                
-                row_change = abs(final_coord.r - init_coord.r)
-                
-                # Check if move is forward
-                is_forward = False
-                if ((state.board.turn_color == PlayerColor.RED and final_coord.r > init_coord.r) or
-                    (state.board.turn_color == PlayerColor.BLUE and final_coord.r < init_coord.r)):
-                    is_forward = True
-                
-                # Analyze jump moves
-                is_jump = False
-                jump_target = None
-                if len(directions) == 1:
-                    direction = directions[0]
-                    next_coord = init_coord + direction
-                    try:
-                        if state.board[next_coord].state in (PlayerColor.RED, PlayerColor.BLUE):
-                            jump_target = next_coord + direction
-                            if (jump_target.r >= 0 and jump_target.r < BOARD_N and 
-                                jump_target.c >= 0 and jump_target.c < BOARD_N and
-                                state.board[jump_target].state == "LilyPad"):
-                                is_jump = True
-                    except (ValueError, IndexError, KeyError, AttributeError):
-                        pass
-                
-                if is_jump:
-                    if is_forward:
-                        # Priority 3: Multi-jump advance
-                        if row_change >= 2:
-                            priority = max(priority, 300)
-                        elif is_isolated and improves_cohesion:
-                            # Priority 4: Forward jumps with isolated pieces
-                            priority = max(priority, 120)
-                        else:
-                            # Priority 8: Forward line push
-                            priority = max(priority, 150)
-                    else:
-                        # Analyze chain jump potential
-                        has_chain_potential = False
-                        
-                        if jump_target:
-                            forward_directions = []
-                            if state.board.turn_color == PlayerColor.RED:
-                                forward_directions = [Direction.Down, Direction.DownLeft, Direction.DownRight]
-                            else:  # BLUE
-                                forward_directions = [Direction.Up, Direction.UpLeft, Direction.UpRight]
-                                
-                            for next_dir in forward_directions:
-                                try:
-                                    next_jump_over = jump_target + next_dir
-                                    if (0 <= next_jump_over.r < BOARD_N and 
-                                        0 <= next_jump_over.c < BOARD_N and
-                                        state.board[next_jump_over].state in (PlayerColor.RED, PlayerColor.BLUE)):
-                                        
-                                        next_jump_target = next_jump_over + next_dir
-                                        if (0 <= next_jump_target.r < BOARD_N and 
-                                            0 <= next_jump_target.c < BOARD_N and
-                                            state.board[next_jump_target].state == "LilyPad"):
-                                            
-                                            has_chain_potential = True
-                                            break
-                                except (ValueError, IndexError, KeyError, AttributeError):
-                                    continue
-                        
-                        if is_isolated and improves_cohesion:
-                            # Priority 16: Isolated piece moves improving cohesion
-                            priority = max(priority, 30)
-                        elif has_chain_potential:
-                            # Priority 16: Non-forward jumps with chain potential
-                            priority = max(priority, 30)
-                else:
-                    # Handle non-jump moves
-                    if is_forward:
-                        if is_isolated and improves_cohesion:
-                            # Priority 16: Isolated piece moves improving cohesion
-                            priority = max(priority, 30)
-                        else:
-                            priority = max(priority, 1)  # Default priority
-                    
-            elif isinstance(action, GrowAction):
-                # Priority 14: Default GROW actions
-                priority = 55
-            
-            action_priorities[action] = priority
-            legal_actions.append(action)
-        
-        # Sort actions by priority
-        sorted_actions = sorted(legal_actions, key=lambda a: action_priorities[a], reverse=True)
-        
-        # Consider only top priority actions for performance
+
+        # Actions are already sorted by priority; consider only the top ones
+        # for performance
         max_actions_to_consider = 12
-        pruned_actions = sorted_actions[:max_actions_to_consider]
+        pruned_actions = [scored.action for scored in scored_actions[:max_actions_to_consider]]
         
         # Perform Minimax search
         return self.minimax(state, min(depth, 3), float('-inf'), float('inf'), True, pruned_actions)
@@ -438,7 +465,7 @@ class MCTS:
             if current_state.is_terminal(): break
             legal_actions_list = current_state.get_legal_actions()
             if not legal_actions_list: break
-            action_to_simulate = random.choice(legal_actions_list)
+            action_to_simulate = self.rng.choice(legal_actions_list)
             try:
                 current_state = current_state.move(action_to_simulate)
             except ValueError: 
@@ -447,23 +474,26 @@ class MCTS:
 
     def backpropagation(self, node, reward_from_sim_leaf_pov):
         """
-        Backpropagate the simulation result through the tree.
-        Converts rewards to be relative to the root player's perspective.
+        Backpropagate the simulation result through the tree in a single
+        pass. The reward is converted once to RED's perspective using the
+        leaf's sign and then added unchanged to every node up to the root.
+        Returns the depth of the leaf below the root.
         """
-        sim_leaf_player_color = node.state.board.turn_color
-        
-        if sim_leaf_player_color == self.root_player_color:
-            reward_relative_to_root = reward_from_sim_leaf_pov
-        else:
-            reward_relative_to_root = -reward_from_sim_leaf_pov
-            
-        current_node = node
-        while current_node:
-            if current_node.parent:
-                current_node.update(reward_relative_to_root)
-            else:
-                current_node.visits += 1
-            current_node = current_node.parent
+        reward = reward_from_sim_leaf_pov * node.sign
+        depth = -1
+        while node is not None:
+            node.visits += 1
+            node.total_rewards += reward
+            node = node.parent
+            depth += 1
+        return depth
+
+
+def _same_action(a, b) -> bool:
+    # MoveAction accepts a bare Direction or a tuple, so compare normalised
+    if isinstance(a, MoveAction) and isinstance(b, MoveAction):
+        return a.coord == b.coord and a.directions == b.directions
+    return type(a) is type(b)
 
 
 # Constants for jump directions
@@ -474,10 +504,33 @@ ALL_DIRECTIONS_ORDERED = [
 LEGAL_JUMP_DIRECTIONS_RED = tuple(d for d in ALL_DIRECTIONS_ORDERED if d not in {Direction.Up, Direction.UpRight, Direction.UpLeft})
 LEGAL_JUMP_DIRECTIONS_BLUE = tuple(d for d in ALL_DIRECTIONS_ORDERED if d not in {Direction.Down, Direction.DownRight, Direction.DownLeft})
 
+def _node_bytes(node) -> int:
+    """
+    Approximate memory held by one node alone: the node and its action
+    lists, its game state and a board whose cells are copied per state.
+    Objects shared between states (coordinates, move history entries and
+    actions) are not counted.
+    """
+    state = node.state
+    board = state.board
+    distribution = state.frog_distribution
+    parts = [
+        node, node.children, node.unexplored_actions,
+        state, vars(state), state.my_frogs,
+        board, vars(board), board._state, board._history,
+        state.features, *state.features.values,
+        distribution, distribution.counts, *distribution.rows, *distribution.cols,
+        *board._state.values(),
+    ]
+    if state._scored_actions is not None:
+        parts.append(state._scored_actions)
+        parts.extend(state._scored_actions)
+    return sum(map(sys.getsizeof, parts))
+
+
 def _clone_board_mcts_version(board_to_clone: Board) -> Board:
     """
     Create a deep copy of a game board for MCTS simulation.
-    Preserves all necessary state including fixed opening move counters.
     """
     new_board = Board(initial_player=board_to_clone.turn_color)
 
@@ -488,9 +541,6 @@ def _clone_board_mcts_version(board_to_clone: Board) -> Board:
 
     new_board._history = list(board_to_clone._history)
 
-    new_board._red_fixed_moves = board_to_clone._red_fixed_moves
-    new_board._blue_fixed_moves = board_to_clone._blue_fixed_moves
-    
     return new_board
 
 class GameState:
@@ -498,23 +548,26 @@ class GameState:
     Represents the complete state of a game at a particular point.
     Includes the board state and additional information needed for MCTS.
     """
-    def __init__(self, last_move, board, test_mode=False):
+    # Process-wide instrumentation counters, read as deltas by SearchStats
+    clones = 0
+    movegen_calls = 0
+    movegen_cache_hits = 0
+
+    def __init__(self, last_move, board, test_mode=False, features=None,
+                 frog_distribution=None):
         self.board = board
         self.last_move = last_move
         self.test_mode = test_mode
+        # Evaluation features are inherited incrementally from the parent
+        # state when available (see move()), otherwise computed from scratch
+        self.features = features if features is not None \
+            else EvalFeatures.from_board(board)
+        self.frog_distribution = frog_distribution if frog_distribution is not None \
+            else FrogDistribution.from_board(board)
         self.my_frogs = []
         self._update_my_frogs()
+        self._scored_actions = None
         
-        # Initialize fixed opening move counters if not present
-        if not hasattr(self.board, '_red_fixed_moves'):
-            self.board._red_fixed_moves = 0
-        if not hasattr(self.board, '_blue_fixed_moves'):
-            self.board._blue_fixed_moves = 0
-            
-        # Local copies for tracking fixed opening moves
-        self._red_fixed_moves = self.board._red_fixed_moves
-        self._blue_fixed_moves = self.board._blue_fixed_moves
-
     def _get_bit(self, coord: Coord) -> int:
         if 0 <= coord.r < BOARD_N and 0 <= coord.c < BOARD_N:
             return 1 << (coord.r * BOARD_N + coord.c)
@@ -541,13 +594,18 @@ class GameState:
         # Check original board for LilyPad, and current mask for emptiness
         return self.board[coord].state == "LilyPad" and not (occupied_mask & self._get_bit(coord))
 
-    def _enumerate_jumps(self, start_coord: Coord, player_color: PlayerColor) -> set[MoveAction]:
+    def _enumerate_jumps(self, start_coord: Coord, player_color: PlayerColor,
+                         initial_mask: int | None = None) -> list[MoveAction]:
         """
         Find all possible jump sequences from a given starting coordinate.
-        Uses depth-first search to find all valid jump combinations.
-        """
-        results = set()
-        initial_mask = self._get_initial_occupied_bitmask()
+        Uses depth-first search to find all valid jump combinations. The
+        result is in search order (not a set), so that it does not depend on
+        hash randomisation.
+        """
+        results = []
+        seen = set()
+        if initial_mask is None:
+            initial_mask = self._get_initial_occupied_bitmask()
         
         stack = [(start_coord, [], initial_mask, {start_coord})]
         
@@ -591,159 +649,98 @@ class GameState:
                         stack.append((land_coord, new_path_dirs, updated_mask, new_visited_landings))
             
             if not jumped_further_in_this_step and len(current_path_dirs) >= 1:
-                results.add(MoveAction(start_coord, tuple(current_path_dirs)))
+                action = MoveAction(start_coord, tuple(current_path_dirs))
+                if action not in seen:
+                    seen.add(action)
+                    results.append(action)
         return results
 
     def _update_my_frogs(self):
         """Update the list of frogs belonging to the current player."""
-        self.my_frogs = []
-        for r in range(BOARD_N):
-            for c in range(BOARD_N):
-                coord = Coord(r, c)
-                if self.board[coord].state == self.board.turn_color:
-                    self.my_frogs.append(coord)
+        turn_color = self.board.turn_color
+        self.my_frogs = [
+            coord for coord, cell in self.board._state.items()
+            if cell.state == turn_color
+        ]
 
     def is_opening_phase(self):
         """Check if the game is still in the opening phase (first 30 turns)."""
         return self.board.turn_count < 30
         
-    def should_use_fixed_opening(self):
-        """
-        Determine if fixed opening moves should be used.
-        Returns True if within first 15 turns and player hasn't used all fixed moves.
-        """
-        if self.test_mode:
-            return False
-        if self.board.turn_count < 15:
-            if self.board.turn_color == PlayerColor.RED and self._red_fixed_moves < 5:
-                return True
-            elif self.board.turn_color == PlayerColor.BLUE and self._blue_fixed_moves < 5:
-                return True
-        return False
-        
-    def get_fixed_opening_move(self):
-        """
-        Return the next fixed opening move for the current player.
-        Returns None if no fixed move is available.
-        """
-        if self.board.turn_color == PlayerColor.RED:
-            if self._red_fixed_moves == 0: return MoveAction(Coord(0, 2), (Direction.Down,))
-            elif self._red_fixed_moves == 1: return MoveAction(Coord(0, 5), (Direction.Down,))
-            elif self._red_fixed_moves == 2: return GrowAction()
-            elif self._red_fixed_moves == 3: return MoveAction(Coord(0,1), (Direction.DownRight,))
-            elif self._red_fixed_moves == 4: return MoveAction(Coord(0, 6), (Direction.DownLeft,))
-        else:
-            if self._blue_fixed_moves == 0: return MoveAction(Coord(7, 2), (Direction.Up,))
-            elif self._blue_fixed_moves == 1: return MoveAction(Coord(7, 5), (Direction.Up,))
-            elif self._blue_fixed_moves == 2: return GrowAction()
-            elif self._blue_fixed_moves == 3: return MoveAction(Coord(7,1), (Direction.UpRight,))
-            elif self._blue_fixed_moves == 4: return MoveAction(Coord(7, 6), (Direction.UpLeft,))
-        return None
-
     def get_legal_actions(self) -> list[Action]:
         """
         Get all legal actions for the current state.
         Returns a list of actions sorted by priority (highest first).
         """
-        if self.should_use_fixed_opening() and not self.test_mode:
-            fixed_move = self.get_fixed_opening_move()
-            if fixed_move is not None: return [fixed_move]
-        
-        prioritized_actions_tuples = []
+        return [scored.action for scored in self.get_scored_actions()]
+
+    def get_scored_actions(self) -> list[ScoredAction]:
+        """
+        Get all legal actions for the current state, each with its ordering
+        features (see priority.py), sorted by priority (highest first).
+        The result is computed once per state and cached.
+        """
+        GameState.movegen_calls += 1
+        if self._scored_actions is not None:
+            GameState.movegen_cache_hits += 1
+            return self._scored_actions
+
+        scored_actions = []
         current_player_color = self.board.turn_color
+        cells = self.board._state
+        goal_row = BOARD_N - 1 if current_player_color == PlayerColor.RED else 0
+        forward_sign = 1 if current_player_color == PlayerColor.RED else -1
+        jump_directions = LEGAL_JUMP_DIRECTIONS_RED if current_player_color == PlayerColor.RED \
+            else LEGAL_JUMP_DIRECTIONS_BLUE
+        occupied_mask = self._get_initial_occupied_bitmask()
 
         for coord in self.my_frogs:
-            is_at_goal_line = False
-            if current_player_color == PlayerColor.RED and coord.r == BOARD_N - 1:
-                is_at_goal_line = True
-            elif current_player_color == PlayerColor.BLUE and coord.r == 0:
-                is_at_goal_line = True
-
-            # Generate Sliding Moves
-            for direction in ALL_DIRECTIONS_ORDERED:
-                slide_action = MoveAction(coord, (direction,))
-                try:
-                    self.board._validate_move_action(slide_action) 
-                    final_slide_coord = coord + direction.value
-                    is_forward_slide = False
-                    if current_player_color == PlayerColor.RED:
-                        if final_slide_coord.r > coord.r: is_forward_slide = True
-                    else: 
-                        if final_slide_coord.r < coord.r: is_forward_slide = True
-                    
-                    current_slide_priority = 1
-                    if is_at_goal_line:
-                        current_slide_priority = 0.5  # Lower priority for moves on goal line
-                    else:
-                        # Check if near goal line
-                        is_near_goal = False
-                        target_coord = coord + direction.value
-                        if current_player_color == PlayerColor.RED and coord.r == BOARD_N - 2:  # Red's 6th row
-                            if self.board[target_coord].state == "LilyPad":  # Moving to goal on lily pad
-                                is_near_goal = True
-                        elif current_player_color == PlayerColor.BLUE and coord.r == 1:  # Blue's 1st row
-                            if self.board[target_coord].state == "LilyPad":  # Moving to goal on lily pad
-                                is_near_goal = True
-                        
-                        if is_near_goal:
-                            current_slide_priority = 55  # Higher priority for moves near goal
-                        else:
-                            current_slide_priority = 55 if is_forward_slide else 1
-                    prioritized_actions_tuples.append((current_slide_priority, slide_action))
-                except IllegalActionException:
-                    pass 
-
-            # Generate Jump Moves
-            jump_actions_for_frog = self._enumerate_jumps(coord, current_player_color)
-            for jump_action in jump_actions_for_frog:
-                num_segments = len(jump_action.directions)
-                current_pos_for_calc = coord 
-                final_jump_coord = coord 
+            start_cohesion = self._calculate_cohesion_score(current_player_color, coord)
+
+            def scored(action, dest, jumps):
+                dest_cohesion = self._calculate_cohesion_score(current_player_color, dest)
+                return score_move(action, dest, jumps, goal_row, forward_sign,
+                                  start_cohesion, dest_cohesion)
+
+            # Slides onto adjacent lily pads, and single jumps over an adjacent
+            # frog (a single-direction MoveAction covers both)
+            for direction in jump_directions:
+                dr, dc = direction.value.r, direction.value.c
+                r_adj, c_adj = coord.r + dr, coord.c + dc
+                if not (0 <= r_adj < BOARD_N and 0 <= c_adj < BOARD_N):
+                    continue
+                adj_state = cells[Coord(r_adj, c_adj)].state
+                if adj_state == "LilyPad":
+                    scored_actions.append(scored(
+                        MoveAction(coord, (direction,)), Coord(r_adj, c_adj), 0))
+                elif adj_state in (PlayerColor.RED, PlayerColor.BLUE):
+                    r_land, c_land = r_adj + dr, c_adj + dc
+                    if 0 <= r_land < BOARD_N and 0 <= c_land < BOARD_N and \
+                       cells[Coord(r_land, c_land)].state == "LilyPad":
+                        scored_actions.append(scored(
+                            MoveAction(coord, (direction,)), Coord(r_land, c_land), 1))
+
+            # Multi-segment jump sequences (single jumps are covered above)
+            for jump_action in self._enumerate_jumps(coord, current_player_color, occupied_mask):
+                if len(jump_action.directions) < 2:
+                    continue
+                final_jump_coord = coord
                 for jump_dir_segment in jump_action.directions:
-                    land_coord = current_pos_for_calc + jump_dir_segment.value + jump_dir_segment.value
-                    final_jump_coord = land_coord 
-                    current_pos_for_calc = land_coord 
-
-                if is_at_goal_line:
-                    current_jump_priority = 0.5  # Lower priority for jumps on goal line
-                else:
-                    is_forward_jump = False
-                    if current_player_color == PlayerColor.RED:
-                        if final_jump_coord.r > coord.r: is_forward_jump = True
-                    else: 
-                        if final_jump_coord.r < coord.r: is_forward_jump = True
-                    
-                    row_change = abs(final_jump_coord.r - coord.r)
-                    if num_segments >= 2:
-                        if is_forward_jump and row_change >= 2: current_jump_priority = 300 
-                        elif is_forward_jump: current_jump_priority = 250 
-                        else: current_jump_priority = 100 
-                    elif num_segments == 1:
-                        if is_forward_jump: current_jump_priority = 150 
-                        else: current_jump_priority = 20
-                prioritized_actions_tuples.append((current_jump_priority, jump_action))
+                    final_jump_coord = final_jump_coord + jump_dir_segment.value + jump_dir_segment.value
+                scored_actions.append(scored(
+                    jump_action, final_jump_coord, len(jump_action.directions)))
 
         # Check if GROW action is available
-        current_player_frogs_count = 0
-        has_empty_lilypad = False
-        
-        for r_idx in range(BOARD_N):
-            for c_idx in range(BOARD_N):
-                cell_coord = Coord(r_idx, c_idx)
-                cell_state_obj = self.board[cell_coord]
-                if cell_state_obj.state == current_player_color:
-                    current_player_frogs_count += 1
-                if cell_state_obj.state == "LilyPad": 
-                    has_empty_lilypad = True
-        
-        if current_player_frogs_count < BOARD_N and has_empty_lilypad:
-            prioritized_actions_tuples.append((50, GrowAction()))
-        
-        # Sort actions by priority and extract the actions
-        prioritized_actions_tuples.sort(key=lambda x: x[0], reverse=True)
-        sorted_actions = [action for priority, action in prioritized_actions_tuples]
-        
-        return sorted_actions if sorted_actions else [GrowAction()] # Ensure at least GROW if nothing else
+        has_empty_lilypad = any(cell.state == "LilyPad" for cell in cells.values())
+        if self.frog_distribution.counts[current_player_color] < BOARD_N and has_empty_lilypad:
+            scored_actions.append(score_grow())
+
+        # Sort actions by priority (stable, so generation order breaks ties)
+        scored_actions.sort(key=lambda sa: sa.priority, reverse=True)
+
+        # Ensure at least GROW if nothing else
+        self._scored_actions = scored_actions if scored_actions else [score_grow()]
+        return self._scored_actions
 
     def _check_chain_jump_potential(self, coord): 
         return False # Obsolete, _enumerate_jumps handles this
@@ -754,9 +751,15 @@ class GameState:
         Raises ValueError if the action is illegal.
         """
         new_board = _clone_board_mcts_version(self.board)
+        GameState.clones += 1
         try:
-            new_board.apply_action(action)
-            new_state = GameState(action, new_board, self.test_mode)
+            mutation = new_board.apply_action(action)
+            features = self.features.copy()
+            features.apply(new_board, mutation)
+            frog_distribution = self.frog_distribution.copy()
+            frog_distribution.apply(mutation)
+            new_state = GameState(action, new_board, self.test_mode, features,
+                                  frog_distribution)
             return new_state 
         except IllegalActionException as e:
             raise ValueError(f"Illegal action: {e}") from e
@@ -769,7 +772,7 @@ class GameState:
         """
         Calculate the reward value for the current state.
         Returns a high positive/negative value for terminal states,
-        otherwise returns a heuristic evaluation.
+        otherwise returns the weighted feature evaluation (see evaluation.py).
         """
         if self.is_terminal():
             red_score = self.board._player_score(PlayerColor.RED)
@@ -778,10 +781,7 @@ class GameState:
                 return 1000.0 if red_score > blue_score else (-1000.0 if red_score < blue_score else 0.0)
             else:
                 return 1000.0 if blue_score > red_score else (-1000.0 if blue_score < red_score else 0.0)
-        score = 0.0
-        red_goal_count = self.board._row_count(PlayerColor.RED, BOARD_N - 1)
-        blue_goal_count = self.board._row_count(PlayerColor.BLUE, 0)
-        score += 5.0 * (red_goal_count - blue_goal_count)
+        score = self.features.score(EVAL_WEIGHTS)
         return score if self.board.turn_color == PlayerColor.RED else -score
 
     def _calculate_cohesion_score(self, player_color, piece_coord):
@@ -789,15 +789,8 @@ class GameState:
         Calculate how well a piece is connected with other friendly pieces.
         Returns a score between 0 and 1, where 1 indicates perfect cohesion.
         """
-        cohesion_score = 0
-        ally_pieces = []
-        for coord_ally, cell_ally in self.board._state.items():
-            if cell_ally.state == player_color and coord_ally != piece_coord:
-                ally_pieces.append(coord_ally)
-        if not ally_pieces: return 0
-        total_distance = sum(abs(piece_coord.r - ac.r) + abs(piece_coord.c - ac.c) for ac in ally_pieces)
-        avg_distance = total_distance / len(ally_pieces)
-        return 1.0 - (avg_distance / (2 * BOARD_N))
+        occupied = self.board._state[piece_coord].state == player_color
+        return self.frog_distribution.cohesion(player_color, piece_coord, occupied)
 
     def _check_jump_bridge_formation(self, player_color, target_coord):
         """
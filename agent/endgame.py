@@ -0,0 +1,233 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Exact endgame solver. Once few frogs are left off their goal rows, or few
+# turns remain before MAX_TURNS, the game tree is small enough to search to
+# terminal positions with alpha-beta and a transposition table. Each depth of
+# the iterative deepening is searched twice: once scoring unresolved
+# (depth-limited) leaves as losses for the root player and once as wins. When
+# the two bounds agree the value is exact and the move found is provably best.
+# The solver gives up, so the caller can fall back to MCTS, once it has
+# searched its node budget or run past its deadline (checked every
+# DEADLINE_CHECK_NODES nodes).
+
+import time
+
+from referee.game import BOARD_N, MAX_TURNS, Board, Coord, Action, \
+    MoveAction, GrowAction
+from referee.game.player import PlayerColor
+
+from .MCTS import LEGAL_JUMP_DIRECTIONS_RED, LEGAL_JUMP_DIRECTIONS_BLUE
+from .zobrist import position_key, update_key
+
+
+ENDGAME_UNFINISHED_FROGS = 3  # both colours combined
+ENDGAME_REMAINING_PLIES = 6
+DEFAULT_NODE_LIMIT = 50_000
+DEADLINE_CHECK_NODES = 256
+
+WIN, DRAW, LOSS = 1, 0, -1
+
+_EXACT, _LOWER, _UPPER = range(3)
+_FROGS = (PlayerColor.RED, PlayerColor.BLUE)
+
+
+class NodeLimitReached(Exception):
+    """The solver ran out of its node or time budget before proving a result."""
+
+
+def _goal_row(color: PlayerColor) -> int:
+    return BOARD_N - 1 if color == PlayerColor.RED else 0
+
+
+def unfinished_frogs(board: Board) -> int:
+    """
+    Number of frogs (of both colours) not yet on their goal row.
+    """
+    return sum(
+        1 for coord, cell in board._state.items()
+        if cell.state in _FROGS and coord.r != _goal_row(cell.state)
+    )
+
+
+def should_solve(board: Board) -> bool:
+    """
+    Whether the position is small enough to hand to the exact solver.
+    """
+    return unfinished_frogs(board) <= ENDGAME_UNFINISHED_FROGS \
+        or MAX_TURNS - board.turn_count <= ENDGAME_REMAINING_PLIES
+
+
+def legal_actions(board: Board) -> list[Action]:
+    """
+    Every position the player to move can reach, as one action each: every
+    slide, one jump sequence per reachable landing square, and GROW. Jumps
+    follow the referee's rules (Board._resolve_move_destination) rather than
+    `GameState`'s stricter ones: only the final landing must be a lily pad
+    (intermediate ones need only be free of frogs), and the moving frog's
+    starting square still counts as a frog to jump over. Actions are ordered
+    by forward progress so that alpha-beta sees strong moves first.
+    """
+    color = board.turn_color
+    cells = board._state
+    directions = LEGAL_JUMP_DIRECTIONS_RED if color == PlayerColor.RED \
+        else LEGAL_JUMP_DIRECTIONS_BLUE
+    forward_sign = 1 if color == PlayerColor.RED else -1
+
+    scored: list[tuple[int, Action]] = []
+    for coord, cell in cells.items():
+        if cell.state != color:
+            continue
+
+        for direction in directions:
+            r, c = coord.r + direction.r, coord.c + direction.c
+            if 0 <= r < BOARD_N and 0 <= c < BOARD_N and \
+               cells[Coord(r, c)].state == "LilyPad":
+                scored.append((direction.r * forward_sign,
+                               MoveAction(coord, (direction,))))
+
+        # Depth-first over jump sequences without revisiting a landing
+        # (revisits only add longer routes to the same squares)
+        stack = [(coord, ())]
+        visited = {coord}
+        while stack:
+            pos, path = stack.pop()
+            for direction in directions:
+                dr, dc = direction.r, direction.c
+                r_land, c_land = pos.r + 2 * dr, pos.c + 2 * dc
+                if not (0 <= r_land < BOARD_N and 0 <= c_land < BOARD_N):
+                    continue
+                over = Coord(pos.r + dr, pos.c + dc)
+                land = Coord(r_land, c_land)
+                if land in visited or cells[over].state not in _FROGS or \
+                   cells[land].state in _FROGS:
+                    continue
+                visited.add(land)
+                new_path = path + (direction,)
+                if cells[land].state == "LilyPad":
+                    scored.append(((land.r - coord.r) * forward_sign,
+                                   MoveAction(coord, new_path)))
+                stack.append((land, new_path))
+
+    scored.append((0, GrowAction()))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [action for _, action in scored]
+
+
+class EndgameSolver:
+    """
+    Iterative-deepening alpha-beta solver over game outcomes (WIN, DRAW,
+    LOSS). `solve` returns a provably best move, or None if the node budget
+    or `time_limit` (seconds per solve, if given) runs out first, in which
+    case the caller should fall back to search.
+    """
+
+    def __init__(self, node_limit: int = DEFAULT_NODE_LIMIT,
+                 time_limit: float | None = None):
+        self._node_limit = node_limit
+        self._time_limit = time_limit
+        self._deadline: float | None = None
+        self._nodes = 0
+        self._root_color: PlayerColor | None = None
+        self._table: dict[tuple[int, int, int], tuple[int, int, int]] = {}
+        self.value: int | None = None
+
+    @property
+    def nodes(self) -> int:
+        return self._nodes
+
+    def solve(self, board: Board) -> Action | None:
+        board = board.clone()
+        key = position_key(board)
+        self._nodes = 0
+        self._root_color = board.turn_color
+        self._table.clear()
+        self.value = None
+        self._deadline = time.perf_counter() + self._time_limit \
+            if self._time_limit is not None else None
+
+        try:
+            for depth in range(1, MAX_TURNS - board.turn_count + 1):
+                low, action = self._search_root(board, key, depth, LOSS)
+                if low == WIN:
+                    self.value = WIN
+                    return action
+                high, _ = self._search_root(board, key, depth, WIN)
+                if low == high:
+                    self.value = low
+                    return action
+        except NodeLimitReached:
+            return None
+        return None
+
+    def _search_root(self, board: Board, key: int, depth: int, cutoff: int):
+        best_value, best_action = LOSS - 1, None
+        alpha = LOSS - 1
+        for action in legal_actions(board):
+            mutation = board.apply_action(action)
+            value = -self._negamax(board, update_key(key, mutation),
+                                   depth - 1, -WIN, -alpha, cutoff)
+            board.undo_action()
+            if value > best_value:
+                best_value, best_action = value, action
+                alpha = max(alpha, value)
+                if best_value == WIN:
+                    break
+        return best_value, best_action
+
+    def _negamax(self, board: Board, key: int, depth: int,
+                 alpha: int, beta: int, cutoff: int) -> int:
+        self._nodes += 1
+        if self._nodes > self._node_limit:
+            raise NodeLimitReached()
+        if self._deadline is not None \
+                and self._nodes % DEADLINE_CHECK_NODES == 0 \
+                and time.perf_counter() > self._deadline:
+            raise NodeLimitReached()
+
+        if board.game_over:
+            winner = board.winner_color
+            if winner is None:
+                return DRAW
+            return WIN if winner == board.turn_color else LOSS
+
+        if depth == 0:
+            # Unresolved leaf: scored as `cutoff` from the root's perspective
+            return cutoff if board.turn_color == self._root_color else -cutoff
+
+        # The turn count is part of the key because it decides how close the
+        # position is to the MAX_TURNS cut-off
+        table_key = (key, board.turn_count, cutoff)
+        entry = self._table.get(table_key)
+        if entry is not None and entry[0] >= depth:
+            _, flag, value = entry
+            if flag == _EXACT:
+                return value
+            if flag == _LOWER:
+                alpha = max(alpha, value)
+            elif flag == _UPPER:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        alpha_orig = alpha
+        best = LOSS - 1
+        for action in legal_actions(board):
+            mutation = board.apply_action(action)
+            value = -self._negamax(board, update_key(key, mutation),
+                                   depth - 1, -beta, -alpha, cutoff)
+            board.undo_action()
+            if value > best:
+                best = value
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best <= alpha_orig:
+            flag = _UPPER
+        elif best >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self._table[table_key] = (depth, flag, best)
+        return best
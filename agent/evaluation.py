@@ -0,0 +1,311 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Heuristic evaluation features for non-terminal positions. Every feature is a
+# sum of per-cell contributions that depend only on cells within two steps of
+# the cell itself, so after an action we only need to re-score the
+# neighbourhood of the cells that actually changed. `FrogDistribution` tracks
+# where each colour's frogs are, for the cohesion heuristic in move ordering.
+
+import json
+from pathlib import Path
+
+from referee.game import BOARD_N, Coord, Direction
+from referee.game.board import ILLEGAL_RED_DIRECTIONS, ILLEGAL_BLUE_DIRECTIONS
+from referee.game.player import PlayerColor
+
+
+FEATURE_NAMES = ("goal", "progress", "jumps", "blocked", "frontier", "mobility")
+GOAL, PROGRESS, JUMPS, BLOCKED, FRONTIER, MOBILITY = range(len(FEATURE_NAMES))
+
+DEFAULT_WEIGHTS = {
+    "goal": 5.0,
+    "progress": 0.5,
+    "jumps": 0.3,
+    "blocked": -0.4,
+    "frontier": 0.1,
+    "mobility": 0.05,
+}
+DEFAULT_WEIGHTS_PATH = Path(__file__).with_name("eval_weights.json")
+
+FORWARD_DIRECTIONS = {
+    PlayerColor.RED: frozenset(ILLEGAL_BLUE_DIRECTIONS),
+    PlayerColor.BLUE: frozenset(ILLEGAL_RED_DIRECTIONS),
+}
+GOAL_ROWS = {PlayerColor.RED: BOARD_N - 1, PlayerColor.BLUE: 0}
+_FROG_STATES = (PlayerColor.RED, PlayerColor.BLUE)
+
+
+def load_weights(path: Path | str | None = DEFAULT_WEIGHTS_PATH) -> list[float]:
+    """
+    Load feature weights from a JSON object mapping feature names to numbers.
+    Missing features keep their default weight; unknown names are an error.
+    Returns the weights as a list ordered like `FEATURE_NAMES`.
+    """
+    weights = dict(DEFAULT_WEIGHTS)
+    if path is not None and Path(path).exists():
+        with open(path) as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(FEATURE_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown evaluation features: {sorted(unknown)}")
+        weights.update({name: float(w) for name, w in overrides.items()})
+    return [weights[name] for name in FEATURE_NAMES]
+
+
+EVAL_WEIGHTS = load_weights()
+
+
+def _in_bounds(r: int, c: int) -> bool:
+    return 0 <= r < BOARD_N and 0 <= c < BOARD_N
+
+
+def _build_step_table(color: PlayerColor) -> dict[Coord, tuple]:
+    # For each square, the (is_forward, adjacent, landing) triples of every
+    # direction the colour may move in; landing is None off the board.
+    illegal = ILLEGAL_RED_DIRECTIONS if color == PlayerColor.RED \
+        else ILLEGAL_BLUE_DIRECTIONS
+    table = {}
+    for r in range(BOARD_N):
+        for c in range(BOARD_N):
+            steps = []
+            for direction in Direction:
+                if direction in illegal:
+                    continue
+                dr, dc = direction.r, direction.c
+                if not _in_bounds(r + dr, c + dc):
+                    continue
+                land = Coord(r + 2 * dr, c + 2 * dc) \
+                    if _in_bounds(r + 2 * dr, c + 2 * dc) else None
+                steps.append((
+                    direction in FORWARD_DIRECTIONS[color],
+                    Coord(r + dr, c + dc),
+                    land,
+                ))
+            table[Coord(r, c)] = tuple(steps)
+    return table
+
+
+_STEP_TABLE = {color: _build_step_table(color) for color in PlayerColor}
+
+_ADJACENT = {
+    Coord(r, c): tuple(
+        Coord(r + d.r, c + d.c) for d in Direction if _in_bounds(r + d.r, c + d.c)
+    )
+    for r in range(BOARD_N) for c in range(BOARD_N)
+}
+
+# Cells whose contribution may change when a given cell changes
+_REGION = {
+    Coord(r, c): tuple(
+        Coord(rr, cc)
+        for rr in range(max(0, r - 2), min(BOARD_N, r + 3))
+        for cc in range(max(0, c - 2), min(BOARD_N, c + 3))
+    )
+    for r in range(BOARD_N) for c in range(BOARD_N)
+}
+
+
+def _accumulate(cells, coord: Coord, values: list[list[float]], sign: int):
+    """
+    Add `sign` times the contribution of the cell at `coord` to the per-colour
+    feature `values`. `cells` maps coordinates to `CellState`s.
+    """
+    state = cells[coord].state
+    if state is None:
+        return
+
+    if state == "LilyPad":
+        near_red = near_blue = False
+        for adj in _ADJACENT[coord]:
+            adj_state = cells[adj].state
+            if adj_state == PlayerColor.RED:
+                near_red = True
+            elif adj_state == PlayerColor.BLUE:
+                near_blue = True
+        if near_red:
+            values[PlayerColor.RED][FRONTIER] += sign
+        if near_blue:
+            values[PlayerColor.BLUE][FRONTIER] += sign
+        return
+
+    v = values[state]
+    goal_row = GOAL_ROWS[state]
+    v[PROGRESS] += sign * (BOARD_N - 1 - abs(goal_row - coord.r))
+    if coord.r == goal_row:
+        v[GOAL] += sign
+
+    forward_moves = 0
+    for is_forward, adj, land in _STEP_TABLE[state][coord]:
+        adj_state = cells[adj].state
+        if adj_state == "LilyPad":
+            v[MOBILITY] += sign
+            forward_moves += is_forward
+        elif adj_state in _FROG_STATES and land is not None \
+                and cells[land].state == "LilyPad":
+            v[JUMPS] += sign
+            forward_moves += is_forward
+    if forward_moves == 0 and coord.r != goal_row:
+        v[BLOCKED] += sign
+
+
+class _CellOverlay(dict):
+    """
+    The cells a mutation changed, with their contents on the other side of
+    it, in front of the board's current cells (`base`): a view of the board
+    before the mutation that doesn't copy the rest of it.
+    """
+    __slots__ = ("base",)
+
+    def __init__(self, changed, base):
+        super().__init__(changed)
+        self.base = base
+
+    def __missing__(self, coord: Coord):
+        return self.base[coord]
+
+
+class EvalFeatures:
+    """
+    Per-colour evaluation features of a position, indexed by player colour and
+    then by feature (see `FEATURE_NAMES`). Kept up to date incrementally via
+    `apply` and `undo` rather than being recomputed from scratch.
+    """
+    __slots__ = ("values",)
+
+    # Mutations touching more cells than this are cheaper to rescan fully
+    _FULL_RESCAN_CELLS = 24
+
+    def __init__(self, values: list[list[float]] | None = None):
+        self.values = values or [
+            [0] * len(FEATURE_NAMES) for _ in PlayerColor
+        ]
+
+    @classmethod
+    def from_board(cls, board) -> "EvalFeatures":
+        """
+        Compute the features of a board from scratch.
+        """
+        features = cls()
+        cells = board._state
+        for coord in _REGION:
+            _accumulate(cells, coord, features.values, 1)
+        return features
+
+    def copy(self) -> "EvalFeatures":
+        return EvalFeatures([list(v) for v in self.values])
+
+    def apply(self, board, mutation):
+        """
+        Update the features after `mutation` (as returned by
+        `board.apply_action`) has been applied to `board`.
+        """
+        before = _CellOverlay(
+            ((m.cell, m.prev) for m in mutation.cell_mutations), board._state)
+        self._shift(before, board._state, mutation, board)
+
+    def undo(self, board, mutation):
+        """
+        Update the features after `mutation` (as returned by
+        `board.undo_action`) has been reverted on `board`.
+        """
+        before = _CellOverlay(
+            ((m.cell, m.next) for m in mutation.cell_mutations), board._state)
+        self._shift(before, board._state, mutation, board)
+
+    def _shift(self, before, after, mutation, board):
+        if len(mutation.cell_mutations) > self._FULL_RESCAN_CELLS:
+            self.values = EvalFeatures.from_board(board).values
+            return
+        region = set()
+        for m in mutation.cell_mutations:
+            region.update(_REGION[m.cell])
+        for coord in region:
+            _accumulate(before, coord, self.values, -1)
+            _accumulate(after, coord, self.values, 1)
+
+    def score(self, weights: list[float] = EVAL_WEIGHTS) -> float:
+        """
+        Weighted feature difference from RED's perspective.
+        """
+        red, blue = self.values[PlayerColor.RED], self.values[PlayerColor.BLUE]
+        return sum(w * (r - b) for w, r, b in zip(weights, red, blue))
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        return {
+            str(color): dict(zip(FEATURE_NAMES, self.values[color]))
+            for color in PlayerColor
+        }
+
+
+class FrogDistribution:
+    """
+    Per-colour frog counts plus histograms of the rows and columns frogs sit
+    on, kept up to date from board mutations. Total Manhattan distance from a
+    square to every frog of a colour is then an O(BOARD_N) sum over the two
+    histograms instead of a scan of the whole board.
+    """
+    __slots__ = ("counts", "rows", "cols")
+
+    def __init__(self, counts=None, rows=None, cols=None):
+        self.counts = counts or [0 for _ in PlayerColor]
+        self.rows = rows or [[0] * BOARD_N for _ in PlayerColor]
+        self.cols = cols or [[0] * BOARD_N for _ in PlayerColor]
+
+    @classmethod
+    def from_board(cls, board) -> "FrogDistribution":
+        distribution = cls()
+        for coord, cell in board._state.items():
+            distribution._add(coord, cell.state, 1)
+        return distribution
+
+    def copy(self) -> "FrogDistribution":
+        return FrogDistribution(
+            list(self.counts),
+            [list(r) for r in self.rows],
+            [list(c) for c in self.cols],
+        )
+
+    def _add(self, coord: Coord, state, sign: int):
+        if state in _FROG_STATES:
+            self.counts[state] += sign
+            self.rows[state][coord.r] += sign
+            self.cols[state][coord.c] += sign
+
+    def apply(self, mutation):
+        """
+        Update after `mutation` (from `board.apply_action`) has been applied.
+        """
+        for m in mutation.cell_mutations:
+            self._add(m.cell, m.prev.state, -1)
+            self._add(m.cell, m.next.state, 1)
+
+    def undo(self, mutation):
+        """
+        Update after `mutation` (from `board.undo_action`) has been reverted.
+        """
+        for m in mutation.cell_mutations:
+            self._add(m.cell, m.next.state, -1)
+            self._add(m.cell, m.prev.state, 1)
+
+    def total_distance(self, color: PlayerColor, coord: Coord) -> int:
+        """
+        Sum of Manhattan distances from `coord` to every frog of `color`.
+        """
+        r, c = coord.r, coord.c
+        rows, cols = self.rows[color], self.cols[color]
+        return sum(n * abs(r - i) for i, n in enumerate(rows) if n) \
+            + sum(n * abs(c - i) for i, n in enumerate(cols) if n)
+
+    def cohesion(self, color: PlayerColor, coord: Coord, occupied: bool) -> float:
+        """
+        Cohesion of a `color` frog at `coord` with its allies, between 0 and 1
+        (1 meaning every ally is on the same square). `occupied` says whether a
+        `color` frog already stands on `coord`, in which case it is not counted
+        as its own ally.
+        """
+        allies = self.counts[color] - (1 if occupied else 0)
+        if allies <= 0:
+            return 0
+        avg_distance = self.total_distance(color, coord) / allies
+        return 1.0 - (avg_distance / (2 * BOARD_N))
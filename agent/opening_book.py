@@ -0,0 +1,169 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Opening book: a mapping from Zobrist position hash (see zobrist.py) to the
+# move our engine chose for that position after a deep offline search.
+#
+# The book is generated offline with:
+#
+#   python -m agent.opening_book --plies 6 --width 2 --iterations 200
+#
+# and stored as a compact binary file (see `OpeningBook.save`).
+
+import argparse
+import struct
+import sys
+from pathlib import Path
+
+from referee.game import BOARD_N, Board, Coord, Direction, Action, \
+    MoveAction, GrowAction, IllegalActionException
+
+from .zobrist import position_key
+
+
+DEFAULT_BOOK_PATH = Path(__file__).with_name("opening_book.bin")
+
+_MAGIC = b"FBK1"
+_HEADER = struct.Struct("<4sI")
+_RECORD = struct.Struct("<QBB")  # key, number of directions, start square
+_GROW_MARKER = 0xFF
+
+_DIRECTIONS = list(Direction)
+_DIRECTION_INDEX = {direction: i for i, direction in enumerate(_DIRECTIONS)}
+
+
+class OpeningBook:
+    """
+    Position-hash keyed book of opening moves. Lookups verify the stored move
+    is legal in the given position, so a hash collision or a stale book can
+    never make the agent play an illegal move; it just falls back to search.
+    """
+
+    def __init__(self, moves: dict[int, Action] | None = None):
+        self._moves = moves or {}
+
+    def __len__(self) -> int:
+        return len(self._moves)
+
+    def __contains__(self, board: Board) -> bool:
+        return position_key(board) in self._moves
+
+    def add(self, board: Board, action: Action):
+        self._moves[position_key(board)] = action
+
+    def lookup(self, board: Board) -> Action | None:
+        """
+        Return the book move for this position, or None if the position is
+        not in the book (e.g. the opponent deviated from the expected lines).
+        """
+        action = self._moves.get(position_key(board))
+        if isinstance(action, MoveAction):
+            try:
+                board._validate_move_action(action)
+            except IllegalActionException:
+                return None
+        return action
+
+    @classmethod
+    def load(cls, path: Path | str = DEFAULT_BOOK_PATH) -> "OpeningBook":
+        """
+        Load a book from `path`; a missing file gives an empty book.
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        data = path.read_bytes()
+        magic, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not an opening book file")
+
+        moves = {}
+        offset = _HEADER.size
+        for _ in range(count):
+            key, n_dirs, square = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if n_dirs == _GROW_MARKER:
+                moves[key] = GrowAction()
+                continue
+            directions = tuple(_DIRECTIONS[i] for i in data[offset:offset + n_dirs])
+            offset += n_dirs
+            moves[key] = MoveAction(
+                Coord(square // BOARD_N, square % BOARD_N), directions)
+        return cls(moves)
+
+    def save(self, path: Path | str = DEFAULT_BOOK_PATH):
+        """
+        Write the book as a header followed by one variable-length record per
+        position: key, direction count (0xFF for GROW), start square and one
+        byte per direction.
+        """
+        chunks = [_HEADER.pack(_MAGIC, len(self._moves))]
+        for key in sorted(self._moves):
+            action = self._moves[key]
+            match action:
+                case GrowAction():
+                    chunks.append(_RECORD.pack(key, _GROW_MARKER, 0))
+                case MoveAction(coord, _):
+                    directions = action.directions
+                    chunks.append(_RECORD.pack(
+                        key, len(directions), coord.r * BOARD_N + coord.c))
+                    chunks.append(bytes(_DIRECTION_INDEX[d] for d in directions))
+        Path(path).write_bytes(b"".join(chunks))
+
+
+def build_book(plies: int, width: int, iterations: int) -> OpeningBook:
+    """
+    Search every position reachable from the initial board within `plies`
+    plies. The move chosen by the search is stored as the book move, and each
+    position is expanded into that move plus the most-visited alternatives
+    (`width` in total), which cover plausible deviations by the opponent.
+    """
+    from .MCTS import MCTS, GameState
+
+    book = OpeningBook()
+    frontier = [Board()]
+    for ply in range(plies):
+        next_frontier = []
+        searched, iterations_done, search_time = 0, 0, 0.0
+        for board in frontier:
+            if board in book or board.game_over:
+                continue
+            mcts = MCTS(GameState(None, board))
+            best_action, stats = mcts.search_with_stats(iterations=iterations)
+            searched += 1
+            iterations_done += stats.iterations
+            search_time += stats.total_time
+            if best_action is None:
+                continue
+            book.add(board, best_action)
+            children = sorted(mcts.root.children,
+                              key=lambda n: (n.state.last_move == best_action, n.visits),
+                              reverse=True)
+            for child in children[:width]:
+                next_frontier.append(child.state.board)
+        rate = iterations_done / search_time if search_time else 0.0
+        print(f"ply {ply + 1}: {len(frontier)} positions, {searched} searched "
+              f"({rate:.1f} it/s), book size {len(book)}", file=sys.stderr)
+        frontier = next_frontier
+    return book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the opening book.")
+    parser.add_argument("--plies", type=int, default=6,
+                        help="depth of the book in plies (default: 6)")
+    parser.add_argument("--width", type=int, default=2,
+                        help="moves followed per position (default: 2)")
+    parser.add_argument("--iterations", type=int, default=200,
+                        help="MCTS iterations per position (default: 200)")
+    parser.add_argument("--out", type=Path, default=DEFAULT_BOOK_PATH,
+                        help="output file (default: %(default)s)")
+    args = parser.parse_args()
+
+    book = build_book(args.plies, args.width, args.iterations)
+    book.save(args.out)
+    print(f"wrote {len(book)} positions to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
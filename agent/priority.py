@@ -0,0 +1,120 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Move-ordering priorities shared by MCTS expansion and the minimax playouts.
+# The geometric facts about a move are worked out once while it is generated
+# and stored alongside it, so ordering anywhere is a sort on `priority`.
+#
+# Priority levels:
+#   1000  Reaches the goal row (from off the goal row)
+#   500   Breakthrough: forward move starting within 2 rows of the goal
+#   300   Multi-row forward jump (row change >= 2)
+#   200   Forward jump by an isolated frog that improves its cohesion
+#   150   Forward jump
+#   100   Non-forward multi-jump
+#   55    Forward slide
+#   50    GROW
+#   30    Non-forward move by an isolated frog that improves its cohesion
+#   20    Non-forward single jump
+#   1     Other non-forward slides
+#   0.5   Shuffling a frog that is already on the goal row
+
+from dataclasses import dataclass
+
+from referee.game import Action, GrowAction, Coord
+
+ISOLATION_THRESHOLD = 0.3
+BREAKTHROUGH_DISTANCE = 2
+GROW_PRIORITY = 50
+
+
+@dataclass(frozen=True, slots=True)
+class ScoredAction:
+    """
+    A generated action together with the features used to order it. For GROW
+    actions the move-specific features are left at their defaults.
+    """
+    action: Action
+    priority: float
+    dest: Coord | None = None
+    row_change: int = 0
+    jumps: int = 0
+    is_forward: bool = False
+    reaches_goal: bool = False
+    from_goal: bool = False
+    is_isolated: bool = False
+    improves_cohesion: bool = False
+
+
+def action_priority(
+    jumps: int,
+    row_change: int,
+    is_forward: bool,
+    reaches_goal: bool,
+    from_goal: bool,
+    near_goal: bool,
+    is_isolated: bool,
+    improves_cohesion: bool,
+) -> float:
+    """
+    The single priority scorer for MOVE actions (see the table above).
+    """
+    if from_goal:
+        return 0.5
+    if reaches_goal:
+        return 1000
+    if is_forward and near_goal:
+        return 500
+    if jumps:
+        if is_forward:
+            if row_change >= 2:
+                return 300
+            return 200 if is_isolated and improves_cohesion else 150
+        if jumps >= 2:
+            return 100
+        return 30 if is_isolated and improves_cohesion else 20
+    if is_forward:
+        return 55
+    return 30 if is_isolated and improves_cohesion else 1
+
+
+def score_move(
+    action: Action,
+    dest: Coord,
+    jumps: int,
+    goal_row: int,
+    forward_sign: int,
+    start_cohesion: float,
+    dest_cohesion: float,
+) -> ScoredAction:
+    """
+    Describe a MOVE action from its start/destination squares. `forward_sign`
+    is +1 if the mover advances by increasing row, -1 otherwise.
+    """
+    start = action.coord
+    row_delta = (dest.r - start.r) * forward_sign
+    is_forward = row_delta > 0
+    from_goal = start.r == goal_row
+    reaches_goal = dest.r == goal_row and not from_goal
+    near_goal = abs(goal_row - start.r) <= BREAKTHROUGH_DISTANCE
+    is_isolated = start_cohesion < ISOLATION_THRESHOLD
+    improves_cohesion = dest_cohesion > start_cohesion
+    return ScoredAction(
+        action,
+        action_priority(
+            jumps, abs(row_delta), is_forward, reaches_goal, from_goal,
+            near_goal, is_isolated, improves_cohesion,
+        ),
+        dest=dest,
+        row_change=abs(row_delta),
+        jumps=jumps,
+        is_forward=is_forward,
+        reaches_goal=reaches_goal,
+        from_goal=from_goal,
+        is_isolated=is_isolated,
+        improves_cohesion=improves_cohesion,
+    )
+
+
+def score_grow() -> ScoredAction:
+    return ScoredAction(GrowAction(), GROW_PRIORITY)
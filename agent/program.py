@@ -1,10 +1,39 @@
 # COMP30024 Artificial Intelligence, Semester 1 2025
 # Project Part B: Game Playing Agent
 
+import os
+import threading
+
 from referee.game import PlayerColor, Coord, Direction, \
     Action, MoveAction, GrowAction, Board
+from referee.agent.snapshot import BoardSnapshotReader
 
 from .MCTS import MCTS, GameState
+from .opening_book import OpeningBook
+from .endgame import EndgameSolver, should_solve
+
+# Pondering: between our move and the opponent's, the search tree keeps
+# growing in a background thread. The tree is capped at a share of the
+# referee's space limit, based on a rough per-node memory cost, and each
+# session at a share of our remaining time (the thread's CPU time counts
+# against our limit). Pondering stops when the opponent's move arrives, or
+# in shutdown() if the game ends on the opponent's move (no update comes).
+PONDER = True
+PONDER_MEMORY_FRACTION = 0.5
+NODE_BYTES_ESTIMATE = 16 * 1024
+DEFAULT_PONDER_NODES = 5000
+PONDER_TIME_FRACTION = 0.05
+PONDER_MAX_SECONDS = 5.0
+
+# The endgame solver gets at most this share of our remaining time per move
+# (or ENDGAME_MAX_SECONDS without a time limit), so failed solves can't eat
+# the clock move after move
+ENDGAME_TIME_FRACTION = 0.05
+ENDGAME_MAX_SECONDS = 2.0
+
+# If set, one JSON line of search statistics is appended to this file per
+# search and per pondering session (see stats.py)
+STATS_LOG_PATH = os.environ.get("AGENT_STATS_LOG")
 
 class Agent:
     """
@@ -19,7 +48,26 @@ class Agent:
         """
         self._color = color
         self._board = Board()
-        
+        self._book = OpeningBook.load()
+
+        # The referee's board, if it publishes one (referee -B), to check
+        # our own board against after every update
+        self._snapshot = None
+        if referee.get("board_snapshot"):
+            self._snapshot = BoardSnapshotReader(referee["board_snapshot"])
+
+        # Search tree kept across turns, and the thread growing it
+        self._tree: MCTS | None = None
+        self._ponder_thread: threading.Thread | None = None
+        self._ponder_stop = threading.Event()
+        self._ponder_start_visits = 0
+        space_limit = referee.get("space_limit")
+        if space_limit:
+            self._ponder_nodes = int(space_limit * 1024 * 1024
+                * PONDER_MEMORY_FRACTION / NODE_BYTES_ESTIMATE)
+        else:
+            self._ponder_nodes = DEFAULT_PONDER_NODES
+
         match color:
             case PlayerColor.RED:
                 print("Testing: I am playing as RED")
@@ -32,11 +80,32 @@ class Agent:
         to take an action. It must always return an action object. 
         """
 
-        current_state = GameState(None, self._board)
-        
+        # Play from the opening book while the game stays on known lines; any
+        # position outside the book (e.g. the opponent deviated) is searched
+        book_action = self._book.lookup(self._board)
+        if book_action is not None:
+            print(f"Testing: {self._color} is playing a book move")
+            return book_action
+
+        # Late in the game the remaining tree is small enough to solve
+        # exactly; if the solver runs out of budget we fall back to MCTS
+        if should_solve(self._board):
+            solver = EndgameSolver(
+                time_limit=self._endgame_time(referee.get("time_remaining")))
+            solved_action = solver.solve(self._board)
+            if solved_action is not None:
+                print(f"Testing: {self._color} solved the endgame "
+                      f"(value {solver.value}, {solver.nodes} nodes)")
+                return solved_action
 
-        mcts = MCTS(current_state)
-        best_action = mcts.search(iterations=30)
+        # Reuse the tree grown while pondering if it is rooted at this
+        # position; otherwise start afresh
+        mcts = self._tree
+        if mcts is None or mcts.root.state.board.turn_count != self._board.turn_count:
+            mcts = MCTS(GameState(None, self._board.clone()))
+        self._tree = mcts
+        best_action, stats = mcts.search_with_stats(iterations=30)
+        self._log_stats("search", stats)
 
         if best_action is None:
             match self._color:
@@ -60,9 +129,22 @@ class Agent:
         This method is called by the referee after a player has taken their
         turn. You should use it to update the agent's internal game state. 
         """
+        # Stop pondering before touching any shared state
+        self._stop_pondering()
+
         # Update internal game state
         self._board.apply_action(action)
+        if self._snapshot is not None and not self._snapshot.matches(self._board):
+            print(f"Testing: {self._color} is out of sync with the referee")
+            self._resync()
+
+        # Keep only the subtree under the move actually played
+        if self._tree is not None and not self._tree.advance(action):
+            self._tree = None
 
+        # After our own move, search on the opponent's time
+        if PONDER and color == self._color and not self._board.game_over:
+            self._start_pondering(referee.get("time_remaining"))
 
         match action:
             case MoveAction(coord, dirs):
@@ -74,3 +156,64 @@ class Agent:
                 print(f"Testing: {color} played GROW action")
             case _:
                 raise ValueError(f"Unknown action type: {action}")
+
+    def _resync(self):
+        # Take the referee's cells and colour to move (our move history, and
+        # so the turn count, is kept) and drop the now meaningless tree
+        reference = self._snapshot.board()
+        for coord, cell in reference._state.items():
+            self._board.set_cell_state(coord, cell)
+        self._board.set_turn_color(reference.turn_color)
+        self._tree = None
+
+    def shutdown(self):
+        """
+        Stop any background work. Called by the referee's agent process when
+        the game is over (before it exits, or before it is reused for another
+        game), since the game can end on the opponent's move without a
+        further update().
+        """
+        self._stop_pondering()
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def _endgame_time(self, time_remaining: float | None) -> float:
+        if time_remaining is None:
+            return ENDGAME_MAX_SECONDS
+        return min(ENDGAME_MAX_SECONDS, time_remaining * ENDGAME_TIME_FRACTION)
+
+    def _start_pondering(self, time_remaining: float | None = None):
+        if self._tree is None:
+            self._tree = MCTS(GameState(None, self._board.clone()))
+        max_seconds = PONDER_MAX_SECONDS
+        if time_remaining is not None:
+            max_seconds = min(max_seconds, time_remaining * PONDER_TIME_FRACTION)
+        self._ponder_start_visits = self._tree.root.visits
+        self._ponder_stop.clear()
+        self._ponder_thread = threading.Thread(
+            target=self._tree.ponder,
+            args=(self._ponder_stop, self._ponder_nodes, max_seconds),
+            daemon=True,
+        )
+        self._ponder_thread.start()
+
+    def _stop_pondering(self):
+        if self._ponder_thread is None:
+            return
+        self._ponder_stop.set()
+        self._ponder_thread.join()
+        self._ponder_thread = None
+        pondered = self._tree.root.visits - self._ponder_start_visits
+        print(f"Testing: {self._color} pondered {pondered} iterations")
+        self._log_stats("ponder", self._tree.stats)
+
+    def _log_stats(self, kind: str, stats):
+        if STATS_LOG_PATH is None:
+            return
+        with open(STATS_LOG_PATH, "a") as f:
+            f.write(stats.to_json(
+                color=str(self._color),
+                turn=self._board.turn_count,
+                kind=kind,
+            ) + "\n")
@@ -0,0 +1,89 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Per-search instrumentation. `MCTS` fills in a `SearchStats` while it runs;
+# the agent can write one JSON line per turn (see program.py) so hot-path
+# changes can be compared across versions.
+
+import json
+from dataclasses import dataclass, asdict
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+@dataclass(slots=True)
+class SearchStats:
+    """
+    Counters and timings for one call to `MCTS.search` (or one pondering
+    session). Times are wall-clock seconds.
+
+    MCTS keeps no transposition table; `transposition_hits` counts new nodes
+    whose position the tree's search had already reached, i.e. the lookups a
+    table would have answered. `tree_memory_kb_est` is the tree's size at the
+    end of the search (its peak) times the root node's size (see _node_bytes
+    in MCTS.py), whereas `process_peak_rss_kb` is the whole process's
+    high-water mark. `movegen_cache_hits` counts legal-move lists served
+    from a state's own cache.
+    """
+    iterations: int = 0
+    nodes_created: int = 0
+    tree_nodes: int = 0
+    max_depth: int = 0
+    total_depth: int = 0
+    select_time: float = 0.0
+    expand_time: float = 0.0
+    simulate_time: float = 0.0
+    backprop_time: float = 0.0
+    total_time: float = 0.0
+    states_cloned: int = 0
+    movegen_calls: int = 0
+    movegen_cache_hits: int = 0
+    transposition_hits: int = 0
+    tree_memory_kb_est: int = 0
+    process_peak_rss_kb: int | None = None
+
+    @property
+    def avg_depth(self) -> float:
+        return self.total_depth / self.iterations if self.iterations else 0.0
+
+    @property
+    def movegen_cache_hit_rate(self) -> float:
+        return self.movegen_cache_hits / self.movegen_calls \
+            if self.movegen_calls else 0.0
+
+    @property
+    def transposition_hit_rate(self) -> float:
+        return self.transposition_hits / self.nodes_created \
+            if self.nodes_created else 0.0
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.iterations / self.total_time if self.total_time else 0.0
+
+    def record_depth(self, depth: int):
+        self.total_depth += depth
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def record_peak_memory(self):
+        # ru_maxrss is the process high-water mark, in KiB on Linux
+        if resource is not None:
+            self.process_peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    def as_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "avg_depth": self.avg_depth,
+            "movegen_cache_hit_rate": self.movegen_cache_hit_rate,
+            "transposition_hit_rate": self.transposition_hit_rate,
+            "iterations_per_second": self.iterations_per_second,
+        }
+
+    def to_json(self, **extra) -> str:
+        """
+        One JSON line with the stats plus any `extra` fields (e.g. turn).
+        """
+        return json.dumps({**extra, **self.as_dict()})
@@ -0,0 +1,46 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# 64-bit Zobrist position hashing over cell states and the player to move.
+# Keys are generated from a fixed seed so they are stable across processes
+# (the opening book file depends on this).
+
+import random
+
+from referee.game import BOARD_N, Board, Coord
+from referee.game.player import PlayerColor
+
+
+_CELL_STATES = ("LilyPad", PlayerColor.RED, PlayerColor.BLUE)
+_zobrist_rng = random.Random(0x5EED_B00C)
+ZOBRIST_CELLS = {
+    (Coord(r, c), state): _zobrist_rng.getrandbits(64)
+    for r in range(BOARD_N) for c in range(BOARD_N)
+    for state in _CELL_STATES
+}
+ZOBRIST_BLUE_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+
+def position_key(board: Board) -> int:
+    """
+    64-bit Zobrist hash of a board's cells and player to move.
+    """
+    key = ZOBRIST_BLUE_TO_MOVE if board.turn_color == PlayerColor.BLUE else 0
+    for coord, cell in board._state.items():
+        if cell.state is not None:
+            key ^= ZOBRIST_CELLS[coord, cell.state]
+    return key
+
+
+def update_key(key: int, mutation) -> int:
+    """
+    Key of the position reached by applying (or undoing) the `BoardMutation`
+    `mutation` to the position with key `key`. Each cell mutation toggles the
+    previous and next cell states, and the player to move always flips.
+    """
+    for m in mutation.cell_mutations:
+        if m.prev.state is not None:
+            key ^= ZOBRIST_CELLS[m.cell, m.prev.state]
+        if m.next.state is not None:
+            key ^= ZOBRIST_CELLS[m.cell, m.next.state]
+    return key ^ ZOBRIST_BLUE_TO_MOVE
@@ -0,0 +1,6 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+from .run import main
+
+main()
@@ -0,0 +1,192 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Benchmark corpus: a fixed set of opening, midgame and endgame positions
+# taken from recorded self-play games. Each position is stored as the list of
+# moves leading to it from the initial board (so replaying it reproduces the
+# turn count as well as the cells), together with a reference move found by a
+# long search, which the benchmark uses as its fixed quality target.
+#
+# The corpus is (re)generated with:
+#
+#   python -m bench.corpus --games 3 --seed 0
+
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+from referee.game import Board, Coord, Direction, Action, MoveAction, \
+    GrowAction
+
+from agent.MCTS import MCTS, GameState
+from agent.endgame import unfinished_frogs
+
+DEFAULT_CORPUS_PATH = Path(__file__).with_name("corpus.json")
+
+OPENING_PLY = 6
+ENDGAME_UNFINISHED_FROGS = 6
+
+
+def encode_action(action: Action) -> str:
+    """
+    Compact text notation: "G" for GROW, otherwise "r,c:Dir/Dir/...".
+    """
+    match action:
+        case GrowAction():
+            return "G"
+        case MoveAction(coord, _):
+            dirs = "/".join(d.name for d in action.directions)
+            return f"{coord.r},{coord.c}:{dirs}"
+    raise ValueError(f"Unknown action type: {action}")
+
+
+def decode_action(text: str) -> Action:
+    if text == "G":
+        return GrowAction()
+    square, dirs = text.split(":")
+    r, c = map(int, square.split(","))
+    return MoveAction(Coord(r, c), tuple(Direction[d] for d in dirs.split("/")))
+
+
+@dataclass(frozen=True, slots=True)
+class Position:
+    """
+    A corpus position: the moves leading to it from the initial board, and
+    the reference best move used as the quality target.
+    """
+    name: str
+    phase: str
+    moves: tuple[str, ...]
+    reference: str | None = None
+
+    def board(self) -> Board:
+        board = Board()
+        for move in self.moves:
+            board.apply_action(decode_action(move))
+        return board
+
+    def reference_action(self) -> Action | None:
+        return decode_action(self.reference) if self.reference else None
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "phase": self.phase,
+            "moves": list(self.moves),
+            "reference": self.reference,
+        }
+
+
+def load_corpus(path: Path | str = DEFAULT_CORPUS_PATH) -> list[Position]:
+    with open(path) as f:
+        data = json.load(f)
+    return [
+        Position(p["name"], p["phase"], tuple(p["moves"]), p.get("reference"))
+        for p in data["positions"]
+    ]
+
+
+def save_corpus(positions: list[Position], path: Path | str = DEFAULT_CORPUS_PATH):
+    with open(path, "w") as f:
+        json.dump({"positions": [p.as_dict() for p in positions]}, f, indent=1)
+        f.write("\n")
+
+
+def play_game(rng: random.Random, random_plies: int, iterations: int) -> list[str]:
+    """
+    Self-play one game and return its moves. The first `random_plies` moves
+    are picked at random (for variety, since the search is deterministic),
+    the rest by a short MCTS search.
+    """
+    board = Board()
+    moves = []
+    while not board.game_over:
+        state = GameState(None, board.clone())
+        if len(moves) < random_plies:
+            action = rng.choice(state.get_legal_actions())
+        else:
+            action, _ = MCTS(state).search_with_stats(iterations)
+            if action is None:
+                action = GrowAction()
+        board.apply_action(action)
+        moves.append(encode_action(action))
+    return moves
+
+
+def pick_positions(game: int, moves: list[str]) -> list[Position]:
+    """
+    Choose an opening, a midgame and an endgame position from a game.
+    """
+    board = Board()
+    endgame_ply = None
+    for ply, move in enumerate(moves):
+        board.apply_action(decode_action(move))
+        if unfinished_frogs(board) <= ENDGAME_UNFINISHED_FROGS and not board.game_over:
+            endgame_ply = ply + 1
+            break
+    if endgame_ply is None:
+        endgame_ply = max(len(moves) - 6, OPENING_PLY + 2)
+    midgame_ply = (OPENING_PLY + endgame_ply) // 2
+
+    return [
+        Position(f"g{game}-{phase}", phase, tuple(moves[:ply]))
+        for phase, ply in (("opening", OPENING_PLY),
+                           ("midgame", midgame_ply),
+                           ("endgame", endgame_ply))
+    ]
+
+
+def with_reference(position: Position, iterations: int) -> Position:
+    """
+    Attach the move chosen by a long search as the position's reference.
+    """
+    action, _ = MCTS(GameState(None, position.board())) \
+        .search_with_stats(iterations)
+    reference = encode_action(action) if action is not None else None
+    return Position(position.name, position.phase, position.moves, reference)
+
+
+def generate_corpus(
+    games: int,
+    seed: int,
+    random_plies: int,
+    iterations: int,
+    reference_iterations: int,
+) -> list[Position]:
+    rng = random.Random(seed)
+    positions = []
+    for game in range(games):
+        moves = play_game(rng, random_plies, iterations)
+        print(f"game {game}: {len(moves)} plies")
+        for position in pick_positions(game, moves):
+            positions.append(with_reference(position, reference_iterations))
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate the benchmark position corpus.")
+    parser.add_argument("--games", type=int, default=3,
+                        help="self-play games to draw positions from (default: 3)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for the random opening moves (default: 0)")
+    parser.add_argument("--random-plies", type=int, default=4,
+                        help="random moves at the start of each game (default: 4)")
+    parser.add_argument("--iterations", type=int, default=10,
+                        help="MCTS iterations per self-play move (default: 10)")
+    parser.add_argument("--reference-iterations", type=int, default=300,
+                        help="MCTS iterations for reference moves (default: 300)")
+    parser.add_argument("--out", type=Path, default=DEFAULT_CORPUS_PATH,
+                        help="output file (default: %(default)s)")
+    args = parser.parse_args()
+
+    positions = generate_corpus(args.games, args.seed, args.random_plies,
+                                args.iterations, args.reference_iterations)
+    save_corpus(positions, args.out)
+    print(f"wrote {len(positions)} positions to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Micro-benchmarks for the referee.game primitives on our agents' hot paths.
+# Each primitive is timed per call over the corpus boards (plus the initial
+# board), after a warm-up, as `repeat` samples of `number` calls each. The
+# cost of the timing itself is calibrated away using an empty operation.
+#
+#   python -m bench.micro
+#   python -m bench.micro --json --out micro.json
+#   python -m bench.micro --primitives Board.clone Coord.__add__
+
+import argparse
+import json
+import statistics
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter_ns
+
+from referee.game import BOARD_N, Board, Coord, Direction, MoveAction, \
+    GrowAction
+
+from agent.endgame import legal_actions
+
+from .corpus import DEFAULT_CORPUS_PATH, load_corpus
+
+
+@dataclass(frozen=True, slots=True)
+class Primitive:
+    """
+    A timed operation. `make(board)` returns a list of zero-argument calls
+    to cycle through on that board, and `after` (if any) is run untimed
+    after every call to restore the board.
+    """
+    name: str
+    make: callable
+    after: callable = None
+
+
+def _moves(board: Board) -> list:
+    return [a for a in legal_actions(board) if isinstance(a, MoveAction)]
+
+
+def _apply_calls(board: Board) -> list:
+    return [lambda a=a: board.apply_action(a) for a in legal_actions(board)]
+
+
+def _validate_calls(board: Board) -> list:
+    return [lambda a=a: board._validate_move_action(a) for a in _moves(board)]
+
+
+def _coord_add_calls(board: Board) -> list:
+    # In-bounds (coord, direction) pairs only; off-board sums raise
+    calls = []
+    for r in range(BOARD_N):
+        for c in range(BOARD_N):
+            coord = Coord(r, c)
+            for d in Direction:
+                if 0 <= r + d.r < BOARD_N and 0 <= c + d.c < BOARD_N:
+                    calls.append(lambda coord=coord, d=d: coord + d)
+    return calls
+
+
+PRIMITIVES = [
+    Primitive("Board.apply_action", _apply_calls, Board.undo_action),
+    Primitive("Board.clone", lambda b: [b.clone]),
+    Primitive("Board._validate_move_action", _validate_calls),
+    Primitive("Board._resolve_grow_action",
+              lambda b: [lambda: b._resolve_grow_action(GrowAction())]),
+    Primitive("Board.game_over", lambda b: [lambda: b.game_over]),
+    Primitive("Coord.__add__", _coord_add_calls),
+]
+
+
+def _sample(calls: list, after, board: Board, number: int) -> int:
+    """
+    Total nanoseconds spent in `number` calls (cycling through `calls`).
+    """
+    total = 0
+    n = len(calls)
+    for i in range(number):
+        call = calls[i % n]
+        start = perf_counter_ns()
+        call()
+        total += perf_counter_ns() - start
+        if after is not None:
+            after(board)
+    return total
+
+
+def _overhead(number: int, repeat: int) -> float:
+    # Median per-call cost of timing an empty call
+    noop = [lambda: None]
+    return statistics.median(
+        _sample(noop, None, None, number) / number for _ in range(repeat))
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q * (len(values) - 1))))
+    return values[index]
+
+
+def bench_primitive(
+    primitive: Primitive,
+    boards: list[Board],
+    number: int,
+    repeat: int,
+    warmup: int,
+    overhead: float,
+) -> dict:
+    """
+    Per-call times in nanoseconds (one value per sample, pooled over all
+    boards), summarised as median, p95 and mean, with ops/sec at the median.
+    """
+    per_call = []
+    for board in boards:
+        calls = primitive.make(board)
+        if not calls:
+            continue
+        for _ in range(warmup):
+            _sample(calls, primitive.after, board, number)
+        for _ in range(repeat):
+            elapsed = _sample(calls, primitive.after, board, number)
+            per_call.append(max(0.0, elapsed / number - overhead))
+
+    if not per_call:
+        return {"samples": 0}
+    median = statistics.median(per_call)
+    return {
+        "samples": len(per_call),
+        "median_ns": median,
+        "p95_ns": _percentile(per_call, 0.95),
+        "mean_ns": statistics.fmean(per_call),
+        "ops_per_sec": 1e9 / median if median else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark referee.game primitives.")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS_PATH,
+                        help="corpus of boards (default: %(default)s)")
+    parser.add_argument("--primitives", nargs="+",
+                        choices=[p.name for p in PRIMITIVES],
+                        help="primitives to time (default: all)")
+    parser.add_argument("--number", type=int, default=200,
+                        help="calls per sample (default: 200)")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="samples per board (default: 20)")
+    parser.add_argument("--warmup", type=int, default=2,
+                        help="untimed warm-up samples per board (default: 2)")
+    parser.add_argument("--json", action="store_true",
+                        help="print results as JSON instead of a table")
+    parser.add_argument("--out", type=Path,
+                        help="also write JSON results to this file")
+    args = parser.parse_args()
+
+    boards = [Board()] + [p.board() for p in load_corpus(args.corpus)]
+    primitives = [p for p in PRIMITIVES
+                  if not args.primitives or p.name in args.primitives]
+    overhead = _overhead(args.number, args.repeat)
+
+    results = {
+        "meta": {
+            "boards": len(boards),
+            "number": args.number,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "timer_overhead_ns": overhead,
+        },
+        "primitives": {
+            p.name: bench_primitive(p, boards, args.number, args.repeat,
+                                    args.warmup, overhead)
+            for p in primitives
+        },
+    }
+
+    text = json.dumps(results, indent=1)
+    if args.out:
+        args.out.write_text(text + "\n")
+    if args.json:
+        print(text)
+        return
+
+    print(f"{'primitive':<30} {'median':>10} {'p95':>10} {'ops/sec':>12}")
+    for name, r in results["primitives"].items():
+        if not r["samples"]:
+            print(f"{name:<30} {'(no calls)':>10}", file=sys.stderr)
+            continue
+        print(f"{name:<30} {r['median_ns']:>8.0f}ns {r['p95_ns']:>8.0f}ns "
+              f"{r['ops_per_sec']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
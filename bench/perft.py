@@ -0,0 +1,245 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Perft: count the leaf nodes of the full game tree to a fixed depth using a
+# given move generator, checking every generated move against the referee's
+# validator along the way. Doubles as the throughput benchmark for move
+# generators.
+#
+#   python -m bench.perft --depth 2
+#   python -m bench.perft --depth 3 --generators gamestate --positions initial
+#
+# The "referee" generator is the reference: it enumerates moves by the
+# referee's own rules (Board._resolve_move_destination), which are looser than
+# our agents' generators in two ways. Intermediate jump landings need only be
+# free of frogs (not lily pads), and a jump may pass over the moving frog's
+# own starting square. The referee also accepts jump sequences that revisit a
+# square; those only add longer routes to the same destinations, so the
+# reference skips them to keep the move set finite. With --compare, each
+# generator's set of resulting positions is checked against the reference at
+# every node: "missing" counts positions the referee allows but the generator
+# cannot reach, "extra" counts positions it reaches that the referee does not.
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+
+from referee.game import BOARD_N, Board, Coord, Action, MoveAction, \
+    GrowAction, IllegalActionException
+from referee.game.player import PlayerColor
+
+from agent.MCTS import GameState, LEGAL_JUMP_DIRECTIONS_RED, \
+    LEGAL_JUMP_DIRECTIONS_BLUE
+from agent.endgame import legal_actions as endgame_actions
+from agent.zobrist import position_key
+
+from .corpus import DEFAULT_CORPUS_PATH, load_corpus
+
+_FROGS = (PlayerColor.RED, PlayerColor.BLUE)
+
+
+def referee_actions(board: Board) -> list[Action]:
+    """
+    Every move the referee accepts from this position (without revisiting a
+    jump landing), plus GROW.
+    """
+    color = board.turn_color
+    cells = board._state
+    directions = LEGAL_JUMP_DIRECTIONS_RED if color == PlayerColor.RED \
+        else LEGAL_JUMP_DIRECTIONS_BLUE
+
+    def state(r, c):
+        return cells[Coord(r, c)].state
+
+    actions: list[Action] = []
+    for coord, cell in cells.items():
+        if cell.state != color:
+            continue
+
+        for d in directions:
+            r, c = coord.r + d.r, coord.c + d.c
+            if 0 <= r < BOARD_N and 0 <= c < BOARD_N and state(r, c) == "LilyPad":
+                actions.append(MoveAction(coord, (d,)))
+
+        stack = [(coord.r, coord.c, (), {(coord.r, coord.c)})]
+        while stack:
+            r, c, path, visited = stack.pop()
+            for d in directions:
+                r_over, c_over = r + d.r, c + d.c
+                r_land, c_land = r + 2 * d.r, c + 2 * d.c
+                if not (0 <= r_land < BOARD_N and 0 <= c_land < BOARD_N):
+                    continue
+                if state(r_over, c_over) not in _FROGS or \
+                   state(r_land, c_land) in _FROGS or \
+                   (r_land, c_land) in visited:
+                    continue
+                new_path = path + (d,)
+                if state(r_land, c_land) == "LilyPad":
+                    actions.append(MoveAction(coord, new_path))
+                stack.append((r_land, c_land, new_path, visited | {(r_land, c_land)}))
+
+    actions.append(GrowAction())
+    return actions
+
+
+GENERATORS = {
+    "gamestate": lambda board: GameState(None, board.clone()).get_legal_actions(),
+    "endgame": endgame_actions,
+    "referee": referee_actions,
+}
+
+
+def _action_key(action: Action):
+    if isinstance(action, MoveAction):
+        return (action.coord, tuple(action.directions))
+    return "GROW"
+
+
+@dataclass(slots=True)
+class PerftReport:
+    nodes: int = 0
+    generations: int = 0
+    generated: int = 0
+    duplicates: int = 0
+    illegal: int = 0
+    missing: int = 0
+    extra: int = 0
+    time: float = 0.0
+    gen_time: float = 0.0
+    examples: list[str] = field(default_factory=list)
+
+    def note(self, kind: str, board: Board, action):
+        if len(self.examples) < 5:
+            self.examples.append(f"{kind} at turn {board.turn_count}: {action}")
+
+    def as_dict(self) -> dict:
+        d = asdict(self)
+        d["nodes_per_sec"] = self.nodes / self.time if self.time else 0.0
+        d["generations_per_sec"] = \
+            self.generations / self.gen_time if self.gen_time else 0.0
+        return d
+
+
+def result_keys(board: Board, actions) -> set[int]:
+    """
+    Position keys of the boards the actions lead to, so that generators can
+    be compared by where their moves go rather than by the paths taken.
+    """
+    keys = set()
+    for action in actions:
+        board.apply_action(action)
+        keys.add(position_key(board))
+        board.undo_action()
+    return keys
+
+
+def perft(board: Board, depth: int, generator, report: PerftReport,
+          compare: bool = False) -> int:
+    """
+    Number of leaf nodes `depth` plies below `board` (game-over positions
+    count as leaves). Every generated move is validated by the referee;
+    illegal moves are recorded and skipped.
+    """
+    if depth == 0 or board.game_over:
+        return 1
+
+    start = time.perf_counter()
+    actions = generator(board)
+    report.gen_time += time.perf_counter() - start
+    report.generations += 1
+    report.generated += len(actions)
+
+    seen = set()
+    legal = []
+    for action in actions:
+        key = _action_key(action)
+        if key in seen:
+            report.duplicates += 1
+            report.note("duplicate", board, action)
+            continue
+        seen.add(key)
+        if isinstance(action, MoveAction):
+            try:
+                board._validate_move_action(action)
+            except IllegalActionException:
+                report.illegal += 1
+                report.note("illegal", board, action)
+                continue
+        legal.append(action)
+
+    if compare:
+        ours = result_keys(board, legal)
+        reference = result_keys(board, referee_actions(board))
+        report.missing += len(reference - ours)
+        report.extra += len(ours - reference)
+
+    nodes = 0
+    for action in legal:
+        board.apply_action(action)
+        nodes += perft(board, depth - 1, generator, report, compare)
+        board.undo_action()
+    return nodes
+
+
+def run_perft(board: Board, depth: int, name: str, compare: bool) -> PerftReport:
+    report = PerftReport()
+    start = time.perf_counter()
+    report.nodes = perft(board, depth, GENERATORS[name], report, compare)
+    report.time = time.perf_counter() - start
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count game-tree leaves to a fixed depth with each move "
+        "generator and validate every move against the referee.")
+    parser.add_argument("--depth", type=int, default=2,
+                        help="depth in plies (default: 2)")
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATORS),
+                        default=list(GENERATORS),
+                        help="move generators to run (default: all)")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS_PATH,
+                        help="corpus of positions (default: %(default)s)")
+    parser.add_argument("--positions", nargs="+",
+                        help="position names to run ('initial' for the "
+                        "starting board; default: initial plus the corpus)")
+    parser.add_argument("--compare", action="store_true",
+                        help="compare resulting positions with the referee "
+                        "generator at every node")
+    parser.add_argument("--json", action="store_true",
+                        help="print results as JSON instead of a table")
+    args = parser.parse_args()
+
+    positions = [("initial", Board())] + \
+        [(p.name, p.board()) for p in load_corpus(args.corpus)]
+    if args.positions:
+        positions = [(n, b) for n, b in positions if n in args.positions]
+
+    results = {}
+    for name, board in positions:
+        results[name] = {
+            gen: run_perft(board, args.depth, gen, args.compare).as_dict()
+            for gen in args.generators
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+        return
+
+    print(f"{'position':<14} {'generator':<10} {'nodes':>9} {'nodes/s':>9} "
+          f"{'gen/s':>8} {'dup':>5} {'illegal':>7} {'missing':>7} {'extra':>5}")
+    for name, by_gen in results.items():
+        for gen, r in by_gen.items():
+            print(f"{name:<14} {gen:<10} {r['nodes']:>9} "
+                  f"{r['nodes_per_sec']:>9.0f} {r['generations_per_sec']:>8.0f} "
+                  f"{r['duplicates']:>5} {r['illegal']:>7} "
+                  f"{r['missing'] if args.compare else '-':>7} "
+                  f"{r['extra'] if args.compare else '-':>5}")
+            for example in r["examples"]:
+                print(f"{'':<14}   {example}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Benchmark runner. For every corpus position (see corpus.py) it measures the
+# raw primitives (move generations and board clones per second) and, for each
+# engine variant, search throughput and time-to-fixed-quality: how long the
+# search takes before its chosen move settles on the position's reference move.
+#
+#   python -m bench --out results.json
+#   python -m bench --baseline bench/baseline.json   # exit 1 on regression
+#   python -m bench --save-baseline                  # refresh the baseline
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from pathlib import Path
+
+from agent.MCTS import MCTS, GameState, _clone_board_mcts_version, _same_action
+
+from .corpus import DEFAULT_CORPUS_PATH, Position, load_corpus
+
+
+DEFAULT_BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# Engine variants: keyword arguments for MCTS
+VARIANTS = {
+    "minimax": {},
+    "batched": {"batch_size": 8},
+    "random": {"use_minimax": False, "seed": 0},
+}
+
+MIN_PRIMITIVE_TIME = 0.2  # seconds spent timing each primitive
+
+# Metric name -> whether larger values are better
+METRICS = {
+    "movegen_per_sec": True,
+    "clone_per_sec": True,
+    "iterations_per_sec": True,
+    "time_to_quality": False,
+}
+
+
+def _rate(fn, min_time: float = MIN_PRIMITIVE_TIME) -> float:
+    """
+    Calls of `fn` per second, timed over at least `min_time` seconds.
+    """
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+
+
+def measure_primitives(position: Position) -> dict:
+    board = position.board()
+    state = GameState(None, board)
+
+    def movegen():
+        state._scored_actions = None
+        state.get_scored_actions()
+
+    return {
+        "movegen_per_sec": _rate(movegen),
+        "clone_per_sec": _rate(lambda: _clone_board_mcts_version(board)),
+    }
+
+
+def measure_variant(position: Position, options: dict, budget: int, step: int) -> dict:
+    """
+    Search `position` for `budget` playouts in chunks of `step`, recording the
+    best move after each chunk. Time-to-quality is the search time up to the
+    first checkpoint from which the best move equals the reference move at
+    every later checkpoint; it is None if that never happens within budget.
+    """
+    mcts = MCTS(GameState(None, position.board()), **options)
+    batch_size = options.get("batch_size", 1)
+    reference = position.reference_action()
+
+    iterations = 0
+    elapsed = 0.0
+    checkpoints = []
+    while iterations < budget:
+        _, stats = mcts.search_with_stats(max(1, step // batch_size))
+        iterations += stats.iterations
+        elapsed += stats.total_time
+        checkpoints.append((iterations, elapsed, mcts.best_action()))
+
+    settled = None
+    for iterations_so_far, elapsed_so_far, action in reversed(checkpoints):
+        if reference is None or action is None or not _same_action(action, reference):
+            break
+        settled = (iterations_so_far, elapsed_so_far)
+
+    return {
+        "iterations_per_sec": iterations / elapsed if elapsed else 0.0,
+        "iterations_to_quality": settled[0] if settled else None,
+        "time_to_quality": settled[1] if settled else None,
+    }
+
+
+def run_benchmarks(
+    positions: list[Position],
+    variants: list[str],
+    budget: int,
+    step: int,
+) -> dict:
+    results = {}
+    for position in positions:
+        entry = {"phase": position.phase, **measure_primitives(position)}
+        entry["variants"] = {
+            name: measure_variant(position, VARIANTS[name], budget, step)
+            for name in variants
+        }
+        results[position.name] = entry
+        print(f"{position.name:<16} " + "  ".join(
+            f"{name}={v['iterations_per_sec']:.1f} it/s"
+            for name, v in entry["variants"].items()
+        ), file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "budget": budget,
+            "step": step,
+        },
+        "positions": results,
+        "summary": summarise(results),
+    }
+
+
+def _geomean(values: list[float]) -> float | None:
+    values = [v for v in values if v]
+    if not values:
+        return None
+    return math.exp(sum(math.log(v) for v in values) / len(values))
+
+
+def summarise(results: dict) -> dict:
+    """
+    Geometric means of each metric over all positions, per variant for the
+    search metrics.
+    """
+    entries = list(results.values())
+    summary = {
+        metric: _geomean([e[metric] for e in entries])
+        for metric in ("movegen_per_sec", "clone_per_sec")
+    }
+    variants = {name for e in entries for name in e["variants"]}
+    for name in sorted(variants):
+        runs = [e["variants"][name] for e in entries if name in e["variants"]]
+        summary[f"{name}.iterations_per_sec"] = _geomean(
+            [r["iterations_per_sec"] for r in runs])
+        summary[f"{name}.time_to_quality"] = _geomean(
+            [r["time_to_quality"] for r in runs])
+        summary[f"{name}.quality_reached"] = sum(
+            r["time_to_quality"] is not None for r in runs)
+    return summary
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compare summary metrics against a baseline run. Prints one line per
+    metric and returns the names of metrics that regressed by more than
+    `tolerance` (a fraction, e.g. 0.1 for 10%).
+    """
+    regressions = []
+    for key, value in current["summary"].items():
+        metric = key.rsplit(".", 1)[-1]
+        if metric not in METRICS:
+            continue
+        base = baseline["summary"].get(key)
+        if value is None or base is None:
+            print(f"{key:<34} {base!s:>12} -> {value!s:>12}")
+            continue
+        ratio = value / base if METRICS[metric] else base / value
+        flag = ""
+        if ratio < 1 - tolerance:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:<34} {base:>12.3f} -> {value:>12.3f}  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the MCTS benchmark suite.")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS_PATH,
+                        help="corpus file (default: %(default)s)")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS),
+                        default=list(VARIANTS),
+                        help="engine variants to run (default: all)")
+    parser.add_argument("--phases", nargs="+",
+                        choices=["opening", "midgame", "endgame"],
+                        help="only run positions from these phases")
+    parser.add_argument("--budget", type=int, default=80,
+                        help="playouts per position and variant (default: 80)")
+    parser.add_argument("--step", type=int, default=8,
+                        help="playouts between quality checkpoints (default: 8)")
+    parser.add_argument("--out", type=Path,
+                        help="write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path,
+                        help="compare against a stored results file")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="allowed fractional slowdown before a metric "
+                        "counts as a regression (default: 0.1)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"also write results to {DEFAULT_BASELINE_PATH}")
+    args = parser.parse_args()
+
+    positions = load_corpus(args.corpus)
+    if args.phases:
+        positions = [p for p in positions if p.phase in args.phases]
+
+    results = run_benchmarks(positions, args.variants, args.budget, args.step)
+    text = json.dumps(results, indent=1)
+    if args.out:
+        args.out.write_text(text + "\n")
+    if args.save_baseline:
+        DEFAULT_BASELINE_PATH.write_text(text + "\n")
+    if not args.out and not args.save_baseline:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()),
+                              args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed: "
+                  f"{', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 # Project Part B: Game Playing Agent
 
 from contextlib import contextmanager
+from pathlib import Path
 from typing import Type
 
 from ..game.player import Player
@@ -10,7 +11,9 @@ from ..game import Action, PlayerColor, PlayerException
 from ..options import PlayerLoc, TIME_LIMIT_NOVALUE
 from .client import RemoteProcessClassClient, AsyncProcessStatus, \
     WrappedProcessException
-from .resources import ResourceLimitException
+from .pool import AgentWorkerPool
+from .resources import ResourceLimitException, SPACE_MODE_DEFAULT, \
+    TIME_CLOCK_DEFAULT
 
 RECV_TIMEOUT = TIME_LIMIT_NOVALUE # Max seconds for agent to reply (wall clock)
 
@@ -35,6 +38,11 @@ class AgentProxyPlayer(Player):
         log: LogStream = NullLogger(),
         intercept_exc_type: Type[Exception] = PlayerException,
         subproc_output: bool = True,
+        time_clock: str = TIME_CLOCK_DEFAULT,
+        space_mode: str = SPACE_MODE_DEFAULT,
+        profile_dir: str | None = None,
+        pool: AgentWorkerPool | None = None,
+        board_snapshot: str | None = None,
     ):
         '''
         Create an agent proxy player.
@@ -57,6 +65,20 @@ class AgentProxyPlayer(Player):
             caught from the agent process. 
         subproc_output: Whether to print the agent's stderr stream to the
             terminal. This is useful for debugging.
+        time_clock: Which clock the time limit applies to (see
+            resources.TIME_CLOCKS); all of them are measured and reported.
+        space_mode: How the agent's memory usage is measured (see
+            resources.SPACE_MODES).
+        profile_dir: If given, the agent's action() calls are profiled and
+            the profile (plus a top-N text summary) is written to this
+            directory when the agent exits. Profiles for the same agent and
+            colour accumulate across games.
+        pool: If given, the agent runs in a process from this pool (reused
+            from an earlier game if possible), which is returned to the pool
+            when the game ends instead of exiting.
+        board_snapshot: Name of the shared memory board snapshot (see
+            snapshot.py), passed to the agent's constructor as the
+            'board_snapshot' keyword argument. If None, it is not passed.
         '''
         super().__init__(color)
 
@@ -64,6 +86,10 @@ class AgentProxyPlayer(Player):
         self._pkg, self._cls = agent_loc
         
         self._name = name
+        profile_path = None
+        if profile_dir is not None:
+            profile_path = str(
+                Path(profile_dir) / f"{self._pkg}.{self._cls}.{color}.prof")
         self._agent: RemoteProcessClassClient = RemoteProcessClassClient(
             self._pkg, self._cls, 
             time_limit = time_limit, 
@@ -72,13 +98,25 @@ class AgentProxyPlayer(Player):
             recv_timeout = RECV_TIMEOUT, 
             subproc_output = subproc_output,
             log = log,
+            time_clock = time_clock,
+            space_mode = space_mode,
+            profile_path = profile_path,
             # Class constructor arguments (passed to agent)
-            color = color
+            color = color,
+            **({"board_snapshot": board_snapshot} if board_snapshot else {})
         )
+        self._pool = pool
         self._log = log
         self._ret_symbol = f"⤷" if log.setting("unicode") else "->"
         self._InterceptExc = intercept_exc_type
 
+    @property
+    def status(self) -> AsyncProcessStatus | None:
+        """
+        Resource usage reported by the agent process after its last call.
+        """
+        return self._agent.status
+
     @contextmanager
     def _intercept_exc(self):
         try:
@@ -125,10 +163,17 @@ class AgentProxyPlayer(Player):
         # __aexit__ methods.
         self._log.debug(f"creating agent subprocess...")
         with self._intercept_exc():
-            await self._agent.__aenter__()
+            if self._pool is not None:
+                self._agent = await self._pool.acquire(self._agent)
+            else:
+                await self._agent.__aenter__()
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
+        if self._pool is not None:
+            await self._pool.release(self._agent)
+            self._log.debug(f"agent process returned to pool")
+            return
         await self._agent.__aexit__(exc_type, exc_value, traceback)
         self._log.debug(f"agent process terminated")
 
@@ -161,11 +206,19 @@ class AgentProxyPlayer(Player):
             return "resources usage status: unknown\n"
 
         time_str = f"  time:  +{status.time_delta:6.3f}s  (just elapsed)   "\
-                   f"  {status.time_used:7.3f}s  (game total)\n"
+                   f"  {status.time_used:7.3f}s  (game total, "\
+                   f"{status.time_clock} clock)\n"\
+                   f"         wall {status.wall_delta:6.3f}s / "\
+                   f"{status.wall_used:7.3f}s, "\
+                   f"cpu {status.cpu_delta:6.3f}s / {status.cpu_used:7.3f}s, "\
+                   f"children {status.children_delta:6.3f}s / "\
+                   f"{status.children_used:7.3f}s\n"
         space_str = ""
         if status.space_known:
             space_str = f"  space: {status.space_curr:7.3f}MB (current usage)  "\
-                        f"  {status.space_peak:7.3f}MB (peak usage)\n"
+                        f"  {status.space_peak:7.3f}MB (peak usage)\n"\
+                        f"         {status.space_delta:+7.3f}MB (just elapsed)  "\
+                        f"  {status.space_call_peak:7.3f}MB (peak, just elapsed)\n"
         else:
             space_str = "  space: unknown (check platform)\n"
         return f"resources usage status:\n{time_str}{space_str}"
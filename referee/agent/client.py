@@ -5,13 +5,16 @@ import sys
 import traceback
 from asyncio import subprocess, wait_for
 from asyncio.subprocess import create_subprocess_exec, Process
-from asyncio.exceptions import TimeoutError as AIOTimeoutError
+from asyncio.exceptions import TimeoutError as AIOTimeoutError, \
+    IncompleteReadError
 from typing import Any
 
 from ..log import NullLogger, LogStream
-from .resources import ResourceLimitException
-from .io import AsyncProcessStatus, m_pickle, m_unpickle,\
-    _SUBPROC_MODULE, _ACK, _REPLY_OK, _REPLY_EXC, _CHUNK_LIMIT_KB
+from .resources import ResourceLimitException, SPACE_MODE_DEFAULT, \
+    SPACE_MODES_REUSABLE, TIME_CLOCK_DEFAULT
+from .io import AsyncProcessStatus, m_pickle, m_unpickle, m_frame, \
+    m_frame_size, m_encode_arg, _SUBPROC_MODULE, _ACK, _REPLY_OK, _REPLY_EXC, \
+    _RESET, _QUIESCE, _CHUNK_LIMIT_KB, _FRAME_HEADER_SIZE
 
 class WrappedProcessException(Exception):
     pass
@@ -30,16 +33,22 @@ class RemoteProcessClassClient:
         subproc_output: bool,
         *cons_args, 
         log: LogStream=NullLogger(),
+        time_clock: str = TIME_CLOCK_DEFAULT,
+        space_mode: str = SPACE_MODE_DEFAULT,
+        profile_path: str | None = None,
         **cons_kwargs
     ):
         self._pkg = pkg
         self._cls = cls
         self._time_limit = time_limit
+        self._time_clock = time_clock
         self._space_limit = space_limit
         self._res_limit_tolerance = res_limit_tolerance
         self._recv_timeout = recv_timeout
         self._subproc_output = subproc_output
         self._log = log
+        self._space_mode = space_mode
+        self._profile_path = profile_path
         self._cons_args = cons_args
         self._cons_kwargs = cons_kwargs
         self._proc: Process | None = None
@@ -55,6 +64,71 @@ class RemoteProcessClassClient:
     def status(self) -> AsyncProcessStatus | None:
         return self._status
 
+    @property
+    def process_key(self) -> tuple:
+        """
+        Processes with the same key can host each other's instances (see
+        reset_for and pool.py).
+        """
+        return (self._pkg, self._cls, self._subproc_output,
+                self._space_mode, self._profile_path)
+
+    @property
+    def reusable(self) -> bool:
+        """
+        Whether the subprocess is still alive and can be reset for reuse
+        (which its space accounting mode must allow).
+        """
+        return self._proc is not None and not self._killed \
+            and self._proc.returncode is None \
+            and self._space_mode in SPACE_MODES_REUSABLE
+
+    async def reset_for(self, spec: 'RemoteProcessClassClient'):
+        """
+        Reuse this (running) subprocess in place of starting `spec`, which
+        must have the same process_key: take on its resource limits, logger
+        and constructor arguments, then replace the subprocess's instance
+        with a new one and restart its resource accounting.
+        """
+        assert self._proc is not None
+        assert self._proc.stdin is not None
+        assert spec.process_key == self.process_key
+
+        self._time_limit = spec._time_limit
+        self._time_clock = spec._time_clock
+        self._space_limit = spec._space_limit
+        self._res_limit_tolerance = spec._res_limit_tolerance
+        self._recv_timeout = spec._recv_timeout
+        self._log = spec._log
+        self._cons_args = spec._cons_args
+        self._cons_kwargs = spec._cons_kwargs
+        self._status = None
+
+        self._log.debug(
+            f"resetting subprocess {self._proc.pid} for a new instance of "
+            f"'{self._pkg}:{self._cls}'"
+        )
+        self._proc.stdin.write(m_frame(m_pickle((_RESET, (
+            self._time_limit, self._time_clock, self._space_limit,
+            self._res_limit_tolerance,
+            self._cons_args,
+            self._cons_kwargs
+        ), {}))))
+        assert await self._recv_reply() == _ACK
+
+    async def quiesce(self):
+        """
+        Have the (running) subprocess's instance stop any background work
+        (its optional shutdown() method) and wait for its threads, as at the
+        end of a game.
+        """
+        assert self._proc is not None
+        assert self._proc.stdin is not None
+
+        self._log.debug(f"quiescing subprocess {self._proc.pid}")
+        self._proc.stdin.write(m_frame(m_pickle((_QUIESCE, (), {}))))
+        assert await self._recv_reply() == _ACK
+
     async def _recv_reply(self):
         assert self._proc is not None
         assert self._proc.stdout is not None
@@ -62,8 +136,8 @@ class RemoteProcessClassClient:
         self._log.debug(
             f"waiting for reply from subprocess {self._proc.pid} (stdout)")
         try:
-            line = await wait_for(
-                self._proc.stdout.readline(),
+            payload = await wait_for(
+                self._read_frame(),
                 timeout=self._recv_timeout
             )
         except AIOTimeoutError as e:
@@ -76,16 +150,26 @@ class RemoteProcessClassClient:
                 f"({self._recv_timeout}s) exceeded"
             ) from e
 
-        if not line:
+        if payload is None:
             raise EOFError("expected result, got EOF")
 
-        return await self._process_reply(m_unpickle(line))
+        return await self._process_reply(m_unpickle(payload))
+
+    async def _read_frame(self) -> bytes | None:
+        assert self._proc is not None
+        assert self._proc.stdout is not None
+        # One length-prefixed message (see io.py), or None on EOF
+        try:
+            header = await self._proc.stdout.readexactly(_FRAME_HEADER_SIZE)
+            return await self._proc.stdout.readexactly(m_frame_size(header))
+        except IncompleteReadError:
+            return None
 
     async def _process_reply(self, reply: tuple[Any, ...]):
         assert self._proc is not None
 
         status, *args = reply
-        self._status = status
+        self._status = AsyncProcessStatus(*status)
         match args:
             case (_REPLY_EXC, ResourceLimitException() as e, _):
                 raise e
@@ -124,10 +208,12 @@ class RemoteProcessClassClient:
         # Start subprocess
         self._proc = await create_subprocess_exec(
             sys.executable, "-m", _SUBPROC_MODULE,
-            m_pickle((
+            m_encode_arg((
                 self._pkg, self._cls,
-                self._time_limit, self._space_limit,
+                self._time_limit, self._time_clock, self._space_limit,
                 self._res_limit_tolerance,
+                self._space_mode,
+                self._profile_path,
                 self._cons_args, 
                 self._cons_kwargs
             )),
@@ -193,7 +279,7 @@ class RemoteProcessClassClient:
                 f"send method call request to subprocess "
                 f"{self._proc.pid} (stdin)"
             )
-            self._proc.stdin.write(m_pickle((name, args, kwargs)))
+            self._proc.stdin.write(m_frame(m_pickle((name, args, kwargs))))
             return await self._recv_reply()
 
         return call
@@ -4,6 +4,7 @@
 import binascii
 from contextlib import contextmanager
 import pickle
+import struct
 from dataclasses import dataclass
 from binascii import b2a_base64, a2b_base64
 from typing import Any
@@ -13,8 +14,16 @@ _SUBPROC_MODULE = "referee.agent.subprocess"
 _ACK = "ACK"
 _REPLY_OK = b"OK"
 _REPLY_EXC = b"EXC"
+_RESET = "__reset__"  # reserved method name: start a new game (see pool.py)
+_QUIESCE = "__quiesce__"  # reserved method name: stop background work
 _CHUNK_LIMIT_KB = 1024
 
+# Messages between the referee and an agent subprocess are framed as a 4-byte
+# big-endian payload length followed by the raw pickle (no text encoding).
+_PICKLE_PROTOCOL = 5
+_FRAME_HEADER = struct.Struct(">I")
+_FRAME_HEADER_SIZE = _FRAME_HEADER.size
+
 
 class InterchangeException(Exception):
     pass
@@ -22,11 +31,20 @@ class InterchangeException(Exception):
 
 @dataclass(frozen=True, slots=True, init=True)
 class AsyncProcessStatus:
-    time_delta: float
+    time_delta: float  # on the enforced clock (time_clock)
     time_used: float
     space_known: bool
     space_curr: float
     space_peak: float
+    space_delta: float = 0.0  # change in usage over the last call
+    space_call_peak: float = -1  # peak usage during the last call
+    time_clock: str = "cpu"
+    wall_delta: float = 0.0
+    wall_used: float = 0.0
+    cpu_delta: float = 0.0
+    cpu_used: float = 0.0
+    children_delta: float = 0.0  # CPU time of terminated child processes
+    children_used: float = 0.0
 
 
 @contextmanager
@@ -36,14 +54,33 @@ def catch_exceptions(op: str, data: Any):
     except pickle.PicklingError as e:
         raise InterchangeException(
             f"cannot {op} object: {data}") from e
+    except pickle.UnpicklingError as e:
+        raise InterchangeException(
+            f"cannot {op} message of {len(data)} bytes") from e
     except binascii.Error as e:
         raise InterchangeException(
             f"expecting b64 during {op} but got: \n{data}") from e
 
 def m_pickle(o: Any) -> bytes:
     with catch_exceptions("pickle", o):
-        return b2a_base64(pickle.dumps(o))
+        return pickle.dumps(o, protocol=_PICKLE_PROTOCOL)
 
 def m_unpickle(b: bytes) -> Any:
     with catch_exceptions("unpickle", b):
-        return pickle.loads(a2b_base64(b))
+        return pickle.loads(b)
+
+def m_frame(payload: bytes) -> bytes:
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+def m_frame_size(header: bytes) -> int:
+    return _FRAME_HEADER.unpack(header)[0]
+
+# Command line arguments must be text, so the (one-off) subprocess arguments
+# are still base64-encoded
+def m_encode_arg(o: Any) -> str:
+    with catch_exceptions("pickle", o):
+        return b2a_base64(m_pickle(o), newline=False).decode("ascii")
+
+def m_decode_arg(s: str) -> Any:
+    with catch_exceptions("unpickle", s):
+        return m_unpickle(a2b_base64(s))
@@ -0,0 +1,97 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# A pool of agent subprocesses that are kept alive between games. Starting an
+# agent normally means a fresh interpreter, which then imports numpy and the
+# agent package before constructing the agent; a pooled process pays that
+# once. When a game ends, the process's agent is asked to stop any background
+# work (its optional shutdown() method, e.g. to stop pondering), and the
+# process is kept only if its threads then finish. Before the next game it is
+# sent a reset request, which discards the old instance, constructs a new one
+# with the new game's arguments (e.g. its colour) and restarts the CPU time
+# and memory accounting.
+#
+# Module-level state in the agent package (caches, loaded tables) survives
+# the reset, just as it would between calls within one game.
+#
+# Processes measuring memory in "rusage" mode are never reused: the peak it
+# reports can't be reset, so the next game would be charged the last one's
+# (see SPACE_MODES_REUSABLE in resources.py).
+
+from .client import RemoteProcessClassClient
+from ..log import LogStream, NullLogger
+
+
+class AgentWorkerPool:
+    """
+    Idle agent subprocesses, keyed by what they were started with (agent
+    package and class, output and profiling settings). Use as an async
+    context manager so that the idle processes are shut down at the end.
+    """
+
+    def __init__(self, log: LogStream = NullLogger()):
+        self._idle: dict[tuple, list[RemoteProcessClassClient]] = {}
+        self._log = log
+        self.started = 0
+        self.reused = 0
+
+    async def acquire(
+        self, spec: RemoteProcessClassClient
+    ) -> RemoteProcessClassClient:
+        """
+        A running client equivalent to entering `spec` (an unstarted
+        client): an idle process reset for `spec` if there is one, otherwise
+        `spec` itself, started. Exceptions from constructing the agent are
+        raised as they would be by entering `spec`.
+        """
+        idle = self._idle.get(spec.process_key, [])
+        while idle:
+            worker = idle.pop()
+            try:
+                await worker.reset_for(spec)
+                self.reused += 1
+                return worker
+            except Exception as e:
+                # Don't let one bad process fail the game: start a new one
+                # (which re-raises any error from the agent itself)
+                self._log.debug(
+                    f"could not reuse subprocess {worker.pid}: {e!r}")
+                await self._shutdown(worker)
+
+        await spec.__aenter__()
+        self.started += 1
+        return spec
+
+    async def release(self, worker: RemoteProcessClassClient):
+        """
+        Return a client obtained from acquire() once its game is over. It is
+        kept for reuse if its process is still healthy, once its agent has
+        stopped any background work.
+        """
+        if worker.reusable:
+            try:
+                await worker.quiesce()
+                self._idle.setdefault(worker.process_key, []).append(worker)
+                return
+            except Exception as e:
+                self._log.debug(
+                    f"could not quiesce subprocess {worker.pid}: {e!r}")
+        await self._shutdown(worker)
+
+    async def close(self):
+        for workers in self._idle.values():
+            for worker in workers:
+                await self._shutdown(worker)
+        self._idle.clear()
+
+    async def _shutdown(self, worker: RemoteProcessClassClient):
+        try:
+            await worker.__aexit__(None, None, None)
+        except Exception as e:
+            self._log.debug(f"error shutting down subprocess: {e!r}")
+
+    async def __aenter__(self) -> 'AgentWorkerPool':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
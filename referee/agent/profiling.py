@@ -0,0 +1,149 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import cProfile
+import io
+import pstats
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # not available on windows
+    fcntl = None
+
+PROFILE_TOP_N = 30  # Functions listed in the text summary
+CALIBRATION_STEPS = 50_000
+CALIBRATION_ROUNDS = 3
+
+
+class _CalibrationNode:
+    __slots__ = ("value", "children")
+
+    def __init__(self, value: int):
+        self.value = value
+        self.children = []
+
+    def add(self, child: '_CalibrationNode') -> '_CalibrationNode':
+        self.children.append(child)
+        return child
+
+    def score(self) -> int:
+        return max(self.value, len(self.children))
+
+
+def _calibration_workload(steps: int) -> int:
+    # Calls of the kinds a search makes: constructors, methods and builtins
+    root = _CalibrationNode(0)
+    total = 0
+    for i in range(steps):
+        node = _CalibrationNode(i)
+        if i % 8 == 0:
+            root.add(node)
+        total += node.score() + abs(min(i, 3))
+    return total
+
+
+def measure_call_overhead(steps: int = CALIBRATION_STEPS) -> float:
+    """
+    Estimate the CPU time cProfile adds to each function call it records,
+    in seconds, from the best of a few timings of a call-heavy workload with
+    and without it.
+    """
+    plain = profiled = float("inf")
+    calls = 0
+    for _ in range(CALIBRATION_ROUNDS):
+        start = time.process_time()
+        _calibration_workload(steps)
+        plain = min(plain, time.process_time() - start)
+
+        profiler = cProfile.Profile()
+        start = time.process_time()
+        profiler.enable()
+        try:
+            _calibration_workload(steps)
+        finally:
+            profiler.disable()
+        profiled = min(profiled, time.process_time() - start)
+        calls = sum(entry.callcount for entry in profiler.getstats())
+    return max(0.0, (profiled - plain) / calls) if calls else 0.0
+
+
+class ActionProfiler:
+    """
+    Profiles agent method calls inside the agent subprocess. A single
+    cProfile profiler is enabled only while a profiled call runs, so the
+    statistics cover exactly the agent's own work across the whole game.
+    On `dump`, they are merged into any existing profile at `path` (so
+    repeated games, e.g. a tournament, accumulate), and a top-N summary of
+    the hottest functions is written next to it with a `.txt` suffix. The
+    merge holds a lock on a `.lock` file next to the profile, so processes
+    dumping to the same path at once (e.g. parallel tournament games) don't
+    lose each other's statistics.
+
+    The profiler slows down every function call it records. So that a
+    profiled agent is charged about the same time as an unprofiled one, its
+    estimated cost (calls recorded times `measure_call_overhead()`) is
+    excluded from the timer the profiled call runs under. The estimate comes
+    from a synthetic workload, so expect it to be close rather than exact.
+    """
+
+    def __init__(self, path: Path | str, top_n: int = PROFILE_TOP_N):
+        self._path = Path(path)
+        self._top_n = top_n
+        self._profiler = cProfile.Profile()
+        self._calls = 0
+        self._call_overhead = measure_call_overhead()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def summary_path(self) -> Path:
+        return self._path.with_suffix(".txt")
+
+    @property
+    def lock_path(self) -> Path:
+        return self._path.with_suffix(".lock")
+
+    def _recorded_calls(self) -> int:
+        return sum(entry.callcount for entry in self._profiler.getstats())
+
+    @contextmanager
+    def profile(self, timer=None):
+        """
+        Profile the body of the context. If given, `timer` (a CountdownTimer
+        timing the body) is not charged for the profiler's overhead.
+        """
+        self._calls += 1
+        calls_before = self._recorded_calls()
+        self._profiler.enable()
+        try:
+            yield
+        finally:
+            self._profiler.disable()
+            if timer is not None:
+                calls = self._recorded_calls() - calls_before
+                timer.exclude(calls * self._call_overhead)
+
+    def dump(self):
+        """
+        Write (or merge into) the profile file and regenerate the summary.
+        """
+        if self._calls == 0:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            stats = pstats.Stats(self._profiler)
+            if self._path.exists():
+                stats.add(str(self._path))
+            stats.dump_stats(str(self._path))
+
+            summary = io.StringIO()
+            stats.stream = summary
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(self._top_n)
+            self.summary_path.write_text(summary.getvalue())
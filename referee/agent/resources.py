@@ -2,24 +2,49 @@
 # Project Part B: Game Playing Agent
 
 import gc
+import os
+import sys
 import time
+import tracemalloc
 from pathlib import Path
 
+try:
+    import resource
+except ImportError:  # not available on windows
+    resource = None
+
 
 class ResourceLimitException(Exception):
     """For when agents exceed specified time / space limits."""
 
 
+# Clocks a CountdownTimer can enforce the time limit on:
+#   cpu           CPU time of the agent process (all of its threads)
+#   wall          wall-clock time, i.e. the latency the game experiences
+#   cpu+children  CPU time of the agent process plus that of its child
+#                 processes; children only count once they have terminated
+#                 and been waited for (e.g. a joined multiprocessing pool)
+TIME_CLOCKS = ("cpu", "wall", "cpu+children")
+TIME_CLOCK_DEFAULT = "cpu"
+
+
+def _children_cpu_time():
+    children = os.times()
+    return children.children_user + children.children_system
+
+
 class CountdownTimer:
     """
     Reusable context manager for timing specific sections of code
 
-    * measures CPU time, not wall-clock time
+    * measures wall-clock time, the process's CPU time and its children's
+      CPU time, per use of the context (delta) and in total
     * unless time_limit is 0, throws an exception upon exiting the context
-      after the allocated time has passed
+      after the allocated time has passed on the enforced clock (see
+      TIME_CLOCKS)
     """
 
-    def __init__(self, time_limit, tolerance=1.0):
+    def __init__(self, time_limit, tolerance=1.0, clock=TIME_CLOCK_DEFAULT):
         """
         Create a new countdown timer with time limit `limit`, in seconds
         (0 for unlimited time). If `tolerance` is specified, the timer will
@@ -28,33 +53,75 @@ class CountdownTimer:
         """
         self._limit = time_limit
         self._tolerance = tolerance
-        self._clock = 0
-        self._delta = 0
+        self._clock = clock
+        self._totals = {"wall": 0.0, "cpu": 0.0, "children": 0.0}
+        self._deltas = {"wall": 0.0, "cpu": 0.0, "children": 0.0}
+        self._excluded = 0.0
 
-    def total(self):
+    @property
+    def clock(self):
         return self._clock
 
+    def total(self):
+        return self._enforced(self._totals)
+
     def delta(self):
-        return self._delta
+        return self._enforced(self._deltas)
+
+    def totals(self):
+        """
+        Total time used so far on each clock: wall, cpu and children
+        """
+        return dict(self._totals)
+
+    def deltas(self):
+        """
+        Time used during the last use of the context on each clock
+        """
+        return dict(self._deltas)
+
+    def exclude(self, seconds: float):
+        """
+        Don't charge `seconds` of the current use of the context (e.g. the
+        cost of measuring it) to the process's own wall and CPU time.
+        """
+        self._excluded += seconds
+
+    def _enforced(self, times):
+        match self._clock:
+            case "wall":
+                return times["wall"]
+            case "cpu+children":
+                return times["cpu"] + times["children"]
+        return times["cpu"]
 
     def __enter__(self):
         # clean up memory off the clock
         gc.collect()
         # then start timing
-        self.start = time.process_time()
+        self._excluded = 0.0
+        self.start = (
+            time.perf_counter(), time.process_time(), _children_cpu_time())
         return self  # unused
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         # accumulate elapsed time since __enter__
-        elapsed = time.process_time() - self.start
-        self._clock += elapsed
-        self._delta = elapsed
+        wall, cpu, children = self.start
+        self._deltas = {
+            "wall": time.perf_counter() - wall,
+            "cpu": time.process_time() - cpu,
+            "children": _children_cpu_time() - children,
+        }
+        for name in ("wall", "cpu"):
+            self._deltas[name] = max(0.0, self._deltas[name] - self._excluded)
+        for name, elapsed in self._deltas.items():
+            self._totals[name] += elapsed
 
         # if we are limited, let's hope we aren't out of time!
         if self._limit is not None and self._limit > 0:
-            if self._clock > self._limit * self._tolerance:
+            if self.total() > self._limit * self._tolerance:
                 raise ResourceLimitException(
-                    f"exceeded available time"
+                    f"exceeded available time ({self._clock} clock)"
                 )
 
 
@@ -63,7 +130,11 @@ class MemoryWatcher:
     Context manager for clearing memory before and measuring memory usage
     after using a specific section of code.
 
-    * works by parsing procfs; only available on linux.
+    * measures according to the mode chosen with set_space_line (see
+      SPACE_MODES); the procfs modes are only available on linux.
+    * keeps the peak usage over all uses of the context (plus any growth in
+      between, e.g. from agent threads), and the change in usage and peak
+      usage of the last use on its own.
     * unless the limit is set to 0, throws an exception upon exiting the
       context if the memory limit has been breached
     """
@@ -73,6 +144,10 @@ class MemoryWatcher:
         self._tolerance = tolerance
         self._curr_usage = -1
         self._peak_usage = -1
+        self._call_delta = 0
+        self._call_peak = -1
+        self._call_start = None
+        self._peak_reading = None
 
     def curr(self):
         return self._curr_usage
@@ -80,10 +155,36 @@ class MemoryWatcher:
     def peak(self):
         return self._peak_usage
 
+    def call_delta(self):
+        return self._call_delta
+
+    def call_peak(self):
+        return self._call_peak
+
     def enabled(self):
         return _SPACE_ENABLED
 
+    def rebase(self):
+        """
+        Start measuring afresh in a process that has already been used (e.g.
+        a pooled worker starting a new game), so that peaks reached before
+        now are not counted.
+        """
+        if _SPACE_ENABLED:
+            _, self._peak_reading = _get_space_usage()
+            if _reset_peak():
+                _, self._peak_reading = _get_space_usage()
+
     def __enter__(self):
+        if _SPACE_ENABLED:
+            curr_usage, peak_usage = _get_space_usage()
+            # growth since the last use still counts towards the peak
+            if self._peak_reading is not None \
+                    and peak_usage > self._peak_reading:
+                self._peak_usage = max(self._peak_usage,
+                                       peak_usage - _DEFAULT_MEM_USAGE)
+            self._call_start = curr_usage
+            self._peak_reading = curr_usage if _reset_peak() else peak_usage
         return self  # unused
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -92,12 +193,25 @@ class MemoryWatcher:
         stats and ensuring that peak usage is not exceeding limits
         """
         if _SPACE_ENABLED:
-            self._curr_usage, self._peak_usage = _get_space_usage()
+            curr_usage, peak_usage = _get_space_usage()
+
+            # the peak within this use: if the peak could not be reset on
+            # entry and has not grown since, it was reached earlier, so only
+            # the usage on entry and exit is known to belong to this use
+            if self._call_start is None:
+                call_start, call_peak = _DEFAULT_MEM_USAGE, peak_usage
+            else:
+                call_start, call_peak = self._call_start, peak_usage
+                if peak_usage <= self._peak_reading and not _PEAK_RESETTABLE:
+                    call_peak = max(self._call_start, curr_usage)
+            self._peak_reading = peak_usage
 
             # adjust measurements to reflect usage of agents and referee, not
             # the Python interpreter itself
-            self._curr_usage -= _DEFAULT_MEM_USAGE
-            self._peak_usage -= _DEFAULT_MEM_USAGE
+            self._curr_usage = curr_usage - _DEFAULT_MEM_USAGE
+            self._call_delta = curr_usage - call_start
+            self._call_peak = call_peak - _DEFAULT_MEM_USAGE
+            self._peak_usage = max(self._peak_usage, self._call_peak)
 
             # if we are limited, let's hope we are not out of space!
             if self._limit is not None and self._limit > 0:
@@ -107,38 +221,105 @@ class MemoryWatcher:
                     )
 
 
+# Memory accounting modes:
+#   vm          virtual memory size and its peak (VmSize/VmPeak in procfs); an
+#               overestimate, as it counts reserved but untouched memory
+#   rss         resident memory and its peak (VmRSS/VmHWM in procfs); the peak
+#               is reset around every call, so per-call peaks are exact
+#   rusage      peak resident memory from getrusage(); portable to non-linux
+#               platforms, but as there is no current usage, it is reported
+#               as the peak so far
+#   tracemalloc Python heap allocations traced since the agent was loaded
+#               (excludes interpreter and native library memory); exact and
+#               resettable, but slows the agent down considerably
+SPACE_MODES = ("vm", "rss", "rusage", "tracemalloc")
+SPACE_MODE_DEFAULT = "vm"
+
+# Modes whose accounting MemoryWatcher.rebase() can restart in a process that
+# has already been used (see pool.py). rusage only has the peak over the
+# process's lifetime, which would carry one game's peak into the next.
+SPACE_MODES_REUSABLE = ("vm", "rss", "tracemalloc")
+
+_PROCFS_FIELDS = {
+    "vm": ("VmSize:", "VmPeak:"),
+    "rss": ("VmRSS:", "VmHWM:"),
+}
+
+
 def _get_space_usage():
     """
-    Find the current and peak Virtual Memory usage of the current process,
-    in MB
+    Find the current and peak memory usage of the current process, in MB,
+    according to the accounting mode
     """
+    match _SPACE_MODE:
+        case "rusage":
+            peak_usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # kilobytes on linux, bytes on macOS
+            peak_usage /= 1024 * 1024 if sys.platform == "darwin" else 1024
+            return peak_usage, peak_usage
+        case "tracemalloc":
+            curr_usage, peak_usage = tracemalloc.get_traced_memory()
+            return curr_usage / (1024 * 1024), peak_usage / (1024 * 1024)
+
     # on linux, we can find the memory usage of our program we seek
-    # inside /proc/self/status (specifically, fields VmSize and VmPeak)
+    # inside /proc/self/status
+    curr_field, peak_field = _PROCFS_FIELDS[_SPACE_MODE]
     with Path("/proc/self/status").open() as proc_status:
         for line in proc_status:
-            if "VmSize:" in line:
+            if line.startswith(curr_field):
                 curr_usage = int(line.split()[1]) / 1024  # kB -> MB
-            elif "VmPeak:" in line:
+            elif line.startswith(peak_field):
                 peak_usage = int(line.split()[1]) / 1024  # kB -> MB
     return curr_usage, peak_usage # type: ignore
 
 
+def _reset_peak() -> bool:
+    """
+    Reset the peak usage to the current usage if the mode allows it, and
+    report whether it did
+    """
+    if not _PEAK_RESETTABLE:
+        return False
+    if _SPACE_MODE == "tracemalloc":
+        tracemalloc.reset_peak()
+    else:
+        # writing 5 to clear_refs resets VmHWM (linux 4.0+)
+        with Path("/proc/self/clear_refs").open("w") as clear_refs:
+            clear_refs.write("5")
+    return True
+
+
 _DEFAULT_MEM_USAGE = 0
 
 _SPACE_ENABLED = False
 
+_SPACE_MODE = SPACE_MODE_DEFAULT
 
-def set_space_line():
+_PEAK_RESETTABLE = False
+
+
+def set_space_line(mode: str = SPACE_MODE_DEFAULT):
     """
     by default, the python interpreter uses a significant amount of space
     measure this first to later subtract from all measurements
     """
-    global _SPACE_ENABLED, _DEFAULT_MEM_USAGE
+    global _SPACE_ENABLED, _DEFAULT_MEM_USAGE, _SPACE_MODE, _PEAK_RESETTABLE
 
+    _SPACE_MODE = mode
     try:
+        if mode == "tracemalloc":
+            tracemalloc.start()
         _DEFAULT_MEM_USAGE, _ = _get_space_usage()
         _SPACE_ENABLED = True
     except:
         # this also gives us a chance to detect if our space-measuring method
         # will work on this platform, and notify the user if not.
         _SPACE_ENABLED = False
+        return
+
+    _PEAK_RESETTABLE = mode in ("rss", "tracemalloc")
+    try:
+        _reset_peak()
+    except OSError:
+        # e.g. clear_refs not writable: peaks are only known between resets
+        _PEAK_RESETTABLE = False
@@ -0,0 +1,149 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Optional shared-memory channel through which the referee publishes the
+# authoritative board after every turn. Agents are told the name of the
+# shared memory block via the `board_snapshot` constructor keyword argument
+# and may attach a BoardSnapshotReader to verify (or resync) their own state
+# without replaying or pickling anything.
+#
+# Layout (SNAPSHOT_SIZE bytes):
+#   [0, 64)  one signed byte per cell, row-major (index r * BOARD_N + c):
+#            0 empty, 1 RED frog, -1 BLUE frog, 2 lily pad
+#   [64, 66) number of turns played (unsigned 16-bit, little-endian)
+#   66       colour to move (1 RED, -1 BLUE)
+#   67       1 once the game is over, else 0
+#
+# The referee only writes between turns, while no agent call is in progress,
+# so readers see a consistent snapshot without any locking.
+
+import struct
+from multiprocessing import shared_memory
+
+from ..game import BOARD_N, Board, Coord, PlayerColor
+from ..game.board import CellState
+
+SNAPSHOT_CELLS = BOARD_N * BOARD_N
+_HEADER = struct.Struct("<Hbb")
+SNAPSHOT_SIZE = SNAPSHOT_CELLS + _HEADER.size
+
+EMPTY, LILY_PAD = 0, 2
+_CODES = {
+    None: EMPTY,
+    "LilyPad": LILY_PAD,
+    PlayerColor.RED: int(PlayerColor.RED),
+    PlayerColor.BLUE: int(PlayerColor.BLUE),
+}
+_STATES = {code: state for state, code in _CODES.items()}
+_COORDS = [Coord(r, c) for r in range(BOARD_N) for c in range(BOARD_N)]
+
+
+def encode_board(board: Board) -> bytes:
+    """
+    The snapshot bytes for `board`.
+    """
+    cells = board._state
+    return bytes(
+        _CODES[cells[coord].state] & 0xFF for coord in _COORDS
+    ) + _HEADER.pack(
+        board.turn_count, int(board.turn_color), int(board.game_over))
+
+
+def decode_board(cells, turn_color: PlayerColor) -> Board:
+    """
+    A new Board from SNAPSHOT_CELLS cell codes (as bytes, or any sequence of
+    signed codes) and the colour to move. Its move history is empty.
+    """
+    if isinstance(cells, (bytes, bytearray)):
+        cells = memoryview(cells).cast("b")
+    return Board(
+        {coord: CellState(_STATES[cells[i]]) for i, coord in enumerate(_COORDS)},
+        turn_color,
+    )
+
+
+class BoardSnapshot:
+    """
+    Writer side, owned by the referee: creates the shared memory block and
+    removes it on close().
+    """
+
+    def __init__(self):
+        self._shm = shared_memory.SharedMemory(create=True, size=SNAPSHOT_SIZE)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def publish(self, board: Board):
+        self._shm.buf[:SNAPSHOT_SIZE] = encode_board(board)
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> 'BoardSnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class BoardSnapshotReader:
+    """
+    Reader side, for agents: a zero-copy view of the referee's latest board.
+    """
+
+    def __init__(self, name: str):
+        self._shm = _attach(name)
+        self._buf = self._shm.buf
+
+    @property
+    def cells(self) -> memoryview:
+        """
+        The cell codes as a live signed-byte view (no copy is made). Views
+        must be released (or dropped) before close().
+        """
+        return self._buf[:SNAPSHOT_CELLS].cast("b")
+
+    @property
+    def turn_count(self) -> int:
+        return _HEADER.unpack_from(self._buf, SNAPSHOT_CELLS)[0]
+
+    @property
+    def turn_color(self) -> PlayerColor:
+        return _STATES[_HEADER.unpack_from(self._buf, SNAPSHOT_CELLS)[1]]
+
+    @property
+    def game_over(self) -> bool:
+        return bool(_HEADER.unpack_from(self._buf, SNAPSHOT_CELLS)[2])
+
+    def matches(self, board: Board) -> bool:
+        """
+        Whether `board` agrees with the referee's board (cells, turn count
+        and colour to move).
+        """
+        return self._buf[:SNAPSHOT_SIZE] == encode_board(board)
+
+    def board(self) -> Board:
+        """
+        A new Board with the referee's cells and colour to move. Its move
+        history is empty, so use `turn_count` for the number of turns played.
+        """
+        return decode_board(self.cells, self.turn_color)
+
+    def close(self):
+        self._buf = None
+        self._shm.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # Readers must not have the block unlinked when they exit; before Python
+    # 3.13 attaching always registers it with the resource tracker
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
@@ -2,24 +2,35 @@
 # Project Part B: Game Playing Agent
 
 import sys
-from contextlib import contextmanager
+import atexit
+import threading
+import time
+from contextlib import contextmanager, nullcontext
 from importlib import import_module
 from importlib.util import find_spec
 from traceback import format_exc
 from typing import Any
 
 from .resources import CountdownTimer, MemoryWatcher, set_space_line
-from .io import AsyncProcessStatus, m_pickle, m_unpickle,\
-    _ACK, _REPLY_OK, _REPLY_EXC
+from .profiling import ActionProfiler
+from .io import m_pickle, m_unpickle, m_frame, m_frame_size, m_decode_arg,\
+    _ACK, _REPLY_OK, _REPLY_EXC, _RESET, _QUIESCE, _FRAME_HEADER_SIZE
 
 _STDOUT_OVERRIDE_MESSAGE = "stdout usage is not allowed in agent (use stderr)"
 _STDIN_OVERRIDE_MESSAGE = "stdin usage is not allowed in agent"
 
+# How long (s) to wait for an instance's threads to finish once it has been
+# asked to stop its background work
+_QUIESCE_TIMEOUT = 5.0
+
 
 # Wrapper subprocess entry point
 def main():
-    in_stream = sys.stdin
-    out_stream = sys.stdout
+    # Messages are length-prefixed binary frames (see io.py), so take the
+    # underlying binary streams (detached, so they stay open once the text
+    # wrappers are replaced below)
+    in_stream = sys.stdin.detach()
+    out_stream = sys.stdout.detach()
 
     # Redirect stdout to stderr (debugging purposes). This allows for seamless
     # use of print() in the subprocess without interruping data interchange
@@ -52,38 +63,43 @@ def main():
     sys.__stdin__ = _StdinOverride()
     sys.stdin = _StdinOverride()
 
-    # Utils
-    def _s_unpickle(s: str) -> Any:
-        return m_unpickle(bytes(s, "ascii"))
-
-    def _s_pickle(o: Any) -> str:
-        return m_pickle(o).decode("ascii")
-    
-    def _is_pickleable(o: Any) -> bool:
-        try:
-            m_pickle(o)
-            return True
-        except Exception:
-            return False
-
     # Command line arguments are the class/constructor arguments
     cls_module, cls_name, \
-        time_limit, space_limit, \
-        res_limit_tolerance, \
+        time_limit, time_clock, space_limit, \
+        res_limit_tolerance, space_mode, profile_path, \
         cons_args, cons_kwargs \
-        = _s_unpickle(sys.argv[1])
+        = m_decode_arg(sys.argv[1])
 
     # Create some context managers for resource tracking
-    timer = CountdownTimer(time_limit, res_limit_tolerance)
+    timer = CountdownTimer(time_limit, res_limit_tolerance, time_clock)
     space = MemoryWatcher(space_limit, res_limit_tolerance)
 
+    # Optionally profile action() calls, writing the profile when the process
+    # exits (on EOF from the referee, see _recv below)
+    profiler = None
+    if profile_path is not None:
+        profiler = ActionProfiler(profile_path)
+        atexit.register(profiler.dump)
+
     def _get_status():
-        return AsyncProcessStatus(
-            time_delta=timer.delta(),
-            time_used=timer.total(),
-            space_known=space.enabled(),
-            space_curr=space.curr(),
-            space_peak=space.peak(),
+        # Sent as a plain tuple of AsyncProcessStatus fields (in order), which
+        # pickles smaller and faster than the dataclass itself
+        deltas, totals = timer.deltas(), timer.totals()
+        return (
+            timer.delta(),
+            timer.total(),
+            space.enabled(),
+            space.curr(),
+            space.peak(),
+            space.call_delta(),
+            space.call_peak(),
+            timer.clock,
+            deltas["wall"],
+            totals["wall"],
+            deltas["cpu"],
+            totals["cpu"],
+            deltas["children"],
+            totals["children"],
         )
 
     def _referee():
@@ -94,29 +110,68 @@ def main():
             space_rem = space_limit if space_limit > 0 else None 
         return {
             "time_remaining": time_rem,
+            "time_clock": timer.clock,
+            "time_used": timer.totals(),
             "space_remaining": space_rem,
             "space_limit": space_limit if space_limit > 0 else None,
         }
 
+    def _shutdown_instance():
+        # Agents may define shutdown() to stop background work (e.g. a
+        # pondering thread) once the game is over, which they cannot
+        # otherwise tell if it ends on the opponent's move
+        shutdown = getattr(instance, "shutdown", None)
+        if callable(shutdown):
+            shutdown()
+
+    def _quiesce():
+        # Ask the instance to stop, then give its threads time to finish
+        _shutdown_instance()
+        deadline = time.monotonic() + _QUIESCE_TIMEOUT
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread():
+                thread.join(max(0.0, deadline - time.monotonic()))
+
     # Comms functions
     def _recv() -> Any:
-        line = in_stream.readline()
-        if not line: # EOF, process should exit (see __aexit__ above)
-            exit(0)
-        return _s_unpickle(line)
+        header = in_stream.read(_FRAME_HEADER_SIZE)
+        if len(header) < _FRAME_HEADER_SIZE:
+            # EOF, process should exit (see RemoteProcessClassClient._graceful_exit)
+            try:
+                _shutdown_instance()
+            finally:
+                exit(0)
+        return m_unpickle(in_stream.read(m_frame_size(header)))
 
     def _reply(*args: Any):
-        # Reply is a tuple of (status, arg0, arg1, ...)
-        out_stream.write(_s_pickle((_get_status(), *args)))
+        # Reply is a tuple of (status, arg0, arg1, ...), pickled exactly once
+        # unless it turns out not to be pickleable
+        status = _get_status()
+        try:
+            payload = m_pickle((status, *args))
+        except Exception:
+            match args:
+                case (_REPLY_OK, _):
+                    args = (_REPLY_OK, "<unpickleable>")
+                case (_REPLY_EXC, e, stacktrace_str):
+                    args = (_REPLY_EXC, Exception(str(e)), stacktrace_str)
+            payload = m_pickle((status, *args))
+        out_stream.write(m_frame(payload))
         out_stream.flush()
 
     @contextmanager
     def _relay_exceptions():
+        # Reply with any exception raised in the block. The yielded list is
+        # non-empty afterwards if so, in which case the caller must not reply
+        # again (every request gets exactly one reply, so that a reused
+        # process never has a stale reply waiting in the pipe).
+        relayed = []
         try:
-            yield
+            yield relayed
         except Exception as e:
             stacktrace_str = "\n".join(format_exc().splitlines()[5:])
             _reply(_REPLY_EXC, e, stacktrace_str)
+            relayed.append(e)
 
     # If numpy exists on system, ensure it's imported so that it is included
     # in baseline memory usage calculations
@@ -124,25 +179,60 @@ def main():
         import numpy
 
     # Construct class instance
-    with _relay_exceptions(), timer, space:
-        set_space_line()
+    instance = None
+    with _relay_exceptions() as relayed, timer, space:
+        set_space_line(space_mode)
         Cls = getattr(import_module(cls_module), cls_name)
         instance = Cls(*cons_args, **{**cons_kwargs, **_referee()})
-    _reply(_REPLY_OK, _ACK)
+    if not relayed:
+        _reply(_REPLY_OK, _ACK)
 
     # Main client subprocess loop
     while True:
         message = _recv()
         name, args, kwargs = message
-        
+
+        # The game is over (see pool.py): stop the instance's background
+        # work so that an idle process uses no CPU time
+        if name == _QUIESCE:
+            with _relay_exceptions() as relayed:
+                _quiesce()
+            if not relayed:
+                _reply(_REPLY_OK, _ACK)
+            continue
+
+        # Start a new game in this process (see pool.py): fresh resource
+        # accounting and a fresh instance. Threads left running by the old
+        # instance (even once asked to stop) would keep using CPU time, so
+        # such a process is refused.
+        if name == _RESET:
+            time_limit, time_clock, space_limit, res_limit_tolerance, \
+                cons_args, cons_kwargs = args
+            with _relay_exceptions() as relayed:
+                _quiesce()
+                instance = None
+                if threading.active_count() > 1:
+                    raise RuntimeError(
+                        "agent threads still running, cannot reuse process")
+                timer = CountdownTimer(
+                    time_limit, res_limit_tolerance, time_clock)
+                space = MemoryWatcher(space_limit, res_limit_tolerance)
+                space.rebase()
+                with timer, space:
+                    instance = Cls(*cons_args, **{**cons_kwargs, **_referee()})
+            if not relayed:
+                _reply(_REPLY_OK, _ACK)
+            continue
+
         # Call method
         result = None
-        with _relay_exceptions(), timer, space:
+        profiling = profiler.profile(timer) \
+            if profiler is not None and name == "action" else nullcontext()
+        with _relay_exceptions() as relayed, timer, space, profiling:
             result = getattr(instance, name)(*args, **{**kwargs, **_referee()})
-            if not _is_pickleable(result):
-                result = "<unpickleable>"
-        
-        _reply(_REPLY_OK, result)
+
+        if not relayed:
+            _reply(_REPLY_OK, result)
 
 # Only run if directly invoked
 if __name__ == "__main__" and sys.argv[0].endswith(__file__):
@@ -0,0 +1,124 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Summarise an archive of binary game records (see record.py), optionally
+# replaying every game to check that it ends as recorded, or replay one game
+# move by move with the referee's usual commentary and board output.
+#
+#   python -m referee.archive games.rec --verify
+#   python -m referee.archive games.rec --replay 3 --wait 0.5
+
+import argparse
+import asyncio
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+from .game import Player, PlayerColor, Action
+from .log import LogStream, LogColor
+from .record import RecordedGame, read_games
+from .run import replay_recorded_game, game_commentator, \
+    output_board_updates, game_delay
+
+
+class RecordedPlayer(Player):
+    """
+    Stands in for a player of a recorded game: it is only ever shown, as the
+    name it was recorded under, and never asked to play.
+    """
+
+    def __init__(self, color: PlayerColor, name: str):
+        super().__init__(color)
+        self._name = name
+
+    def __str__(self) -> str:
+        return f"{self._name or 'player'} ({self._color})"
+
+    async def action(self) -> Action:
+        raise RuntimeError("recorded players cannot play")
+
+    async def update(self, color: PlayerColor, action: Action):
+        pass
+
+
+def replay(game: RecordedGame, stream: LogStream, wait: float = 0.0,
+           use_color: bool = False, use_unicode: bool = False) -> Player | None:
+    """
+    Replay a recorded game through the referee's commentary and board output
+    handlers, optionally pausing `wait` seconds after each move. Return the
+    recorded winner (a RecordedPlayer) or None for a draw.
+    """
+    players = {
+        PlayerColor.RED: RecordedPlayer(PlayerColor.RED, game.red),
+        PlayerColor.BLUE: RecordedPlayer(PlayerColor.BLUE, game.blue),
+    }
+    handlers = [
+        game_commentator(stream),
+        output_board_updates(stream, use_color, use_unicode),
+        game_delay(wait) if wait > 0 else None,
+    ]
+    return asyncio.run(replay_recorded_game(game, players, handlers))
+
+
+def _nth_game(paths: list[Path], index: int) -> RecordedGame | None:
+    games = (game for path in paths for game in read_games(path))
+    return next(islice(games, index, None), None)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="referee.archive",
+        description="Summarise (and optionally verify) game record files.")
+    parser.add_argument("paths", nargs="+", type=Path, metavar="FILE",
+                        help="game record files")
+    parser.add_argument("--verify", action="store_true",
+                        help="replay every game and check that it ends as "
+                        "recorded")
+    parser.add_argument("--replay", type=int, metavar="N",
+                        help="show game N (counting from 0 across the files) "
+                        "move by move instead of summarising")
+    parser.add_argument("--wait", type=float, default=0.0, metavar="SECONDS",
+                        help="with --replay, pause after each move")
+    args = parser.parse_args()
+
+    if args.replay is not None:
+        game = _nth_game(args.paths, args.replay)
+        if game is None:
+            parser.error(f"no game {args.replay} in the given files")
+        LogStream.set_global_setting("ansi", sys.stdout.isatty())
+        stream = LogStream("replay", LogColor.WHITE)
+        replay(game, stream, args.wait, use_color=sys.stdout.isatty())
+        return
+
+    games = 0
+    moves = 0
+    results = {"RED": 0, "BLUE": 0, "draw": 0}
+    errors = 0
+    mismatches = 0
+    start = time.perf_counter()
+    for path in args.paths:
+        for game in read_games(path):
+            games += 1
+            moves += len(game.actions)
+            results[str(game.winner) if game.winner else "draw"] += 1
+            errors += game.error is not None
+            if args.verify and game.error is None:
+                board = game.final_board()
+                if not board.game_over or board.winner_color != game.winner:
+                    mismatches += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{games} games, {moves} moves "
+          f"(avg {moves / games if games else 0:.1f} per game)")
+    print(f"RED {results['RED']}, BLUE {results['BLUE']}, "
+          f"draws {results['draw']}, ended by error {errors}")
+    print(f"{'read and replayed' if args.verify else 'read'} in "
+          f"{elapsed:.2f}s ({games / elapsed if elapsed else 0:.0f} games/s)")
+    if mismatches:
+        print(f"{mismatches} game(s) did not replay to the recorded result")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
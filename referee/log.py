@@ -1,11 +1,18 @@
 # COMP30024 Artificial Intelligence, Semester 1 2025
 # Project Part B: Game Playing Agent
 
+import asyncio
+from collections import deque
 from enum import Enum
 from time import time
 from typing import Any, Callable
 from inspect import signature
 
+# Background log writing (see AsyncLogWriter): maximum number of queued
+# messages before the writer is woken early, and seconds between flushes
+LOG_BATCH_SIZE = 256
+LOG_FLUSH_INTERVAL = 0.1
+
 
 class LogColor(Enum):
     """
@@ -71,6 +78,7 @@ class LogStream:
         "output_time": False,
         "output_namespace": True,
         "output_level": True,
+        "writer": None,
     }
 
     def __init__(self, 
@@ -124,33 +132,57 @@ class LogStream:
         # Return local settings if they exist, otherwise return global settings
         return getattr(self, f"_{key}", LogStream._global_settings[key])
     
-    def log(self, message: str, level: LogLevel = LogLevel.INFO):
+    def log(self, message: str | Callable[[], str],
+            level: LogLevel = LogLevel.INFO):
+        """
+        Log a message with a dynamic level of verbosity. The message may be
+        given as a function returning it, in which case it is only built
+        when written (which may be later, see AsyncLogWriter).
         """
-        Log a message with a dynamic level of verbosity.
+        writer = self.setting("writer")
+        if writer is not None:
+            writer.put(self, message, level, time())
+        else:
+            self._out(self._format(message, level), level)
+
+    @classmethod
+    def flush(cls):
         """
+        Write any messages queued by the global writer (see AsyncLogWriter).
+        """
+        writer = cls._global_settings["writer"]
+        if writer is not None:
+            writer.flush()
+
+    def _format(self, message: str | Callable[[], str],
+                level: LogLevel, at: float | None = None) -> str:
+        if callable(message):
+            message = message()
         message_lines = message.splitlines()
-        for line in message_lines:
-            line_base_content = \
-                f"{self._s_namespace()}"\
-                f"{self._s_time()}"\
-                f"{self._s_level(level)}"
-            line_base = \
-                f"{self._s_color_start()}"\
-                f"{line_base_content}"\
-                f"{self._s_color_end()}"
-            self._out(line_base + line, level)
-
-    def _out(self, message: str, level: LogLevel):
+        line_base_content = \
+            f"{self._s_namespace()}"\
+            f"{self._s_time(at)}"\
+            f"{self._s_level(level)}"
+        line_base = \
+            f"{self._s_color_start()}"\
+            f"{line_base_content}"\
+            f"{self._s_color_end()}"
+        text = "\n".join(line_base + line for line in message_lines)
+
         # Optionally strip unicode symbols
         if not self.setting("unicode"):
-            message = message.encode("ascii", "ignore").decode()
+            text = text.encode("ascii", "ignore").decode()
+        return text
 
+    def _out(self, text: str, level: LogLevel):
+        if not text:
+            return
         for handler in self.setting("handlers"):
             # If handler takes a level argument, pass it
             if "level" in signature(handler).parameters:
-                handler(message, level)
+                handler(text, level)
             else:
-                handler(message)
+                handler(text)
 
     def debug(self, message=""):
         """
@@ -187,11 +219,11 @@ class LogStream:
         # Always print critical messages
         self.log(message, LogLevel.CRITICAL)
 
-    def _s_time(self) -> str:
+    def _s_time(self, at: float | None = None) -> str:
         if not self.setting("output_time"):
             return ""
 
-        update_time = time() - (LogStream._start_time or 0)
+        update_time = (at or time()) - (LogStream._start_time or 0)
         return f"T{update_time:06.2f} "
 
     def _s_namespace(self) -> str:
@@ -224,6 +256,84 @@ class LogStream:
 
         return f"{LogColor.RESET_ALL}"
 
+class AsyncLogWriter:
+    """
+    Writes log messages from a background asyncio task instead of as they
+    are logged. While it is active (as an async context manager, which also
+    makes it the global "writer" setting), LogStreams only queue their
+    messages; formatting (including messages given as functions, such as
+    board renders) and output happen in the background, in order, with
+    consecutive lines for the same handlers written in one call. The task
+    runs whenever the event loop is otherwise idle, e.g. while agents are
+    thinking, so the game loop only pays for queueing.
+
+    Messages are written at least every `interval` seconds, or sooner once
+    `batch_size` are queued. flush() writes everything queued right away;
+    it is also called when the writer is closed.
+    """
+
+    def __init__(self,
+        batch_size: int = LOG_BATCH_SIZE,
+        interval: float = LOG_FLUSH_INTERVAL,
+    ):
+        self._batch_size = batch_size
+        self._interval = interval
+        self._queue: deque[tuple[LogStream, Any, LogLevel, float]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def put(self, stream: LogStream, message: Any, level: LogLevel,
+            at: float):
+        self._queue.append((stream, message, level, at))
+        if self._task is None:
+            self.flush()
+        elif len(self._queue) >= self._batch_size:
+            self._wakeup.set()
+
+    def flush(self):
+        """
+        Write all queued messages now.
+        """
+        batch: list[str] = []
+        batch_key = None
+        while self._queue:
+            stream, message, level, at = self._queue.popleft()
+            key = (tuple(stream.setting("handlers")), level)
+            if key != batch_key and batch:
+                batch_stream._out("\n".join(batch), batch_key[1])
+                batch = []
+            batch_key, batch_stream = key, stream
+            text = stream._format(message, level, at)
+            if text:
+                batch.append(text)
+        if batch:
+            batch_stream._out("\n".join(batch), batch_key[1])
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            self.flush()
+
+    async def __aenter__(self) -> 'AsyncLogWriter':
+        self._task = asyncio.create_task(self._run())
+        LogStream.set_global_setting("writer", self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        LogStream.set_global_setting("writer", None)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.flush()
+
+
 class NullLogger(LogStream):
     """
     A simple null logger that does not log anything. Can be used to disable
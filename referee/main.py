@@ -13,16 +13,21 @@
 import os
 import asyncio
 from argparse import Namespace
+from contextlib import ExitStack
 from pathlib import Path
 from traceback import format_tb
 
 from referee.server.game import RemoteGame
 
 from .game import Player, PlayerColor
-from .log import LogStream, LogColor, LogLevel
+from .log import LogStream, LogColor, LogLevel, AsyncLogWriter
 from .run import game_user_wait, run_game, \
-    game_commentator, game_event_logger, game_delay, output_board_updates
+    game_commentator, game_event_logger, game_delay, output_board_updates, \
+    board_snapshot_publisher, game_recorder, queued_handler, \
+    QUEUE_COALESCE
 from .agent import AgentProxyPlayer
+from .agent.snapshot import BoardSnapshot
+from .record import GameRecordWriter
 from .options import get_options, PlayerLoc
 from .server import RemoteServer, InvalidAckError
 
@@ -85,7 +90,15 @@ def main(options: Namespace|None=None):
                 output_level=False,
             )
 
+    # The snapshot's shared memory and the record file are released however
+    # the game ends (see the finally clause, and KeyboardInterrupt below)
+    resources = ExitStack()
     try:
+        snapshot = resources.enter_context(BoardSnapshot()) \
+            if options.board_snapshot else None
+        if snapshot is not None:
+            rl.debug(f"publishing board snapshots to '{snapshot.name}'")
+
         agents: dict[Player, dict] = {}
         for p_num, player_color in enumerate(PlayerColor, 1):
             # Import player classes
@@ -99,13 +112,23 @@ def main(options: Namespace|None=None):
                 player_loc,
                 time_limit=options.time,
                 space_limit=options.space,
-                log=LogStream(f"player{p_num}", LogColor[str(player_color)])
+                log=LogStream(f"player{p_num}", LogColor[str(player_color)]),
+                time_clock=options.time_clock,
+                space_mode=options.space_mode,
+                profile_dir=options.profile,
+                board_snapshot=snapshot.name if snapshot else None,
             )
             agents[p] = {
                 "name": player_name,
                 "loc": player_loc,
             }
 
+        recorder = None
+        if options.record is not None:
+            rl.debug(f"appending the game record to '{options.record}'")
+            recorder = resources.enter_context(
+                GameRecordWriter(options.record))
+
         # Run server
         rl.info("running game server...")
 
@@ -117,6 +140,12 @@ def main(options: Namespace|None=None):
 
         if options.run_server:
             server = RemoteServer(log_stream=sl)
+            remote_game = RemoteGame(
+                server,
+                [agents[p]["name"] for p in agents.keys()],
+                []
+            )
+            server.set_catch_up(remote_game.catch_up_messages)
 
         async def _run_server():
             if options.run_server:
@@ -126,18 +155,19 @@ def main(options: Namespace|None=None):
         async def _run(options: Namespace) -> Player | None:
             event_handlers = [
                 game_event_logger(gl) if gl is not None else None,
-                game_commentator(rl),
-                output_board_updates(rl, 
-                                     options.use_colour, 
-                                     options.use_unicode)\
+                queued_handler(game_commentator(rl)),
+                queued_handler(output_board_updates(rl, 
+                                                    options.use_colour, 
+                                                    options.use_unicode),
+                               QUEUE_COALESCE)\
                     if options.verbosity >= 2 else None,
+                board_snapshot_publisher(snapshot) if snapshot else None,
+                game_recorder(recorder, {
+                    p.color: ":".join(agents[p]["loc"]) for p in agents
+                }) if recorder else None,
                 game_delay(options.wait) if options.wait > 0 else None,
                 game_user_wait(rl) if options.wait < 0 else None,
-                RemoteGame(
-                    server,
-                    [agents[p]["name"] for p in agents.keys()],
-                    []
-                ).event_handler() if options.run_server else None,
+                remote_game.event_handler() if options.run_server else None,
             ]
 
             if options.run_server:
@@ -154,12 +184,16 @@ def main(options: Namespace|None=None):
             return result
         
         async def _run_all():
-            return await asyncio.gather(
-                _run(options),
-                _run_server()
-            )
+            if options.log_buffer <= 0:
+                return await asyncio.gather(_run(options), _run_server())
+            async with AsyncLogWriter(batch_size=options.log_buffer):
+                return await asyncio.gather(_run(options), _run_server())
         
         [game_result, _] = asyncio.run(_run_all(), debug=True)
+        resources.close()
+
+        if options.profile is not None:
+            rl.info(f"agent profiles written to '{options.profile}'")
 
         # Print the final result under all circumstances
         if game_result is None:
@@ -179,6 +213,7 @@ def main(options: Namespace|None=None):
         rl.info("KeyboardInterrupt: bye!")
 
         rl.critical("result: <interrupt>")
+        resources.close()  # (the kill skips the finally clause)
         os.kill(os.getpid(), 9)
 
     except Exception as e:
@@ -193,3 +228,6 @@ def main(options: Namespace|None=None):
 
         rl.critical(f"result: <error>")
         exit(1)
+
+    finally:
+        resources.close()
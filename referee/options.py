@@ -5,6 +5,9 @@ from dataclasses import dataclass
 import sys
 import argparse
 from .game import PlayerColor, GAME_NAME, NUM_PLAYERS
+from .log import LOG_BATCH_SIZE
+from .agent.resources import SPACE_MODES, SPACE_MODE_DEFAULT, \
+    TIME_CLOCKS, TIME_CLOCK_DEFAULT
 
 
 # Program information:
@@ -42,6 +45,9 @@ VERBOSITY_NOVALUE = 3  # highest level, additional debug info
 LOGFILE_DEFAULT = None
 LOGFILE_NOVALUE = "game.log"
 
+PROFILE_DEFAULT = None
+PROFILE_NOVALUE = "profiles"
+
 PKG_SPEC_HELP = """
 The required positional arguments RED and BLUE are 'package specifications'.
 These specify which Python package/module to import and search for a class
@@ -167,6 +173,72 @@ def get_options():
         "(default: %(const)s).",
     )
 
+    optionals.add_argument(
+        "-r",
+        "--record",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="append a compact binary record of the game (initial board, "
+        "actions and time per move) to %(metavar)s; see referee/record.py.",
+    )
+
+    optionals.add_argument(
+        "-b",
+        "--log-buffer",
+        type=int,
+        default=LOG_BATCH_SIZE,
+        metavar="N",
+        help="write log output from a background task in batches of up to "
+        "%(metavar)s messages, so that logging does not hold up the game; "
+        "0 writes every message immediately (default: %(default)s).",
+    )
+
+    optionals.add_argument(
+        "-P",
+        "--profile",
+        type=str,
+        nargs="?",
+        default=PROFILE_DEFAULT,
+        const=PROFILE_NOVALUE,
+        metavar="DIR",
+        help="profile every agent action() call and write one profile per "
+        "agent and colour, plus a summary of the hottest functions, to "
+        "directory %(metavar)s (default: %(const)s). Profiles accumulate "
+        "across games written to the same directory.",
+    )
+
+    optionals.add_argument(
+        "-k",
+        "--time-clock",
+        choices=TIME_CLOCKS,
+        default=TIME_CLOCK_DEFAULT,
+        help="which clock the time limit is enforced on: the agent "
+        "process's CPU time (cpu), wall-clock time (wall), or CPU time "
+        "including terminated child processes (cpu+children); all three "
+        "are reported (default: %(default)s).",
+    )
+
+    optionals.add_argument(
+        "-m",
+        "--space-mode",
+        choices=SPACE_MODES,
+        default=SPACE_MODE_DEFAULT,
+        help="how agents' memory usage is measured and limited: virtual "
+        "memory (vm), resident memory (rss), peak resident memory from "
+        "getrusage (rusage) or the traced Python heap (tracemalloc) "
+        "(default: %(default)s).",
+    )
+
+    optionals.add_argument(
+        "-B",
+        "--board-snapshot",
+        action="store_true",
+        help="publish the board to shared memory after every turn and pass "
+        "its name to the agents' constructors as the 'board_snapshot' "
+        "keyword argument (see referee/agent/snapshot.py).",
+    )
+
     colour_group = optionals.add_mutually_exclusive_group()
     colour_group.add_argument(
         "-c",
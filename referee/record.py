@@ -0,0 +1,204 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Compact binary game records. A record file is a short magic header followed
+# by any number of games, each stored as (little-endian):
+#
+#   uint32   length of the rest of the game record in bytes
+#   int8     winner (1 RED, -1 BLUE, 0 draw)
+#   int8     colour to move on the initial board
+#   uint16   number of moves
+#   64 x     initial board cell codes (as in referee/agent/snapshot.py)
+#   str8     RED player name, str8 BLUE player name, str16 error message
+#            (uintN length then UTF-8; an empty error means none)
+#   per move:
+#     float32  time the mover spent on it (NaN if unknown)
+#     uint8    number of directions, or 255 for GROW; for a MOVE this is
+#              followed by one byte for the frog's cell (r * 8 + c) and one
+#              byte per direction (its index in Direction)
+#
+# Games are appended as they end, so a file can collect a whole archive, and
+# read back one at a time without loading the file. Replaying a game just
+# applies its actions to the initial board (see run.replay_recorded_game).
+#
+#   python -m referee --record games.rec agent agent
+#   python -m referee.archive games.rec --verify
+#   python -m referee.archive games.rec --replay 0
+
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from .game import BOARD_N, Board, Coord, Direction, PlayerColor, \
+    Action, MoveAction, GrowAction
+from .agent.snapshot import SNAPSHOT_CELLS, encode_board, decode_board
+
+RECORD_MAGIC = b"FRKREC1\n"
+
+_LENGTH = struct.Struct("<I")
+_HEADER = struct.Struct("<bbH")
+_TIME = struct.Struct("<f")
+_MOVE = struct.Struct("<fB")  # time, then the first byte of the action
+_STR8 = struct.Struct("<B")
+_STR16 = struct.Struct("<H")
+_GROW = 255
+_DIRECTIONS = list(Direction)
+_DIRECTION_INDEX = {d: i for i, d in enumerate(_DIRECTIONS)}
+_COLORS = {1: PlayerColor.RED, -1: PlayerColor.BLUE, 0: None}
+
+
+@dataclass(slots=True)
+class RecordedGame:
+    """
+    One recorded game: the initial board, the actions played from it (with
+    the time each mover spent) and the outcome.
+    """
+    cells: bytes  # initial board cell codes
+    turn_color: PlayerColor
+    actions: list[Action] = field(default_factory=list)
+    times: list[float] = field(default_factory=list)
+    winner: PlayerColor | None = None
+    red: str = ""
+    blue: str = ""
+    error: str | None = None
+
+    @classmethod
+    def starting_from(cls, board: Board, **kwargs) -> 'RecordedGame':
+        return cls(encode_board(board)[:SNAPSHOT_CELLS], board.turn_color,
+                   **kwargs)
+
+    def initial_board(self) -> Board:
+        return decode_board(self.cells, self.turn_color)
+
+    def boards(self) -> Iterator[Board]:
+        """
+        The board after each action, in turn. The same Board is updated and
+        yielded every time; clone it to keep a position.
+        """
+        board = self.initial_board()
+        for action in self.actions:
+            board.apply_action(action)
+            yield board
+
+    def final_board(self) -> Board:
+        board = self.initial_board()
+        for action in self.actions:
+            board.apply_action(action)
+        return board
+
+
+def _encode_str(s: str, length: struct.Struct) -> bytes:
+    data = s.encode()[:256 ** length.size - 1]
+    return length.pack(len(data)) + data
+
+
+def _encode_action(action: Action) -> bytes:
+    match action:
+        case MoveAction(coord, directions):
+            return bytes([
+                len(directions), coord.r * BOARD_N + coord.c,
+                *(_DIRECTION_INDEX[d] for d in directions)
+            ])
+        case GrowAction():
+            return bytes([_GROW])
+    raise ValueError(f"cannot record action: {action!r}")
+
+
+def encode_game(game: RecordedGame) -> bytes:
+    """
+    The bytes of one game record, including its length prefix.
+    """
+    winner = int(game.winner) if game.winner is not None else 0
+    parts = [
+        _HEADER.pack(winner, int(game.turn_color), len(game.actions)),
+        game.cells,
+        _encode_str(game.red, _STR8),
+        _encode_str(game.blue, _STR8),
+        _encode_str(game.error or "", _STR16),
+    ]
+    for action, elapsed in zip(game.actions, game.times):
+        parts.append(_TIME.pack(elapsed))
+        parts.append(_encode_action(action))
+    body = b"".join(parts)
+    return _LENGTH.pack(len(body)) + body
+
+
+def decode_game(body: bytes) -> RecordedGame:
+    """
+    The game in a record body (without its length prefix).
+    """
+    winner, turn_color, n_moves = _HEADER.unpack_from(body)
+    offset = _HEADER.size
+    cells = body[offset:offset + SNAPSHOT_CELLS]
+    offset += SNAPSHOT_CELLS
+
+    strings = []
+    for length in (_STR8, _STR8, _STR16):
+        (n,) = length.unpack_from(body, offset)
+        offset += length.size
+        strings.append(body[offset:offset + n].decode())
+        offset += n
+    red, blue, error = strings
+
+    actions: list[Action] = []
+    times: list[float] = []
+    for _ in range(n_moves):
+        elapsed, n = _MOVE.unpack_from(body, offset)
+        offset += _MOVE.size
+        times.append(elapsed)
+        if n == _GROW:
+            actions.append(GrowAction())
+            continue
+        cell = body[offset]
+        actions.append(MoveAction(
+            Coord(cell // BOARD_N, cell % BOARD_N),
+            tuple(_DIRECTIONS[i] for i in body[offset + 1:offset + 1 + n]),
+        ))
+        offset += 1 + n
+
+    return RecordedGame(
+        cells, _COLORS[turn_color], actions, times, _COLORS[winner],
+        red, blue, error or None,
+    )
+
+
+class GameRecordWriter:
+    """
+    Appends games to a record file (created with its header if need be).
+    Each game is written with a single write call.
+    """
+
+    def __init__(self, path: str | Path):
+        self._file: BinaryIO = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(RECORD_MAGIC)
+            self._file.flush()
+
+    def write(self, game: RecordedGame):
+        self._file.write(encode_game(game))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> 'GameRecordWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_games(path: str | Path) -> Iterator[RecordedGame]:
+    """
+    Stream the games in a record file, one at a time.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(RECORD_MAGIC)) != RECORD_MAGIC:
+            raise ValueError(f"not a game record file: {path}")
+        while header := f.read(_LENGTH.size):
+            (length,) = _LENGTH.unpack(header)
+            body = f.read(length)
+            if len(body) < length:
+                raise ValueError(f"truncated game record in {path}")
+            yield decode_game(body)
@@ -7,8 +7,18 @@
 # yielding the game updates to the given event handlers. Event handlers can be
 # used to implement different types of referee behaviour (e.g. logging,
 # visualisation, pausing, etc.)
+#
+# Handlers are awaited in turn for every update, so a slow one holds up the
+# game (including the agents). Handlers that only observe the game can instead
+# be wrapped with `queued_handler`, which runs them as a separate task fed
+# through a bounded queue; the game then only waits for them when the queue
+# is full (QUEUE_LOSSLESS) or not at all (QUEUE_COALESCE, which drops board
+# updates that a newer one supersedes, e.g. for renderers). Handlers that
+# must act before the game continues (snapshot publishing, pausing, the
+# lockstep remote server) or that are cheap (recording) stay inline.
 
 import asyncio
+from collections import deque
 from time import time
 from typing import AsyncGenerator
 
@@ -16,6 +26,120 @@ from .log import LogStream
 from .game import Player, game, \
     GameUpdate, PlayerInitialising, GameBegin, TurnBegin, TurnEnd, \
     BoardUpdate, PlayerError, GameEnd, UnhandledError, PlayerColor
+from .agent.snapshot import BoardSnapshot
+from .record import RecordedGame, GameRecordWriter
+
+HANDLER_QUEUE_SIZE = 64
+QUEUE_LOSSLESS = "lossless"
+QUEUE_COALESCE = "coalesce"
+
+
+async def _update_handlers(
+    handlers: list[AsyncGenerator|None], 
+    update: GameUpdate|None
+):
+    for handler in handlers:
+        try:
+            if handler is not None:
+                await handler.asend(update)
+        except StopAsyncIteration:
+            handlers.remove(handler)
+
+
+def _frozen(update: GameUpdate) -> GameUpdate:
+    # The game goes on mutating its board after yielding it
+    match update:
+        case GameBegin(board) if board is not None:
+            return GameBegin(board.clone())
+        case BoardUpdate(board) if board is not None:
+            return BoardUpdate(board.clone())
+    return update
+
+
+def _coalesce(queue: deque[GameUpdate]) -> bool:
+    # Make room in a full queue by dropping turn updates and all but the
+    # newest board update; updates that begin or end the game or report an
+    # error are always kept, as is the head of the queue (which the handler
+    # may be in the middle of). Returns whether anything was dropped.
+    newest = max((i for i, u in enumerate(queue) if isinstance(u, BoardUpdate)),
+                 default=None)
+    kept = [
+        u for i, u in enumerate(queue)
+        if i in (0, newest) or not isinstance(u, (TurnBegin, TurnEnd, BoardUpdate))
+    ]
+    if len(kept) == len(queue):
+        return False
+    queue.clear()
+    queue.extend(kept)
+    return True
+
+
+async def queued_handler(
+    handler: AsyncGenerator,
+    policy: str = QUEUE_LOSSLESS,
+    maxsize: int = HANDLER_QUEUE_SIZE,
+) -> AsyncGenerator:
+    """
+    Runs an event handler as a separate task that is fed game updates through
+    a queue of at most `maxsize` updates, so that the game does not wait for
+    it. When the queue is full, QUEUE_LOSSLESS waits for room, and
+    QUEUE_COALESCE drops superseded updates instead. Boards are copied as
+    they are queued. At the end of the game, waits for the handler to catch
+    up, closes it and waits for its task to finish. Exceptions raised by the
+    handler are re-raised on the next update.
+    """
+    queue: deque[GameUpdate] = deque()
+    changed = asyncio.Event()
+    error: list[BaseException] = []
+
+    async def _consume():
+        try:
+            await handler.asend(None)
+            while True:
+                while not queue:
+                    changed.clear()
+                    await changed.wait()
+                update = queue[0]
+                await handler.asend(update)
+                queue.popleft()
+                changed.set()
+                if isinstance(update, GameEnd):
+                    break
+            await handler.aclose()
+        except StopAsyncIteration:
+            pass
+        except Exception as e:
+            error.append(e)
+        finally:
+            queue.clear()
+            changed.set()
+
+    consumer = asyncio.create_task(_consume())
+    try:
+        while True:
+            update: GameUpdate = yield
+            if error:
+                raise error[0]
+            if consumer.done():
+                continue
+
+            while len(queue) >= maxsize:
+                if policy == QUEUE_COALESCE and _coalesce(queue):
+                    break
+                changed.clear()
+                await changed.wait()
+            queue.append(_frozen(update))
+            changed.set()
+
+            if isinstance(update, GameEnd):
+                # The consumer finishes once it has handled the GameEnd
+                await asyncio.wait([consumer])
+                if error:
+                    raise error[0]
+    finally:
+        if not consumer.done():
+            consumer.cancel()
+            await asyncio.wait([consumer])
 
 
 async def run_game(
@@ -26,22 +150,13 @@ async def run_game(
     Run a game, yielding event handler generators over the game updates.
     Return the winning player (interface) or 'None' if draw.
     """
-    async def _update_handlers(
-        handlers: list[AsyncGenerator|None], 
-        update: GameUpdate|None
-    ):
-        for handler in handlers:
-            try:
-                if handler is not None:
-                    await handler.asend(update)
-            except StopAsyncIteration:
-                handlers.remove(handler)
-
     await _update_handlers(event_handlers, None)
     async for update in game(*players):
         await _update_handlers(event_handlers, update)
         match update:
             case GameEnd(winner):
+                # Don't leave the end of the game in a log queue
+                LogStream.flush()
                 return winner
             
 
@@ -54,17 +169,6 @@ async def replay_game(
     Replay a game from a log file, yielding event handler generators over the
     game updates.
     """
-    async def _update_handlers(
-        handlers: list[AsyncGenerator|None], 
-        update: GameUpdate|None
-    ):
-        for handler in handlers:
-            try:
-                if handler is not None:
-                    await handler.asend(update)
-            except StopAsyncIteration:
-                handlers.remove(handler)
-
     def _update_from_log(line: str) -> GameUpdate:
         parts = line.split("\t")
         if len(parts) < 2:
@@ -100,6 +204,75 @@ async def replay_game(
         await _update_handlers(event_handlers, update)
         
 
+async def replay_recorded_game(
+    record: RecordedGame,
+    players: list[Player],
+    event_handlers: list[AsyncGenerator|None]=[]
+) -> Player|None:
+    """
+    Replay a recorded game (see record.py), yielding event handler generators
+    over the same game updates as the original game, with the boards rebuilt
+    by applying the recorded actions. Return the winning player or 'None' if
+    draw, as recorded.
+    """
+    board = record.initial_board()
+    await _update_handlers(event_handlers, None)
+    await _update_handlers(event_handlers, GameBegin(board))
+    for turn_id, action in enumerate(record.actions, 1):
+        player = players[board.turn_color]
+        await _update_handlers(event_handlers, TurnBegin(turn_id, player))
+        await _update_handlers(event_handlers, TurnEnd(turn_id, player, action))
+        board.apply_action(action)
+        await _update_handlers(event_handlers, BoardUpdate(board))
+    if record.error is not None:
+        await _update_handlers(event_handlers, PlayerError(record.error))
+    winner = players[record.winner] if record.winner is not None else None
+    await _update_handlers(event_handlers, GameEnd(winner))
+    return winner
+
+
+async def game_recorder(
+    writer: GameRecordWriter,
+    names: dict[PlayerColor, str],
+) -> AsyncGenerator:
+    """
+    Intercepts game updates and appends the game to a binary game record
+    when it ends (see record.py), with the time each mover spent on their
+    action if the player reports it. Only actions the board accepted are
+    recorded, so that the record always replays; an action rejected as
+    illegal is only described by the game's error message.
+    """
+    record: RecordedGame | None = None
+    pending: float | None = None  # time spent on the action being applied
+    while True:
+        update: GameUpdate = yield
+        match update:
+            case GameBegin(board):
+                record = RecordedGame.starting_from(
+                    board,
+                    red=names.get(PlayerColor.RED, ""),
+                    blue=names.get(PlayerColor.BLUE, ""),
+                )
+                pending = None
+            case TurnEnd(_, player, _) if record is not None:
+                status = getattr(player, "status", None)
+                pending = status.time_delta if status is not None \
+                    else float("nan")
+            case BoardUpdate(board) if record is not None and \
+                    pending is not None and board is not None:
+                # The action as the board applied it (directions as a tuple)
+                record.actions.append(board._history[-1].action)
+                record.times.append(pending)
+                pending = None
+            case PlayerError(message) if record is not None:
+                record.error = message
+                pending = None
+            case GameEnd(winner) if record is not None:
+                record.winner = winner.color if winner is not None else None
+                writer.write(record)
+                record = None
+
+
 async def game_commentator(
     stream: LogStream,
 ) -> AsyncGenerator:
@@ -179,6 +352,20 @@ async def game_event_logger(
                 raise NotImplementedError(f"unhandled game update: {update}")
 
 
+async def board_snapshot_publisher(
+    snapshot: BoardSnapshot
+) -> AsyncGenerator:
+    """
+    Intercepts board updates (and the initial board) and publishes the board
+    to a shared memory snapshot, before the agents are updated.
+    """
+    while True:
+        update: GameUpdate = yield
+        match update:
+            case GameBegin(board) | BoardUpdate(board):
+                snapshot.publish(board)
+
+
 async def game_delay(
     delay: float
 ) -> AsyncGenerator:
@@ -214,19 +401,21 @@ async def output_board_updates(
 ) -> AsyncGenerator:
     """
     Intercepts board updates and prints the new board state in the output
-    stream. The board is formatted using the given options.
+    stream. The board is formatted using the given options, only when the
+    stream writes it (so a copy of the board is logged).
     """
+    def _render(board):
+        return '\n'.join([f"{'':<25}{l}" for l in
+            board.render(
+                use_color=use_color,
+                use_unicode=use_unicode,
+            ).splitlines()
+        ])
+
     while True:
         update: GameUpdate = yield
         match update:
             case BoardUpdate(board):
                 stream.info(f"\n{' game board '.center(width, '=')}\n\n")
-                stream.info(
-                    '\n'.join([f"{'':<25}{l}" for l in
-                        board.render(
-                            use_color=use_color,
-                            use_unicode=use_unicode,
-                        ).splitlines()
-                    ])
-                )
+                stream.info(lambda board=board.clone(): _render(board))
                 stream.info(f"\n{''.center(width, '=')}\n\n")
@@ -8,7 +8,14 @@ from typing import AsyncGenerator
 
 from .server import RemoteServer
 from .serialization import serialize_game_update
-from ..game import GameUpdate, PlayerColor, GameBegin, GameEnd
+from ..game import GameUpdate, PlayerColor, GameBegin, BoardUpdate, GameEnd
+
+# Board updates are sent as the cells changed by the last action, except for
+# every KEYFRAME_INTERVAL-th one (and any that does not follow on from the
+# previous board update), which carries the whole board. Only the updates
+# since the last keyframe are kept, which is all a client joining mid-game
+# needs to catch up.
+KEYFRAME_INTERVAL = 16
 
 
 class RemoteGame:
@@ -23,7 +30,11 @@ class RemoteGame:
         ):
         self._server = server
         self._player_names = player_names
-        self._history = []
+        self._history: list[dict] = []
+        self._game_begin: dict | None = None
+        self._sent = 0
+        self._board_updates = 0
+        self._turn_count = 0
 
     async def event_handler(self) -> AsyncGenerator:
         """
@@ -33,31 +44,61 @@ class RemoteGame:
             update: GameUpdate | None = yield
             assert update is not None
 
+            keyframe = False
             match update:
                 case GameBegin(board):
                     self._history.clear()
+                    self._sent = 0
+                    self._board_updates = 0
+                    self._turn_count = board.turn_count
                     self._server._log.debug("syncing game metadata...")
                     await self.sync_game_metadata()
 
+                case BoardUpdate(board):
+                    keyframe = \
+                        self._board_updates % KEYFRAME_INTERVAL == 0 or \
+                        board.turn_count != self._turn_count + 1
+                    self._board_updates += 1
+                    self._turn_count = board.turn_count
+
             try:
-                serialized_update = serialize_game_update(update)
+                serialized_update = serialize_game_update(update, keyframe)
         
-                await self._server.sync(serialized_update, len(self._history))
+                await self._server.sync(serialized_update, self._sent)
 
                 self._server._log.debug(f"broadcasted game update: {serialized_update}")
-                self._history.append(update)
+                self._sent += 1
+                if isinstance(update, GameBegin):
+                    self._game_begin = serialized_update
+                    continue
+                if keyframe:
+                    self._history.clear()
+                self._history.append(serialized_update)
                 
             except Exception as e:
                 self._server._log.error(f"error broadcasting game update: {e}")
                 raise e
     
-    async def sync_game_metadata(self):
+    def catch_up_messages(self) -> list[dict]:
         """
-        Send game metadata to the client, e.g. player names. 
+        The messages a client joining mid-game needs: the game metadata, the
+        game's start, the last board keyframe and the updates since.
         """
-        message = {
+        messages = [self._game_metadata()]
+        if self._game_begin is not None:
+            messages.append(self._game_begin)
+        return messages + self._history
+
+    def _game_metadata(self) -> dict:
+        return {
             "type": "GameMetadata",
             "players": self._player_names,
         }
+
+    async def sync_game_metadata(self):
+        """
+        Send game metadata to the client, e.g. player names. 
+        """
+        message = self._game_metadata()
         await self._server.sync(message)
         self._server._log.debug(f"sent game metadata: {message}")
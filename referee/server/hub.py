@@ -0,0 +1,240 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# A websocket server for watching many games at once (e.g. a tournament).
+# Unlike RemoteServer, which plays one game in lockstep with one client (every
+# update waits for an <ack>), the hub never makes a game wait for a viewer:
+# updates are published into a bounded outgoing queue per client, which a
+# separate task drains onto the socket.
+#
+# Every message to a client carries the id of the game it belongs to ("game").
+# Clients send:
+#   {"type": "ListGames"}                     -> {"type": "Games", "games": [...]}
+#   {"type": "Subscribe", "games": [id, ...]} (or a single id, or "*" for all
+#                                              games, including ones yet to
+#                                              start)
+#   {"type": "Unsubscribe", "games": [id, ...] or "*"}
+# and are told of games starting and ending with "GameAdded"/"GameRemoved".
+# On subscribing, a client is first sent what it needs to catch up with a game
+# in progress (see RemoteGame.catch_up_messages).
+#
+# A client that falls VIEWER_QUEUE_SIZE messages behind has its queue dropped
+# and is instead sent a "Resync" message followed by the catch-up messages for
+# each game it watches, so a slow viewer skips ahead rather than holding
+# anything up or using unbounded memory.
+
+import asyncio
+import json
+from collections import deque
+
+import websockets
+
+from ..log import LogStream, NullLogger
+from .game import RemoteGame
+from .server import LISTEN_HOST, LISTEN_PORT
+
+VIEWER_QUEUE_SIZE = 1024
+ALL_GAMES = "*"
+
+
+def _game_ids(games: list[str] | str) -> list[str] | str:
+    # A single game id may be given on its own rather than in a list
+    if isinstance(games, str) and games != ALL_GAMES:
+        return [games]
+    return games
+
+
+class _Viewer:
+    """
+    A connected client: its subscriptions and outgoing message queue.
+    """
+
+    def __init__(self, websocket, limit: int):
+        self.websocket = websocket
+        self.limit = limit
+        self.games: set[str] = set()
+        self.all_games = False
+        self.queue: deque[str] = deque()
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def watches(self, game_id: str) -> bool:
+        return self.all_games or game_id in self.games
+
+    def put(self, message: str):
+        self.queue.append(message)
+        self.ready.set()
+
+
+class _GameChannel:
+    """
+    What a RemoteGame sees in place of a RemoteServer when it is served by a
+    hub: sync() publishes to the game's viewers and returns immediately.
+    """
+
+    def __init__(self, hub: 'GameHub', game_id: str):
+        self._hub = hub
+        self._game_id = game_id
+        self._log = hub._log
+
+    async def sync(self, message: dict, expect_id: int | None = None):
+        self._hub.publish(self._game_id, message, expect_id)
+
+
+class GameHub:
+    """
+    Serves any number of concurrently running games to any number of
+    clients. Use as an async context manager to run the server.
+    """
+
+    def __init__(self,
+            host: str = LISTEN_HOST,
+            port: int = LISTEN_PORT,
+            log_stream: LogStream | None = None,
+            queue_size: int = VIEWER_QUEUE_SIZE,
+        ):
+        self._host = host
+        self._port = port
+        self._log = log_stream or NullLogger()
+        self._queue_size = queue_size
+        self._server = None
+        self._games: dict[str, RemoteGame] = {}
+        self._viewers: set[_Viewer] = set()
+
+    def add_game(self, game_id: str, player_names: list[str]) -> RemoteGame:
+        """
+        Register a game; its updates are served through the returned
+        RemoteGame's event handler.
+        """
+        game = RemoteGame(_GameChannel(self, game_id), player_names, [])
+        self._games[game_id] = game
+        self._broadcast({"type": "GameAdded", "game": game_id,
+                         "players": player_names})
+        return game
+
+    def remove_game(self, game_id: str):
+        """
+        Forget a finished game (clients have already been sent its end).
+        """
+        if self._games.pop(game_id, None) is not None:
+            self._broadcast({"type": "GameRemoved", "game": game_id})
+
+    def publish(self, game_id: str, message: dict, id: int | None = None):
+        """
+        Queue a message from a game for every client watching it.
+        """
+        viewers = [v for v in self._viewers if v.watches(game_id)]
+        if not viewers:
+            return
+        message_str = json.dumps({**message, "game": game_id, "id": id})
+        for viewer in viewers:
+            self._put(viewer, message_str)
+
+    def _broadcast(self, message: dict):
+        message_str = json.dumps(message)
+        for viewer in self._viewers:
+            self._put(viewer, message_str)
+
+    def _put(self, viewer: _Viewer, message_str: str):
+        if len(viewer.queue) < viewer.limit:
+            viewer.put(message_str)
+            return
+
+        # Too far behind: skip ahead to the current state of its games
+        viewer.dropped += len(viewer.queue)
+        viewer.queue.clear()
+        self._log.debug(f"viewer {viewer.websocket.remote_address} fell "
+                        f"behind, {viewer.dropped} messages dropped so far")
+        viewer.put(json.dumps({"type": "Resync"}))
+        for game_id, game in self._games.items():
+            if viewer.watches(game_id):
+                self._catch_up(viewer, game_id, game)
+        # The catch-up messages themselves don't count against the limit.
+        # They don't include this message yet (games record it once sent)
+        viewer.put(message_str)
+        viewer.limit = len(viewer.queue) + self._queue_size
+
+    def _catch_up(self, viewer: _Viewer, game_id: str, game: RemoteGame):
+        for message in game.catch_up_messages():
+            viewer.put(json.dumps({**message, "game": game_id}))
+
+    def _games_list(self) -> list[dict]:
+        return [
+            {"game": game_id, "players": game._player_names}
+            for game_id, game in self._games.items()
+        ]
+
+    def _subscribe(self, viewer: _Viewer, games: list[str] | str):
+        games = _game_ids(games)
+        if games == ALL_GAMES:
+            new = [g for g in self._games if not viewer.watches(g)]
+            viewer.all_games = True
+        else:
+            new = [g for g in games if not viewer.watches(g)]
+            viewer.games.update(games)
+        for game_id in new:
+            if game_id in self._games:
+                self._catch_up(viewer, game_id, self._games[game_id])
+
+    def _unsubscribe(self, viewer: _Viewer, games: list[str] | str):
+        games = _game_ids(games)
+        if games == ALL_GAMES:
+            viewer.all_games = False
+            viewer.games.clear()
+        else:
+            viewer.games.difference_update(games)
+
+    def _receive(self, viewer: _Viewer, message: dict):
+        match message:
+            case {"type": "ListGames"}:
+                viewer.put(json.dumps({
+                    "type": "Games", "games": self._games_list()}))
+            case {"type": "Subscribe", "games": str() | list() as games}:
+                self._subscribe(viewer, games)
+            case {"type": "Unsubscribe", "games": str() | list() as games}:
+                self._unsubscribe(viewer, games)
+            case _:
+                self._log.warning(f"unhandled message: {message}")
+
+    async def _send_queued(self, viewer: _Viewer):
+        try:
+            while True:
+                await viewer.ready.wait()
+                while viewer.queue:
+                    await viewer.websocket.send(viewer.queue.popleft())
+                viewer.ready.clear()
+                viewer.limit = self._queue_size
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _handler(self, websocket):
+        """
+        Handle one client: incoming requests here, outgoing messages in a
+        separate task.
+        """
+        viewer = _Viewer(websocket, self._queue_size)
+        self._viewers.add(viewer)
+        sender = asyncio.create_task(self._send_queued(viewer))
+        self._log.debug(f"viewer connected: {websocket.remote_address}")
+        try:
+            async for message in websocket:
+                try:
+                    self._receive(viewer, json.loads(message))
+                except json.JSONDecodeError as e:
+                    self._log.error(f"failed to parse message: {e}")
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._viewers.discard(viewer)
+            sender.cancel()
+            self._log.debug(f"viewer disconnected: {websocket.remote_address}")
+
+    async def __aenter__(self) -> 'GameHub':
+        self._server = await websockets.serve(
+            self._handler, self._host, self._port)
+        self._log.info(f"game hub listening on ws://{self._host}:{self._port}")
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._server.close()
+        await self._server.wait_closed()
@@ -7,17 +7,29 @@ from typing import Literal
 from ..game import *
 from ..game.board import CellState
 
+_ROWS = [[Coord(r, c) for c in range(BOARD_N)] for r in range(BOARD_N)]
+
 
 def serialize_game_board(board: Board) -> list[list[int]]:
     """
     Serialize a game board to a dictionary.
     """
-    sz_board = [BOARD_N * [0] for _ in range(BOARD_N)]
-    for r in range(BOARD_N):
-        for c in range(BOARD_N):
-            sz_board[r][c] = serialize_game_board_cell(board[Coord(r, c)])
+    cells = board._state
+    return [
+        [serialize_game_board_cell(cells[coord]) for coord in row]
+        for row in _ROWS
+    ]
 
-    return sz_board
+
+def serialize_game_board_diff(board: Board) -> list[list[int]]:
+    """
+    Serialize the cells changed by the last action played on a game board,
+    as [r, c, cell] triples (cells as in serialize_game_board).
+    """
+    return sorted(
+        [m.cell.r, m.cell.c, serialize_game_board_cell(m.next)]
+        for m in board._history[-1].cell_mutations
+    )
 
 
 def serialize_game_board_cell(cell: CellState) -> int:
@@ -67,9 +79,12 @@ def serialize_game_action(action: Action) -> dict:
             }
 
 
-def serialize_game_update(update: GameUpdate) -> dict:
+def serialize_game_update(update: GameUpdate, keyframe: bool = True) -> dict:
     """
-    Serialize a game update to a dictionary.
+    Serialize a game update to a dictionary. A board update carries the
+    whole board ("board") if `keyframe` is set, otherwise only the cells
+    changed by the last action ("cells"); the latter assumes the client
+    holds the board as of the previous board update.
     """
     update_cls_name = update.__class__.__name__
     update_payload = {}
@@ -98,11 +113,16 @@ def serialize_game_update(update: GameUpdate) -> dict:
                 "action": serialize_game_action(action),
             }
 
-        case BoardUpdate(board):
+        case BoardUpdate(board) if keyframe or not board._history:
             update_payload = {
                 "board": serialize_game_board(board),
             }
 
+        case BoardUpdate(board):
+            update_payload = {
+                "cells": serialize_game_board_diff(board),
+            }
+
         case GameEnd(winner):
             update_payload = {
                 "winner": serialize_game_player(winner),
@@ -3,6 +3,7 @@
 
 from collections import Counter
 from math import inf
+from typing import Callable
 import json
 import asyncio
 import websockets
@@ -20,6 +21,11 @@ class InvalidAckError(Exception):
     pass
 
 
+# The first client to connect plays the game in lockstep with the server: every
+# message waits for its <ack>. Clients connecting later only watch. They are
+# first sent what they need to catch up with the game in progress (see
+# set_catch_up), then every message from then on, and their own messages are
+# ignored. Once the first client disconnects, messages are no longer acked.
 class RemoteServer:
     def __init__(self, 
             host: str=LISTEN_HOST, 
@@ -32,6 +38,19 @@ class RemoteServer:
 
         self._server = None
         self._incoming_messages: list[Message] = []
+        self._client = None
+        self._viewers: set = set()
+        self._catch_up: Callable[[], list[dict]] | None = None
+        self._unacked: str | None = None
+        self._send_lock = asyncio.Lock()
+
+    def set_catch_up(self, messages: Callable[[], list[dict]]):
+        """
+        Set where the messages for clients joining mid-game come from (e.g.
+        RemoteGame.catch_up_messages). They must cover every message synced
+        so far except one still waiting for its <ack>.
+        """
+        self._catch_up = messages
     
     async def send(self, message: dict, id: int | None = None):
         """
@@ -49,17 +68,27 @@ class RemoteServer:
             self._log.warning("attempted to send message when server not running.")
             return
         
-        for conn in self._server.connections:
-            await conn.send(message_str)
+        async with self._send_lock:
+            for conn in self._server.connections:
+                if conn is self._client:
+                    await conn.send(message_str)
+                elif conn in self._viewers:
+                    try:
+                        await conn.send(message_str)
+                    except websockets.ConnectionClosed:
+                        # A viewer leaving doesn't concern the game
+                        self._viewers.discard(conn)
             self._log.debug(f"sent message: {message_str}")
+        return message_str
 
     async def sync(self, message: dict, expect_id: str | None = None):
         """
         Send a message to the client and wait for a response.
         """
-        await self.send(message, expect_id)
+        self._unacked = await self.send(message, expect_id)
         self._log.debug("waiting for <ack>...")
         response = await self.receive('<ack>')
+        self._unacked = None
         if expect_id and response and expect_id != response.get("id"):
             await self.stop()
             raise InvalidAckError(f"expected ack ID {expect_id}, got {response}")
@@ -73,7 +102,7 @@ class RemoteServer:
         Take the next message from the queue of the specified type and return
         it. Waits until a message of the specified type is available if none.
         """
-        while self._server and len(self._server.connections) > 0:
+        while self._server and self._client_connected():
             if message_type is not None:
                 for i, message in enumerate(self._incoming_messages):
                     if message.type == message_type:
@@ -84,11 +113,44 @@ class RemoteServer:
 
             await asyncio.sleep(INCOMING_POLL_INTERVAL)
 
+    def _client_connected(self) -> bool:
+        if self._client is None:
+            return len(self._server.connections) > 0
+        return self._client in self._server.connections
+
     async def _handler(self, websocket):
         """
         Handle incoming then outgoing messages.
         """
+        if self._client is None:
+            self._client = websocket
+        else:
+            await self._add_viewer(websocket)
+
+        try:
+            await self._receive_from(websocket)
+        finally:
+            self._viewers.discard(websocket)
+
+    async def _add_viewer(self, websocket):
+        """
+        Catch a late-joining client up with the game, then add it to the
+        clients every message is sent to.
+        """
+        async with self._send_lock:
+            messages = self._catch_up() if self._catch_up else []
+            for message in messages:
+                await websocket.send(json.dumps({**message, "id": None}))
+            if self._unacked is not None:
+                await websocket.send(self._unacked)
+            self._viewers.add(websocket)
+        self._log.info(f"viewer connected, sent {len(messages)} "
+                       f"catch-up messages")
+
+    async def _receive_from(self, websocket):
         async for message in websocket:
+            if websocket is not self._client:
+                continue
             self._log.debug(f"received message: {message}")
             
             try:
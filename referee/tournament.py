@@ -0,0 +1,358 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Tournament mode: play a batch of games between two agents and report the
+# aggregate result. Usage:
+#
+#   python -m referee.tournament agent other_agent -n 100 -j 8
+#
+# Every game gets its own pair of agent subprocesses (with the usual per-agent
+# time and space limits), colours alternate between games, and up to `-j`
+# games run at once. As the agents do the work in their own processes, the
+# referee side is a single asyncio loop; `-j` defaults to the number of cores.
+# Agent processes are pooled and reset between games rather than restarted
+# (see referee/agent/pool.py) unless --fresh-processes is given. With --serve,
+# every game is streamed to websocket viewers as it is played (see
+# referee/server/hub.py). With --profile, the agents' action() calls are
+# profiled and aggregated over the whole tournament, one profile per agent
+# and colour (see referee/agent/profiling.py).
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import AsyncGenerator
+
+from .agent import AgentProxyPlayer, AgentWorkerPool
+from .agent.resources import SPACE_MODES_REUSABLE
+from .game import PlayerColor, TurnEnd, PlayerError
+from .log import LogStream, LogColor, NullLogger
+from .options import PlayerLoc, PackageSpecAction, \
+    SPACE_LIMIT_DEFAULT, TIME_LIMIT_DEFAULT, SPACE_MODES, SPACE_MODE_DEFAULT, \
+    TIME_CLOCKS, TIME_CLOCK_DEFAULT, PROFILE_NOVALUE
+from .run import run_game, game_recorder
+from .record import GameRecordWriter
+from .server import GameHub
+from .server.server import LISTEN_PORT
+
+Z_95 = 1.96
+
+
+@dataclass(slots=True)
+class GameRecord:
+    """
+    Outcome of one tournament game, from agent A's point of view.
+    """
+    game: int
+    a_color: str
+    result: str  # "win", "loss" or "draw" for agent A, or "error" if the
+                 # game was cut short by an error outside the agents
+    turns: int
+    error: str | None = None
+    move_time: dict[str, float] = field(default_factory=dict)
+    moves: dict[str, int] = field(default_factory=dict)
+
+
+async def _game_monitor(record: GameRecord, names: dict) -> AsyncGenerator:
+    # Event handler collecting per-agent time per move (on the enforced clock)
+    # and errors
+    while True:
+        update = yield
+        match update:
+            case TurnEnd(turn_id, player, _):
+                name = names[player.color]
+                record.turns = turn_id
+                record.moves[name] = record.moves.get(name, 0) + 1
+                if player.status is not None:
+                    record.move_time[name] = \
+                        record.move_time.get(name, 0.0) + player.status.time_delta
+            case PlayerError(message):
+                record.error = message
+
+
+async def play_game(
+    game: int,
+    agents: tuple[PlayerLoc, PlayerLoc],
+    time_limit: float,
+    space_limit: float,
+    subproc_output: bool,
+    pool: AgentWorkerPool | None = None,
+    space_mode: str = SPACE_MODE_DEFAULT,
+    time_clock: str = TIME_CLOCK_DEFAULT,
+    recorder: GameRecordWriter | None = None,
+    hub: GameHub | None = None,
+    profile_dir: str | None = None,
+) -> GameRecord:
+    """
+    Play one game; agent A is RED in even-numbered games and BLUE otherwise.
+    """
+    a_color = PlayerColor.RED if game % 2 == 0 else PlayerColor.BLUE
+    colors = {"A": a_color, "B": a_color.opponent}
+    names = {color: name for name, color in colors.items()}
+    locs = {"A": agents[0], "B": agents[1]}
+
+    players = sorted(
+        (AgentProxyPlayer(
+            f"game {game} agent {name} [{locs[name]}]",
+            colors[name],
+            locs[name],
+            time_limit=time_limit,
+            space_limit=space_limit,
+            log=NullLogger(),
+            subproc_output=subproc_output,
+            time_clock=time_clock,
+            space_mode=space_mode,
+            profile_dir=profile_dir,
+            pool=pool,
+        ) for name in ("A", "B")),
+        key=lambda p: p.color.value,
+    )
+
+    record = GameRecord(game, str(a_color), "draw", 0)
+    handlers = [_game_monitor(record, names)]
+    if recorder is not None:
+        handlers.append(game_recorder(
+            recorder, {colors[name]: str(locs[name]) for name in colors}))
+    if hub is not None:
+        handlers.append(hub.add_game(
+            str(game), [str(locs[names[p.color]]) for p in players]
+        ).event_handler())
+    try:
+        winner = await run_game(players, handlers)
+    except Exception as e:
+        # Only this game is lost; the rest of the tournament carries on
+        record.result = "error"
+        record.error = f"unhandled error: {type(e).__name__}: {e}"
+        return record
+    finally:
+        if hub is not None:
+            hub.remove_game(str(game))
+    if winner is not None:
+        record.result = "win" if winner.color == a_color else "loss"
+    return record
+
+
+def elo_difference(score: float) -> float:
+    """
+    Elo rating difference implied by an expected score in (0, 1).
+    """
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def summarise(records: list[GameRecord]) -> dict:
+    """
+    Win/draw/loss counts for agent A, per-colour breakdown, average time
+    per move for each agent, and A's Elo difference over B with a 95%
+    confidence interval (normal approximation on the mean game score).
+    Games cut short by an unhandled error are counted as "unfinished" and
+    left out of the averages, score and Elo figures, which are None if no
+    game finished.
+    """
+    finished = [r for r in records if r.result != "error"]
+    n = len(finished)
+
+    def tally(subset):
+        return {k: sum(r.result == k for r in subset) for k in ("win", "draw", "loss")}
+
+    move_time = {}
+    for name in ("A", "B"):
+        total = sum(r.move_time.get(name, 0.0) for r in records)
+        moves = sum(r.moves.get(name, 0) for r in records)
+        move_time[name] = total / moves if moves else None
+
+    summary = {
+        "games": len(records),
+        **tally(records),
+        "unfinished": len(records) - n,
+        "by_color": {
+            color: tally([r for r in records if r.a_color == color])
+            for color in map(str, PlayerColor)
+        },
+        "errors": sum(r.error is not None for r in finished),
+        "avg_turns": None,
+        "avg_move_time": move_time,
+        "score": None,
+        "elo": None,
+        "elo_ci": None,
+    }
+    if n == 0:
+        return summary
+
+    scores = [{"win": 1.0, "draw": 0.5, "loss": 0.0}[r.result] for r in finished]
+    mean = sum(scores) / n
+    variance = sum((s - mean) ** 2 for s in scores) / n
+    margin = Z_95 * math.sqrt(variance / n)
+    summary.update({
+        "avg_turns": sum(r.turns for r in finished) / n,
+        "score": mean,
+        "elo": elo_difference(mean) + 0.0,  # no "-0" for an even score
+        "elo_ci": [elo_difference(mean - margin), elo_difference(mean + margin)],
+    })
+    return summary
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+
+async def run_tournament(
+    agents: tuple[PlayerLoc, PlayerLoc],
+    games: int,
+    workers: int,
+    time_limit: float,
+    space_limit: float,
+    subproc_output: bool = False,
+    log: LogStream = NullLogger(),
+    reuse_processes: bool = True,
+    space_mode: str = SPACE_MODE_DEFAULT,
+    time_clock: str = TIME_CLOCK_DEFAULT,
+    recorder: GameRecordWriter | None = None,
+    hub: GameHub | None = None,
+    profile_dir: str | None = None,
+) -> list[GameRecord]:
+    semaphore = asyncio.Semaphore(workers)
+    records: list[GameRecord] = []
+    pool = AgentWorkerPool(log) if reuse_processes else None
+
+    async def _play(game: int):
+        async with semaphore:
+            record = await play_game(game, agents, time_limit, space_limit,
+                                     subproc_output, pool, space_mode,
+                                     time_clock, recorder, hub, profile_dir)
+        records.append(record)
+        error = f" ({record.error})" if record.error else ""
+        log.info(f"game {game:>4}: A as {record.a_color:<4} "
+                 f"{record.result:<4} in {record.turns} turns{error} "
+                 f"[{len(records)}/{games}]")
+
+    try:
+        await asyncio.gather(*(_play(game) for game in range(games)))
+    finally:
+        if pool is not None:
+            await pool.close()
+            log.info(f"agent processes: {pool.started} started, "
+                     f"{pool.reused} reuses")
+    return sorted(records, key=lambda r: r.game)
+
+
+def _log_summary(log: LogStream, summary: dict, time_clock: str):
+    if summary["unfinished"]:
+        log.info(f"{summary['unfinished']} game(s) cut short by an "
+                 f"unhandled error")
+    if summary["score"] is None:
+        log.info("no games finished")
+        return
+
+    log.info(f"A: {summary['win']} wins, {summary['draw']} draws, "
+             f"{summary['loss']} losses (score {summary['score']:.3f})")
+    for color, tally in summary["by_color"].items():
+        log.info(f"  A as {color:<4}: {tally['win']}-{tally['draw']}-{tally['loss']}")
+    low, high = summary["elo_ci"]
+    log.info(f"Elo A - B: {summary['elo']:+.0f} (95% CI {low:+.0f} .. {high:+.0f})")
+    for name, t in summary["avg_move_time"].items():
+        if t is not None:
+            log.info(f"avg time per move ({time_clock} clock), "
+                     f"{name}: {t:.3f}s")
+    if summary["errors"]:
+        log.info(f"{summary['errors']} game(s) ended by a player error")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="referee.tournament",
+        description="Play a batch of games between two agents.")
+    parser.add_argument("agent_a", metavar="A", action=PackageSpecAction,
+                        help="first agent (package specification)")
+    parser.add_argument("agent_b", metavar="B", action=PackageSpecAction,
+                        help="second agent (package specification)")
+    parser.add_argument("-n", "--games", type=_positive_int, default=10,
+                        help="number of games; colours alternate (default: 10)")
+    parser.add_argument("-j", "--workers", type=_positive_int, default=os.cpu_count(),
+                        help="games played at once (default: number of cores)")
+    parser.add_argument("-t", "--time", type=float, default=TIME_LIMIT_DEFAULT,
+                        help="time limit (seconds) per agent per game")
+    parser.add_argument("-s", "--space", type=float, default=SPACE_LIMIT_DEFAULT,
+                        help="memory limit (MB) per agent per game")
+    parser.add_argument("-k", "--time-clock", choices=TIME_CLOCKS,
+                        default=TIME_CLOCK_DEFAULT,
+                        help="clock the time limit applies to (default: "
+                        "%(default)s; see referee/agent/resources.py)")
+    parser.add_argument("-m", "--space-mode", choices=SPACE_MODES,
+                        default=SPACE_MODE_DEFAULT,
+                        help="how memory usage is measured (default: "
+                        "%(default)s; see referee/agent/resources.py)")
+    parser.add_argument("--agent-output", action="store_true",
+                        help="show the agents' own output (stderr)")
+    parser.add_argument("--fresh-processes", action="store_true",
+                        help="start new agent processes for every game "
+                        "instead of reusing them")
+    parser.add_argument("--record", type=Path, metavar="FILE",
+                        help="append binary records of every game to FILE "
+                        "(see referee/record.py)")
+    parser.add_argument("--serve", type=int, nargs="?", const=LISTEN_PORT,
+                        metavar="PORT",
+                        help="stream the games to websocket viewers on PORT "
+                        f"(default: {LISTEN_PORT})")
+    parser.add_argument("-P", "--profile", type=str, nargs="?",
+                        const=PROFILE_NOVALUE, metavar="DIR",
+                        help="profile the agents' action() calls over all "
+                        "games, writing one profile per agent and colour to "
+                        f"DIR (default: {PROFILE_NOVALUE})")
+    parser.add_argument("--out", type=Path,
+                        help="write per-game records and the summary as JSON")
+    args = parser.parse_args()
+
+    LogStream.set_global_setting("ansi", sys.stdout.isatty())
+    log = LogStream("tournament", LogColor.WHITE)
+    log.info(f"A = {args.agent_a}, B = {args.agent_b}: {args.games} games, "
+             f"{args.workers} at a time")
+
+    if args.space_mode not in SPACE_MODES_REUSABLE and not args.fresh_processes:
+        log.info(f"space mode {args.space_mode} can't be reset between games, "
+                 f"so agent processes are not reused")
+
+    recorder = GameRecordWriter(args.record) if args.record else None
+
+    async def _run(hub: GameHub | None = None) -> list[GameRecord]:
+        return await run_tournament(
+            (args.agent_a, args.agent_b), args.games, args.workers,
+            args.time, args.space, args.agent_output, log,
+            not args.fresh_processes, args.space_mode, args.time_clock,
+            recorder, hub, args.profile)
+
+    async def _run_served() -> list[GameRecord]:
+        async with GameHub(port=args.serve, log_stream=log) as hub:
+            return await _run(hub)
+
+    try:
+        records = asyncio.run(
+            _run_served() if args.serve is not None else _run())
+    finally:
+        if recorder is not None:
+            recorder.close()
+    if args.profile is not None:
+        log.info(f"agent profiles written to '{args.profile}'")
+    summary = summarise(records)
+    _log_summary(log, summary, args.time_clock)
+
+    if args.out:
+        args.out.write_text(json.dumps({
+            "agents": {"A": str(args.agent_a), "B": str(args.agent_b)},
+            "summary": summary,
+            "games": [asdict(r) for r in records],
+        }, indent=1) + "\n")
+
+
+if __name__ == "__main__":
+    main()
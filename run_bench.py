@@ -2,7 +2,6 @@
 # MCTS 性能测试脚本
 
 import argparse
-import random
 import time
 from referee.game.board import Board
 from referee.game.player import PlayerColor
@@ -32,9 +31,6 @@ def main():
     """主函数：执行基准测试"""
     args = setup_parser().parse_args()
     
-    # 设置随机数种子
-    random.seed(args.seed)
-    
     print(f"开始MCTS基准测试 - 迭代次数: {args.iters}, 运行次数: {args.runs}")
     
     # 记录总耗时
@@ -47,8 +43,8 @@ def main():
         # 每次运行都创建一个新的游戏状态
         state = create_game_state()
         
-        # 创建MCTS实例
-        mcts = MCTS(state)
+        # 创建MCTS实例（搜索使用自己的随机数生成器，由种子决定）
+        mcts = MCTS(state, seed=args.seed)
         
         try:
             # 计时
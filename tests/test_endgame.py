@@ -0,0 +1,41 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import time
+
+from referee.game import Board
+
+from agent.endgame import EndgameSolver, legal_actions
+from bench.corpus import DEFAULT_CORPUS_PATH, load_corpus
+from bench.perft import referee_actions, result_keys
+
+
+def _positions():
+    # The perft positions, and every position one ply on from them
+    for board in [Board()] + [p.board() for p in load_corpus(DEFAULT_CORPUS_PATH)]:
+        yield board
+        for action in referee_actions(board):
+            board.apply_action(action)
+            if not board.game_over:
+                yield board
+            board.undo_action()
+
+
+def test_legal_actions_reach_every_referee_position():
+    for board in _positions():
+        ours = legal_actions(board)
+        for action in ours:
+            board.clone().apply_action(action)  # raises if illegal
+        assert result_keys(board, ours) == \
+            result_keys(board, referee_actions(board)), board.render()
+
+
+def test_unfinished_solve_stops_at_time_limit():
+    # Far too deep to solve, and a node budget that never runs out
+    solver = EndgameSolver(node_limit=10 ** 9, time_limit=0.2)
+    start = time.perf_counter()
+    action = solver.solve(Board())
+    elapsed = time.perf_counter() - start
+
+    assert action is None and solver.value is None
+    assert elapsed < 0.2 + 0.1
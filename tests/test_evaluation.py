@@ -0,0 +1,28 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import random
+
+from referee.game import Board
+
+from agent.endgame import legal_actions
+from agent.evaluation import EvalFeatures
+
+
+def test_incremental_features_match_full_evaluation():
+    rng = random.Random(0)
+    for _ in range(5):
+        board = Board()
+        features = EvalFeatures.from_board(board)
+        history = []
+        while not board.game_over and board.turn_count < 60:
+            mutation = board.apply_action(rng.choice(legal_actions(board)))
+            features.apply(board, mutation)
+            history.append(mutation)
+            assert features.values == EvalFeatures.from_board(board).values
+
+        # And back again
+        for _ in history:
+            mutation = board.undo_action()
+            features.undo(board, mutation)
+            assert features.values == EvalFeatures.from_board(board).values
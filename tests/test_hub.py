@@ -0,0 +1,55 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import asyncio
+import json
+import socket
+
+import websockets
+
+from referee.server import GameHub
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _receive(websocket) -> dict:
+    return json.loads(await asyncio.wait_for(websocket.recv(), 5))
+
+
+def test_subscribe_to_single_game_id():
+    port = _free_port()
+
+    async def _run():
+        async with GameHub(host="127.0.0.1", port=port) as hub:
+            hub.add_game("1", ["a", "b"])
+            hub.add_game("2", ["c", "d"])
+            hub.add_game("12", ["e", "f"])
+            async with websockets.connect(f"ws://127.0.0.1:{port}") as ws:
+                await ws.send(json.dumps({"type": "Subscribe", "games": "12"}))
+                catch_up = await _receive(ws)
+
+                for game_id in ("1", "2", "12"):
+                    hub.publish(game_id, {"type": "Ping"})
+                ping = await _receive(ws)
+
+                await ws.send(json.dumps({"type": "Unsubscribe", "games": "12"}))
+                await ws.send(json.dumps({"type": "ListGames"}))
+                games = await _receive(ws)
+                for game_id in ("1", "2", "12"):
+                    hub.publish(game_id, {"type": "Ping"})
+                await ws.send(json.dumps({"type": "ListGames"}))
+                after = await _receive(ws)
+        return catch_up, ping, games, after
+
+    catch_up, ping, games, after = asyncio.run(_run())
+
+    assert catch_up == {"type": "GameMetadata", "players": ["e", "f"],
+                        "game": "12"}
+    assert ping == {"type": "Ping", "game": "12", "id": None}
+    assert games["type"] == "Games"
+    # Unsubscribed, so no pings came before the list
+    assert after["type"] == "Games"
@@ -0,0 +1,39 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import pytest
+
+import referee.main
+from referee.agent.snapshot import BoardSnapshot
+from referee.options import get_options
+from referee.record import GameRecordWriter
+
+
+def test_resources_closed_when_game_fails(monkeypatch, tmp_path):
+    closed = []
+
+    class _Snapshot(BoardSnapshot):
+        def close(self):
+            closed.append("snapshot")
+            super().close()
+
+    class _Writer(GameRecordWriter):
+        def close(self):
+            closed.append("record")
+            super().close()
+
+    async def _failing_run_game(*args, **kwargs):
+        raise RuntimeError("game failed")
+
+    monkeypatch.setattr(referee.main, "BoardSnapshot", _Snapshot)
+    monkeypatch.setattr(referee.main, "GameRecordWriter", _Writer)
+    monkeypatch.setattr(referee.main, "run_game", _failing_run_game)
+    monkeypatch.setattr("sys.argv", [
+        "referee", "-v", "0", "--board-snapshot",
+        "--record", str(tmp_path / "games.bin"), "agent", "agent"])
+
+    with pytest.raises(SystemExit) as exit_info:
+        referee.main.main(get_options())
+
+    assert exit_info.value.code == 1
+    assert sorted(closed) == ["record", "snapshot"]
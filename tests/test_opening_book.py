@@ -0,0 +1,15 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+from referee.game import Board
+
+from agent.opening_book import build_book
+
+
+def test_build_book_reports_progress_on_stderr(capsys):
+    book = build_book(plies=1, width=2, iterations=10)
+
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err.startswith("ply 1: 1 positions, 1 searched")
+    assert len(book) == 1 and book.lookup(Board()) is not None
@@ -0,0 +1,32 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import threading
+import time
+
+from referee.game import Board, PlayerColor
+
+from agent.MCTS import MCTS, GameState
+from agent.program import Agent
+
+
+def test_ponder_stops_after_max_seconds():
+    mcts = MCTS(GameState(None, Board()), seed=0)
+    start = time.perf_counter()
+    mcts.ponder(threading.Event(), max_nodes=10 ** 9, max_seconds=0.2)
+    assert time.perf_counter() - start < 2.0
+    assert mcts.root.visits > 0
+
+
+def test_shutdown_stops_pondering():
+    # The game can end on the opponent's move, after which no update()
+    # arrives to stop the thread started after our own move
+    agent = Agent(PlayerColor.RED)
+    action = agent.action(time_remaining=180.0)
+    agent.update(PlayerColor.RED, action, time_remaining=180.0)
+    thread = agent._ponder_thread
+    assert thread is not None and thread.is_alive()
+
+    agent.shutdown()
+    assert agent._ponder_thread is None
+    assert not thread.is_alive()
@@ -0,0 +1,58 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import asyncio
+
+from referee.agent import AgentWorkerPool
+from referee.agent.client import RemoteProcessClassClient
+from referee.game import PlayerColor
+
+
+def _spec(color: PlayerColor, space_mode: str = "vm") -> RemoteProcessClassClient:
+    return RemoteProcessClassClient(
+        "agent", "Agent",
+        time_limit=180.0, space_limit=250.0, res_limit_tolerance=1.0,
+        recv_timeout=60.0, subproc_output=False, space_mode=space_mode,
+        color=color,
+    )
+
+
+async def _play_own_move(worker: RemoteProcessClassClient):
+    # After its own move our agent ponders in a background thread
+    action = await worker.action()
+    await worker.update(PlayerColor.RED, action)
+
+
+def test_pool_reuses_pondering_agent():
+    async def run():
+        async with AgentWorkerPool() as pool:
+            worker = await pool.acquire(_spec(PlayerColor.RED))
+            await _play_own_move(worker)
+
+            # A reset must stop the pondering thread rather than refuse
+            await worker.reset_for(_spec(PlayerColor.RED))
+            await _play_own_move(worker)
+
+            # As must the end of a game
+            await pool.release(worker)
+            again = await pool.acquire(_spec(PlayerColor.BLUE))
+            assert again is worker
+            assert (pool.started, pool.reused) == (1, 1)
+            await pool.release(again)
+
+    asyncio.run(run())
+
+
+def test_pool_does_not_reuse_rusage_processes():
+    # The rusage peak can't be reset, so a reused process would carry the
+    # last game's peak into the next
+    async def run():
+        async with AgentWorkerPool() as pool:
+            worker = await pool.acquire(_spec(PlayerColor.RED, "rusage"))
+            await pool.release(worker)
+            again = await pool.acquire(_spec(PlayerColor.BLUE, "rusage"))
+            assert again is not worker
+            assert (pool.started, pool.reused) == (2, 0)
+            await pool.release(again)
+
+    asyncio.run(run())
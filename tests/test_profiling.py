@@ -0,0 +1,70 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import multiprocessing
+import pstats
+
+from referee.agent.profiling import ActionProfiler
+from referee.agent.resources import CountdownTimer
+
+DUMPERS = 4
+CALLS = 50
+
+
+def _profiled_work():
+    return sum(range(1000))
+
+
+def _profile_and_dump(path: str, barrier):
+    profiler = ActionProfiler(path)
+    with profiler.profile():
+        for _ in range(CALLS):
+            _profiled_work()
+    barrier.wait()
+    profiler.dump()
+
+
+def _work_calls(path) -> int:
+    stats = pstats.Stats(str(path)).stats
+    return sum(ncalls for (_, _, name), (_, ncalls, *_) in stats.items()
+               if name == "_profiled_work")
+
+
+def test_concurrent_dumps_merge(tmp_path):
+    path = tmp_path / "agent.prof"
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(DUMPERS)
+    processes = [
+        context.Process(target=_profile_and_dump, args=(str(path), barrier))
+        for _ in range(DUMPERS)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    assert _work_calls(path) == DUMPERS * CALLS
+    assert "_profiled_work" in path.with_suffix(".txt").read_text()
+
+
+def test_profiler_overhead_not_charged(tmp_path):
+    profiler = ActionProfiler(tmp_path / "agent.prof")
+    raw, charged = CountdownTimer(0), CountdownTimer(0)
+    with raw:
+        with charged, profiler.profile(charged):
+            for _ in range(20_000):
+                _profiled_work()
+
+    assert 0.0 <= charged.delta() < raw.delta()
+
+
+def test_timer_exclude():
+    timer = CountdownTimer(0)
+    with timer:
+        sum(range(100_000))
+        timer.exclude(1000.0)
+    assert timer.deltas()["cpu"] == 0.0 and timer.deltas()["wall"] == 0.0
+    with timer:
+        sum(range(100_000))
+    assert timer.delta() > 0.0
@@ -0,0 +1,81 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import asyncio
+
+from referee.game import Board, Coord, Direction, Player, PlayerColor, \
+    Action, MoveAction
+from referee.archive import replay
+from referee.log import LogStream, LogLevel
+from referee.record import GameRecordWriter, read_games
+from referee.run import run_game, replay_recorded_game, game_recorder
+
+from agent.endgame import legal_actions
+
+
+class _ScriptedPlayer(Player):
+    """
+    Plays the first legal move, or `bad_action` on turn `bad_turn`.
+    """
+
+    def __init__(self, color: PlayerColor, bad_turn: int | None = None,
+                 bad_action: Action | None = None):
+        super().__init__(color)
+        self._board = Board()
+        self._bad_turn = bad_turn
+        self._bad_action = bad_action
+
+    async def action(self) -> Action:
+        if self._board.turn_count + 1 == self._bad_turn:
+            return self._bad_action
+        return legal_actions(self._board)[0]
+
+    async def update(self, color: PlayerColor, action: Action):
+        self._board.apply_action(action)
+
+
+def _record(tmp_path, players):
+    path = tmp_path / "games.rec"
+    with GameRecordWriter(path) as writer:
+        names = {p.color: str(p.color) for p in players}
+        winner = asyncio.run(run_game(players, [game_recorder(writer, names)]))
+    [record] = read_games(path)
+    return winner, record
+
+
+def test_error_terminated_game_replays(tmp_path):
+    # BLUE's fourth move (turn 8) jumps over an empty cell
+    bad_action = MoveAction(Coord(0, 1), (Direction.Down, Direction.Down))
+    players = [
+        _ScriptedPlayer(PlayerColor.RED),
+        _ScriptedPlayer(PlayerColor.BLUE, bad_turn=8, bad_action=bad_action),
+    ]
+    winner, record = _record(tmp_path, players)
+
+    assert winner is players[0]
+    assert record.winner == PlayerColor.RED
+    assert record.error is not None and "ILLEGAL ACTION" in record.error
+    assert len(record.actions) == len(record.times) == 7
+
+    replayed = asyncio.run(replay_recorded_game(
+        record, {p.color: p for p in players}))
+    assert replayed is players[0]
+    assert record.final_board().turn_count == 7
+    assert len(list(record.boards())) == 7
+
+
+def test_archive_replays_recorded_game(tmp_path, capsys):
+    bad_action = MoveAction(Coord(0, 1), (Direction.Down, Direction.Down))
+    players = [
+        _ScriptedPlayer(PlayerColor.RED),
+        _ScriptedPlayer(PlayerColor.BLUE, bad_turn=8, bad_action=bad_action),
+    ]
+    _, record = _record(tmp_path, players)
+
+    winner = replay(record, LogStream("replay", level=LogLevel.INFO, ansi=False))
+
+    assert winner is not None and winner.color == PlayerColor.RED
+    out = capsys.readouterr().out
+    assert out.count("game board") == 7
+    assert "ILLEGAL ACTION" in out
+    assert "game over, winner is RED (RED)" in out
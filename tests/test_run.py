@@ -0,0 +1,60 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import asyncio
+
+import pytest
+
+from referee.game import Board, Coord, Direction, Player, PlayerColor, \
+    Action, MoveAction, GameEnd, BoardUpdate
+from referee.run import run_game, queued_handler, \
+    QUEUE_LOSSLESS, QUEUE_COALESCE
+
+from agent.endgame import legal_actions
+
+
+class _ShortGamePlayer(Player):
+    """
+    Plays the first legal move, then ends the game on turn 6 with a move
+    that jumps over an empty cell.
+    """
+
+    def __init__(self, color: PlayerColor):
+        super().__init__(color)
+        self._board = Board()
+
+    async def action(self) -> Action:
+        if self._board.turn_count + 1 == 6:
+            return MoveAction(Coord(0, 1), (Direction.Down, Direction.Down))
+        return legal_actions(self._board)[0]
+
+    async def update(self, color: PlayerColor, action: Action):
+        self._board.apply_action(action)
+
+
+async def _slow_handler(seen: list, closed: list):
+    try:
+        while True:
+            update = yield
+            await asyncio.sleep(0.01)
+            seen.append(update)
+    finally:
+        closed.append(True)
+
+
+@pytest.mark.parametrize("policy", [QUEUE_LOSSLESS, QUEUE_COALESCE])
+def test_queued_handler_finishes_with_game(policy):
+    seen, closed = [], []
+
+    async def _run():
+        handler = queued_handler(_slow_handler(seen, closed), policy, 2)
+        players = [_ShortGamePlayer(c) for c in PlayerColor]
+        await run_game(players, [handler])
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    pending = asyncio.run(_run())
+
+    assert pending == set()
+    assert closed == [True]
+    assert isinstance(seen[-1], GameEnd)
+    assert any(isinstance(u, BoardUpdate) for u in seen)
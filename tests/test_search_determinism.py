@@ -0,0 +1,35 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs a seeded, traced search from a corpus position and prints the trace
+_TRACED_SEARCH = """
+import sys
+from bench.corpus import DEFAULT_CORPUS_PATH, load_corpus
+from agent.MCTS import MCTS, GameState
+
+position = {p.name: p for p in load_corpus(DEFAULT_CORPUS_PATH)}[sys.argv[1]]
+mcts = MCTS(GameState(None, position.board()), seed=1, trace_path=sys.argv[2])
+mcts.search(iterations=100)
+"""
+
+
+def _trace(tmp_path: Path, position: str, hash_seed: str) -> str:
+    path = tmp_path / f"{position}-{hash_seed}.trace"
+    subprocess.run(
+        [sys.executable, "-c", _TRACED_SEARCH, position, str(path)],
+        cwd=ROOT, check=True, capture_output=True,
+        env={**os.environ, "PYTHONHASHSEED": hash_seed, "PYTHONPATH": str(ROOT)},
+    )
+    return path.read_text()
+
+
+def test_seeded_trace_independent_of_hash_seed(tmp_path):
+    for position in ("g0-opening", "g1-midgame"):
+        assert _trace(tmp_path, position, "1") == _trace(tmp_path, position, "2")
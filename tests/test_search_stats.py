@@ -0,0 +1,18 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+from referee.game import Board
+
+from agent.MCTS import MCTS, GameState
+
+
+def test_search_returns_stats_without_printing(capsys):
+    mcts = MCTS(GameState(None, Board()), seed=0)
+    action, stats = mcts.search_with_stats(iterations=20)
+
+    assert capsys.readouterr().out == ""
+    assert action is not None
+    assert stats.iterations == 20
+    assert stats.tree_nodes == stats.nodes_created + 1
+    assert 0 <= stats.transposition_hits <= stats.nodes_created
+    assert stats.tree_memory_kb_est > 0
@@ -0,0 +1,124 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import asyncio
+import json
+import socket
+
+import websockets
+
+from referee.game import Board, Coord, Direction, Player, PlayerColor, \
+    Action, MoveAction, BoardUpdate
+from referee.run import run_game
+import referee.server.server
+from referee.server import RemoteServer, RemoteGame
+from referee.server.serialization import serialize_game_board
+
+from agent.endgame import legal_actions
+
+JOIN_TURN = 20
+LAST_TURN = 30
+
+
+class _ScriptedPlayer(Player):
+    """
+    Plays the first legal move, then ends the game after LAST_TURN turns with
+    a move that jumps over an empty cell.
+    """
+
+    def __init__(self, color: PlayerColor):
+        super().__init__(color)
+        self._board = Board()
+
+    async def action(self) -> Action:
+        if self._board.turn_count == LAST_TURN:
+            return MoveAction(Coord(0, 1), (Direction.Down, Direction.Down))
+        return legal_actions(self._board)[0]
+
+    async def update(self, color: PlayerColor, action: Action):
+        self._board.apply_action(action)
+
+
+async def _connect(uri: str):
+    # The server may not be listening yet
+    while True:
+        try:
+            return await websockets.connect(uri)
+        except OSError:
+            await asyncio.sleep(0.01)
+
+
+async def _client(uri: str, received: list, ack: bool):
+    async with await _connect(uri) as websocket:
+        async for message_str in websocket:
+            message = json.loads(message_str)
+            received.append(message)
+            if ack:
+                await websocket.send(
+                    json.dumps({"type": "<ack>", "id": message["id"]}))
+            if message["type"] == "GameUpdate:GameEnd":
+                return
+
+
+def _final_board(messages: list[dict]) -> list[list[int]]:
+    board = None
+    for message in messages:
+        if "board" in message:
+            board = [row[:] for row in message["board"]]
+        for r, c, cell in message.get("cells", []):
+            board[r][c] = cell
+    return board
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_late_joining_client_catches_up(monkeypatch):
+    monkeypatch.setattr(referee.server.server, "INCOMING_POLL_INTERVAL", 0.001)
+    port = _free_port()
+    uri = f"ws://127.0.0.1:{port}"
+    played, watched = [], []
+    last_board: list[Board] = []
+    viewers: list[asyncio.Task] = []
+
+    async def _join_mid_game(server: RemoteServer):
+        while True:
+            update = yield
+            if isinstance(update, BoardUpdate):
+                last_board[:] = [update.board]
+                if update.board.turn_count == JOIN_TURN:
+                    viewers.append(asyncio.create_task(
+                        _client(uri, watched, False)))
+                    while not server._viewers:
+                        await asyncio.sleep(0.01)
+
+    async def _run():
+        server = RemoteServer(host="127.0.0.1", port=port)
+        game = RemoteGame(server, ["red", "blue"], [])
+        server.set_catch_up(game.catch_up_messages)
+        serving = asyncio.create_task(server.run())
+        client = asyncio.create_task(_client(uri, played, True))
+        await server.wait_for_client()
+
+        players = [_ScriptedPlayer(c) for c in PlayerColor]
+        await run_game(players, [game.event_handler(), _join_mid_game(server)])
+        await asyncio.wait_for(asyncio.gather(client, *viewers), 5)
+        await server.stop()
+        await serving
+
+    asyncio.run(asyncio.wait_for(_run(), 30))
+
+    assert len(viewers) == 1
+    assert watched[0]["type"] == "GameMetadata"
+    assert watched[1]["type"] == "GameUpdate:GameBegin"
+    assert watched[-1]["type"] == "GameUpdate:GameEnd"
+    expected = serialize_game_board(last_board[0])
+    assert _final_board(played) == expected
+    assert _final_board(watched) == expected
+    # Everything after the catch-up is what the playing client was sent
+    tail = [{k: v for k, v in m.items() if k != "id"} for m in played]
+    joined = [{k: v for k, v in m.items() if k != "id"} for m in watched]
+    assert joined[-10:] == tail[-10:]
@@ -0,0 +1,66 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import asyncio
+
+import pytest
+
+import referee.tournament
+from referee.options import PlayerLoc
+from referee.tournament import GameRecord, summarise, main, run_tournament
+
+
+def test_summarise_without_records():
+    summary = summarise([])
+
+    assert summary["games"] == 0
+    assert (summary["win"], summary["draw"], summary["loss"]) == (0, 0, 0)
+    assert summary["score"] is None
+    assert summary["elo"] is None
+    assert summary["elo_ci"] is None
+
+
+def test_summarise_even_score():
+    summary = summarise([
+        GameRecord(0, "RED", "win", 40),
+        GameRecord(1, "BLUE", "loss", 60),
+    ])
+
+    assert summary["score"] == 0.5
+    assert summary["elo"] == 0.0
+    assert summary["avg_turns"] == 50
+    assert summary["by_color"]["RED"]["win"] == 1
+
+
+@pytest.mark.parametrize("option", [["-n", "0"], ["-j", "0"], ["-n", "x"]])
+def test_rejects_non_positive_counts(monkeypatch, option):
+    monkeypatch.setattr("sys.argv",
+                        ["referee.tournament", "agent", "agent", *option])
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+    assert exit_info.value.code == 2
+
+
+def test_game_error_does_not_stop_tournament(monkeypatch):
+    async def _run_game(players, handlers):
+        # Game 1 fails while the others are still being played
+        if "game 1 " in players[0]._name:
+            raise RuntimeError("handler failed")
+        await asyncio.sleep(0.01)
+        return players[0]
+
+    monkeypatch.setattr(referee.tournament, "run_game", _run_game)
+    loc = PlayerLoc("agent", "Agent")
+    records = asyncio.run(run_tournament(
+        (loc, loc), 4, 4, 0, 0, reuse_processes=False))
+
+    assert [r.game for r in records] == [0, 1, 2, 3]
+    assert records[1].result == "error"
+    assert "RuntimeError: handler failed" in records[1].error
+    assert [r.result for r in records if r.game != 1] == ["win", "win", "loss"]
+
+    summary = summarise(records)
+    assert summary["games"] == 4 and summary["unfinished"] == 1
+    assert summary["errors"] == 0
+    assert summary["score"] == pytest.approx(2 / 3)